@@ -7,7 +7,7 @@ import pygame
 import sys
 
 from scripts.entities import PhysicsEntity, Player
-from scripts.utilities import load_image, load_images, Animation
+from scripts.assets import shared_assets, EDITOR_TILES
 from scripts.tilemap import Tilemap
 from scripts.clouds import Clouds
 
@@ -118,17 +118,11 @@ class Editor:
             self.tilemap.load('map.json')
         except FileNotFoundError:
             pass
-        self.assets = {
-                'decor': load_images('tiles/decor'),
-                'grass': load_images('tiles/grass'),
-                'large_decor': load_images('tiles/large_decor'),
-                'stone': load_images('tiles/stone'),
-                'spawners': load_images('tiles/spawners'),
-        }
+        self.assets = shared_assets()
 
         self.scroll = [0,0]
 
-        self.tile_list = list(self.assets)
+        self.tile_list = list(EDITOR_TILES)
         self.tile_group = 0
         self.tile_variant = 0
 
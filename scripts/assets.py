@@ -0,0 +1,236 @@
+# MyPygame: assets
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import os
+import sys
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from scripts.utilities import load_surface, list_images, cached_surface, finish_surface, decode_image, Animation
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+class AssetSpec:
+    def __init__(self, path, colorkey=BLACK, animation=None):
+        self.path = path
+        self.colorkey = colorkey
+        self.animation = animation
+
+    def is_file(self):
+        return bool(os.path.splitext(self.path)[1])
+
+    def files(self):
+        if self.is_file():
+            return [self.path]
+        return [self.path + '/' + img_name for img_name in list_images(self.path)]
+
+    def load(self):
+        return self.build([load_surface(path, self.colorkey) for path in self.files()])
+
+    def build(self, images):
+        if self.is_file():
+            return images[0]
+        if self.animation is not None:
+            return Animation(images, **self.animation)
+        return images
+
+class VariantSpec:
+    # transforms run in the order they are given, e.g. size=(4, 8), rotate=-15, flip=True
+    def __init__(self, source, **transforms):
+        self.source = source
+        self.transforms = list(transforms.items())
+
+    def apply(self, img):
+        for name, value in self.transforms:
+            if name == 'size':
+                img = pygame.transform.scale(img, value)
+            elif name == 'scale':
+                img = pygame.transform.scale_by(img, value)
+            elif name == 'rotate':
+                img = pygame.transform.rotate(img, value)
+            elif name == 'flip':
+                img = pygame.transform.flip(img, value, False)
+            else:
+                raise ValueError('unknown transform ' + name)
+        return img
+
+    def derive(self, asset):
+        if isinstance(asset, Animation):
+            return Animation([self.apply(img) for img in asset.images], asset.img_duration, asset.loop)
+        if isinstance(asset, list):
+            return [self.apply(img) for img in asset]
+        return self.apply(asset)
+
+ASSET_MANIFEST = {
+    'decor': AssetSpec('tiles/decor'),
+    'grass': AssetSpec('tiles/grass'),
+    'large_decor': AssetSpec('tiles/large_decor'),
+    'stone': AssetSpec('tiles/stone'),
+    'spawners': AssetSpec('tiles/spawners'),
+    'background': AssetSpec('background.png'),
+    'clouds': AssetSpec('clouds'),
+    'enemy/idle': AssetSpec('entities/goblin/idle', WHITE, {'img_dur': 6}),
+    'enemy/run': AssetSpec('entities/goblin/walk', WHITE, {'img_dur': 6}),
+    'player/idle': AssetSpec('entities/player3/idle', animation={'img_dur': 6}),
+    'player/run': AssetSpec('entities/player3/run', animation={'img_dur': 6}),
+    'player/jump': AssetSpec('entities/player3/jump', animation={'img_dur': 6}),
+    'player/attack': AssetSpec('entities/player3/attack/StaffMighty', animation={'img_dur': 4, 'loop': False}),
+    'player/weapon': AssetSpec('entities/player3/weapon/staff_mighty.png'),
+    'player/weapon_flipped': VariantSpec('player/weapon', flip=True),
+    'particle/leaf': AssetSpec('particles/leaf', animation={'img_dur': 20, 'loop': False}),
+    'particle/particle': AssetSpec('particles/particle', animation={'img_dur': 20, 'loop': False}),
+    'bow': AssetSpec('Bow.png', WHITE),
+    'bow/held': VariantSpec('bow', size=(4, 8), rotate=-15),
+    'bow/held_flipped': VariantSpec('bow', size=(4, 8), rotate=-15, flip=True),
+    'projectile': AssetSpec('Arrow.png', WHITE),
+    'projectile/arrow': VariantSpec('projectile', scale=0.9),
+    'projectile/arrow_flipped': VariantSpec('projectile', flip=True, scale=0.9),
+    'particle/fireball/frames': AssetSpec('particles/fireball', WHITE, {'img_dur': 4, 'loop': True}),
+    'particle/fireball': VariantSpec('particle/fireball/frames', size=(32, 16)),
+}
+
+EDITOR_TILES = ['decor', 'grass', 'large_decor', 'stone', 'spawners']
+STARTUP_ASSETS = ['background', 'clouds', 'player/idle', 'player/run', 'player/jump', 'player/attack', 'player/weapon', 'player/weapon_flipped', 'enemy/idle', 'enemy/run', 'bow/held', 'bow/held_flipped', 'projectile/arrow', 'projectile/arrow_flipped', 'particle/leaf', 'particle/particle', 'particle/fireball']
+
+def timed_decode(path):
+    start = time.perf_counter()
+    img = decode_image(path)
+    return img, time.perf_counter() - start
+
+def asset_size(asset):
+    if isinstance(asset, Animation):
+        asset = asset.images + asset.flipped
+    if isinstance(asset, list):
+        return sum(asset_size(img) for img in asset)
+    return asset.get_width() * asset.get_height() * asset.get_bytesize()
+
+def extra_references(obj, owners):
+    # sys.getrefcount counts its own argument and `obj` here on top of the `owners` the caller knows about
+    return sys.getrefcount(obj) - 2 - owners
+
+def held(asset):
+    # an asset something outside the cache still draws with, like an Animation copy sharing its images,
+    # a cloud or the arrow pool; evicting it frees nothing and the next lookup would load a second copy
+    if extra_references(asset, 2) > 0:
+        return True
+    if isinstance(asset, Animation):
+        # copies share the image lists rather than the Animation
+        return extra_references(asset.images, 1) > 0 or extra_references(asset.flipped, 1) > 0
+    if isinstance(asset, list):
+        return any(extra_references(img, 2) > 0 for img in asset)
+    return False
+
+class AssetCache(Mapping):
+    def __init__(self, manifest=ASSET_MANIFEST, budget=None):
+        self.manifest = manifest
+        self.budget = budget
+        # in load order, which is the order unused assets are evicted in
+        self.loaded = {}
+        self.sizes = {}
+        self.pinned = set()
+        self.loads = 0
+        self.evictions = 0
+        self.timings = {}
+
+    def __getitem__(self, key):
+        # tiles are looked up every frame, so a hit is only the dict lookup
+        try:
+            return self.loaded[key]
+        except KeyError:
+            self.preload([key], workers=1)
+            return self.loaded[key]
+
+    def __contains__(self, key):
+        return key in self.manifest
+
+    def __iter__(self):
+        return iter(self.manifest)
+
+    def __len__(self):
+        return len(self.manifest)
+
+    def memory(self):
+        return sum(self.sizes.values())
+
+    def evict(self):
+        if self.budget is None:
+            return
+        for key in list(self.loaded)[:-1]:
+            if self.memory() <= self.budget:
+                break
+            if key not in self.pinned and not held(self.loaded[key]):
+                del self.loaded[key]
+                del self.sizes[key]
+                self.evictions += 1
+
+    def store(self, key, asset):
+        self.loads += 1
+        self.loaded[key] = asset
+        self.sizes[key] = asset_size(asset)
+        self.evict()
+
+    def preload(self, keys, workers=None):
+        keys = [key for key in dict.fromkeys(keys) if key not in self.loaded]
+        variants = [key for key in keys if isinstance(self.manifest[key], VariantSpec)]
+        sources = [self.manifest[key].source for key in variants]
+        keys = [key for key in dict.fromkeys(sources + keys) if key not in self.loaded and not isinstance(self.manifest[key], VariantSpec)]
+        files = {key: self.manifest[key].files() for key in keys}
+        ready = {}
+        pending = []
+        for key in keys:
+            colorkey = self.manifest[key].colorkey
+            for path in files[key]:
+                img = cached_surface(path, colorkey)
+                if img is not None:
+                    ready[(path, colorkey)] = img
+                elif path not in pending:
+                    pending.append(path)
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(workers) as pool:
+                results = list(pool.map(timed_decode, pending))
+        else:
+            results = [timed_decode(path) for path in pending]
+        decoded = {path: img for path, (img, _) in zip(pending, results)}
+        decode_times = {path: seconds for path, (_, seconds) in zip(pending, results)}
+        for key in keys:
+            spec = self.manifest[key]
+            start = time.perf_counter()
+            asset = spec.build([ready.get((path, spec.colorkey)) or finish_surface(path, decoded[path], spec.colorkey) for path in files[key]])
+            self.timings[key] = {'decode': sum(decode_times.get(path, 0) for path in files[key]), 'convert': time.perf_counter() - start}
+            self.store(key, asset)
+        for key in variants:
+            spec = self.manifest[key]
+            source = self[spec.source]
+            start = time.perf_counter()
+            asset = spec.derive(source)
+            self.timings[key] = {'decode': 0, 'convert': time.perf_counter() - start}
+            self.store(key, asset)
+
+    def timing_report(self):
+        lines = []
+        for key, timing in self.timings.items():
+            lines.append(key.ljust(20) + ' decode ' + format(timing['decode'] * 1000, '7.2f') + ' ms  convert ' + format(timing['convert'] * 1000, '7.2f') + ' ms')
+        return '\n'.join(lines)
+
+    def pin(self, keys):
+        keys = [key for key in keys if key in self.manifest]
+        self.pinned.update(keys)
+        self.preload(keys)
+
+    def unpin(self, keys):
+        self.pinned.difference_update(keys)
+        self.evict()
+
+shared = None
+
+def shared_assets(budget=None):
+    global shared
+    if shared is None:
+        shared = AssetCache()
+    if budget is not None:
+        shared.budget = budget
+    return shared
@@ -0,0 +1,107 @@
+# MyPygame: atlas
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import json
+import os
+
+ATLAS_PATH = 'data/atlas/'
+ATLAS_INDEX = 'index.json'
+ATLAS_SIZE = 1024
+ATLAS_PADDING = 1
+
+def walk_images(base):
+    dirs = {}
+    images = []
+    pending = ['']
+    while pending:
+        path = pending.pop(0)
+        names = os.listdir(base + path)
+        dirs[path] = names
+        for name in names:
+            rel_path = path + '/' + name if path else name
+            if os.path.isdir(base + rel_path):
+                pending.append(rel_path)
+            else:
+                images.append(rel_path)
+    return dirs, images
+
+def pack(sizes, sheet_size=ATLAS_SIZE, padding=ATLAS_PADDING):
+    placements = [None] * len(sizes)
+    sheets = []
+    current = None
+    used = {}
+    x = y = shelf_height = 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        w, h = sizes[i]
+        if w > sheet_size or h > sheet_size:
+            sheets.append((w, h))
+            placements[i] = (len(sheets) - 1, 0, 0)
+            continue
+        if current is not None and x + w > sheet_size:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        if current is None or y + h > sheet_size:
+            sheets.append((sheet_size, sheet_size))
+            current = len(sheets) - 1
+            x = y = shelf_height = 0
+        placements[i] = (current, x, y)
+        used[current] = max(used.get(current, 0), y + h)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return [(w, used.get(i, h)) for i, (w, h) in enumerate(sheets)], placements
+
+def build_atlas(base='data/images/', out=ATLAS_PATH, sheet_size=ATLAS_SIZE):
+    dirs, paths = walk_images(base)
+    images = [pygame.image.load(base + path) for path in paths]
+    sheet_sizes, placements = pack([img.get_size() for img in images], sheet_size)
+
+    sheets = [pygame.Surface(size) for size in sheet_sizes]
+    index = {'sheets': [], 'images': {}, 'dirs': {}}
+    for path, img, (sheet, x, y) in zip(paths, images, placements):
+        # copy raw RGB so per-pixel alpha is dropped exactly like convert() does
+        sheets[sheet].blit(pygame.image.frombytes(pygame.image.tobytes(img, 'RGB'), img.get_size(), 'RGB'), (x, y))
+        index['images'][path] = [sheet, x, y, img.get_width(), img.get_height(), os.stat(base + path).st_mtime_ns]
+    for path, names in dirs.items():
+        index['dirs'][path] = [names, os.stat(base + path).st_mtime_ns]
+
+    os.makedirs(out, exist_ok=True)
+    for i, sheet in enumerate(sheets):
+        index['sheets'].append(str(i) + '.png')
+        pygame.image.save(sheet, out + index['sheets'][-1])
+    f = open(out + ATLAS_INDEX, 'w')
+    json.dump(index, f)
+    f.close()
+    return index
+
+class Atlas:
+    def __init__(self, index, sheets, base='data/images/'):
+        self.index = index
+        self.sheets = sheets
+        self.base = base
+
+    @classmethod
+    def open(cls, path=ATLAS_PATH, base='data/images/', load=None):
+        f = open(path + ATLAS_INDEX, 'r')
+        index = json.load(f)
+        f.close()
+        load = load or (lambda sheet: pygame.image.load(sheet).convert())
+        return cls(index, [load(path + name) for name in index['sheets']], base)
+
+    def image(self, path):
+        entry = self.index['images'].get(path)
+        if entry is None or os.stat(self.base + path).st_mtime_ns != entry[5]:
+            return None
+        return self.sheets[entry[0]].subsurface(pygame.Rect(entry[1], entry[2], entry[3], entry[4]))
+
+    def listdir(self, path):
+        entry = self.index['dirs'].get(path)
+        if entry is None or os.stat(self.base + path).st_mtime_ns != entry[1]:
+            return None
+        return entry[0]
+
+if __name__ == '__main__':
+    index = build_atlas()
+    print('packed', len(index['images']), 'images into', len(index['sheets']), 'sheets in', ATLAS_PATH)
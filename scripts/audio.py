@@ -0,0 +1,306 @@
+# MyPygame: audio
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import os
+import pygame
+import threading
+import time
+import wave
+from collections.abc import Mapping
+
+MAX_VOICES = 8
+COALESCE_MS = 50
+STREAM_CHUNK_SECONDS = 0.5
+
+# name: (voices allowed at once, priority), higher priority steals from lower
+SOUND_SETTINGS = {
+    'ambience': (1, 3),
+    'hit': (2, 2),
+    'explosion': (3, 2),
+    'fireball': (2, 1),
+    'jump': (1, 1),
+    'shoot': (3, 0),
+    'landing': (1, 0),
+}
+DEFAULT_SETTING = (2, 0)
+
+# decoded sfx shared by every VoiceManager, keyed by path
+sound_cache = {}
+sound_lock = threading.Lock()
+
+def now_ms():
+    # pygame.time.get_ticks stays at 0 unless the timer was started by pygame.init
+    return time.perf_counter() * 1000
+
+def ensure_mixer(channels=MAX_VOICES):
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    if pygame.mixer.get_num_channels() < channels:
+        pygame.mixer.set_num_channels(channels)
+
+def cached_sound(path):
+    ensure_mixer()
+    with sound_lock:
+        if path not in sound_cache:
+            sound_cache[path] = pygame.mixer.Sound(path)
+        return sound_cache[path]
+
+class StreamedSound:
+    # plays a long wav from disk a chunk at a time, keeping one chunk queued on its channel
+    def __init__(self, path, chunk_seconds=STREAM_CHUNK_SECONDS):
+        self.path = path
+        self.chunk_seconds = chunk_seconds
+        self.volume = 1.0
+        self.reader = None
+        self.channel = None
+        self.frames = 0
+        self.loops = 0
+
+    def compatible(self):
+        ensure_mixer()
+        mixer = pygame.mixer.get_init()
+        try:
+            reader = wave.open(self.path, 'rb')
+        except (OSError, EOFError, wave.Error):
+            return False
+        params = reader.getparams()
+        reader.close()
+        return bool(mixer) and mixer[1] == -16 and params.sampwidth >= 2 and (params.framerate, params.nchannels) == (mixer[0], mixer[2])
+
+    def next_chunk(self):
+        data = self.reader.readframes(self.frames)
+        if not data and self.loops:
+            if self.loops > 0:
+                self.loops -= 1
+            self.reader.rewind()
+            data = self.reader.readframes(self.frames)
+        if not data:
+            return None
+        width = self.reader.getsampwidth()
+        if width > 2:
+            # keep the top 16 bits of each little-endian sample
+            samples = bytearray(data)
+            data = bytearray(len(samples) // width * 2)
+            data[0::2] = samples[width - 2::width]
+            data[1::2] = samples[width - 1::width]
+        chunk = pygame.mixer.Sound(buffer=data)
+        chunk.set_volume(self.volume)
+        return chunk
+
+    def play(self, loops=0):
+        self.stop()
+        self.channel = pygame.mixer.find_channel()
+        if self.channel is None:
+            return None
+        self.reader = wave.open(self.path, 'rb')
+        self.frames = int(self.reader.getframerate() * self.chunk_seconds)
+        self.loops = loops
+        self.channel.play(self.next_chunk())
+        self.update()
+        return self.channel
+
+    def update(self):
+        if self.channel is None:
+            return
+        if not self.channel.get_busy():
+            # a stall longer than the queued audio drains the channel, so carry on unless the track is over
+            chunk = self.next_chunk()
+            if chunk is None:
+                self.stop()
+                return
+            self.channel.play(chunk)
+        if self.channel.get_queue() is None:
+            chunk = self.next_chunk()
+            if chunk is not None:
+                self.channel.queue(chunk)
+
+    def playing_on(self, channel):
+        return channel is self.channel and channel.get_busy()
+
+    def stop(self):
+        if self.channel is not None:
+            self.channel.stop()
+            self.channel = None
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.channel is not None and self.channel.get_sound():
+            self.channel.get_sound().set_volume(volume)
+
+    def get_volume(self):
+        return self.volume
+
+class SilentSound:
+    # stands in for an optional track that is not shipped, the game plays on without it
+    def __init__(self, path):
+        self.path = path
+        self.volume = 1.0
+
+    def play(self, loops=0):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def get_volume(self):
+        return self.volume
+
+class SoundSpec:
+    def __init__(self, path, volume=1.0, stream=False, optional=False):
+        self.path = path
+        self.volume = volume
+        self.stream = stream
+        self.optional = optional
+
+    def load(self):
+        if self.optional and not os.path.exists(self.path):
+            sound = SilentSound(self.path)
+            sound.set_volume(self.volume)
+            return sound
+        sound = StreamedSound(self.path) if self.stream else None
+        if sound is None or not sound.compatible():
+            sound = cached_sound(self.path)
+        sound.set_volume(self.volume)
+        return sound
+
+SOUND_MANIFEST = {
+    'jump': SoundSpec('data/sfx/jump2.wav', 0.3),
+    'hit': SoundSpec('data/sfx/hit.wav', 0.7),
+    'shoot': SoundSpec('data/sfx/shoot.wav', 0.2),
+    'ambience': SoundSpec('data/sfx/ambience.wav', 0.2, stream=True, optional=True),
+    'fireball': SoundSpec('data/sfx/wind.wav', 0.4),
+    'explosion': SoundSpec('data/sfx/fire.wav', 0.9),
+    'landing': SoundSpec('data/sfx/landing.wav', 0.4),
+}
+
+class ManagedSound:
+    def __init__(self, manager, name, source):
+        self.manager = manager
+        self.name = name
+        self.source = source
+        self.loaded = None if isinstance(source, SoundSpec) else source
+        self.lock = threading.Lock()
+
+    @property
+    def sound(self):
+        if self.loaded is None:
+            with self.lock:
+                if self.loaded is None:
+                    self.loaded = self.source.load()
+        return self.loaded
+
+    def play(self, loops=0):
+        return self.manager.play(self.name, loops)
+
+    def stop(self):
+        self.manager.stop(self.name)
+
+    def set_volume(self, volume):
+        self.sound.set_volume(volume)
+
+    def get_volume(self):
+        return self.sound.get_volume()
+
+class VoiceManager(Mapping):
+    def __init__(self, sounds=SOUND_MANIFEST, settings=SOUND_SETTINGS, max_voices=MAX_VOICES, window=COALESCE_MS, ticks=None, muted=False):
+        self.sounds = {name: ManagedSound(self, name, sound) for name, sound in sounds.items()}
+        self.settings = settings
+        self.max_voices = max_voices
+        self.window = window
+        self.ticks = ticks or now_ms
+        self.muted = muted
+        self.voices = []
+        self.last_played = {}
+        self.played = 0
+        self.coalesced = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.silenced = 0
+
+    def __getitem__(self, name):
+        return self.sounds[name]
+
+    def __iter__(self):
+        return iter(self.sounds)
+
+    def __len__(self):
+        return len(self.sounds)
+
+    def setting(self, name):
+        return self.settings.get(name, DEFAULT_SETTING)
+
+    def active(self, name=None):
+        self.voices = [voice for voice in self.voices if self.playing(voice)]
+        if name is None:
+            return self.voices
+        return [voice for voice in self.voices if voice[1] == name]
+
+    def playing(self, voice):
+        sound = self.sounds[voice[1]].sound
+        if isinstance(sound, StreamedSound):
+            return sound.playing_on(voice[0])
+        return voice[0].get_busy() and voice[0].get_sound() is sound
+
+    def preload(self, names=None, background=False):
+        names = list(names or self.sounds)
+        if background:
+            loader = threading.Thread(target=self.preload, args=(names,), daemon=True)
+            loader.start()
+            return loader
+        for name in names:
+            self.sounds[name].sound
+
+    def update(self):
+        if self.muted:
+            return
+        for managed in self.sounds.values():
+            if isinstance(managed.loaded, StreamedSound):
+                managed.loaded.update()
+
+    def steal(self, voice):
+        voice[0].stop()
+        self.voices.remove(voice)
+        self.stolen += 1
+
+    def play(self, name, loops=0):
+        if self.muted:
+            self.silenced += 1
+            return None
+        now = self.ticks()
+        if name in self.last_played and now - self.last_played[name] < self.window:
+            self.coalesced += 1
+            return None
+        limit, priority = self.setting(name)
+        if isinstance(self.sounds[name].source, SoundSpec):
+            ensure_mixer(self.max_voices)
+        playing = self.active(name)
+        if len(playing) >= limit:
+            self.steal(playing[0])
+        elif len(self.voices) >= self.max_voices:
+            candidates = [voice for voice in self.voices if voice[2] <= priority]
+            if not candidates:
+                self.dropped += 1
+                return None
+            self.steal(min(candidates, key=lambda voice: voice[2]))
+        channel = self.sounds[name].sound.play(loops)
+        if channel is None:
+            self.dropped += 1
+            return None
+        self.voices.append((channel, name, priority))
+        self.last_played[name] = now
+        self.played += 1
+        return channel
+
+    def stop(self, name):
+        for voice in self.active(name):
+            voice[0].stop()
+        self.active()
+        if isinstance(self.sounds[name].loaded, StreamedSound):
+            self.sounds[name].loaded.stop()
@@ -0,0 +1,84 @@
+# MyPygame: batch
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import argparse
+import json
+import multiprocessing
+import os
+import pygame
+import time
+from scripts.simulation import FPS, HISTOGRAM_BUCKETS, histogram_percentile, load_script, run_session
+
+def session_specs(count, frames, seed=0, levels=(0,), scripts=(('idle', []),)):
+    # session i always gets the same seed, level and script so a sweep can be rerun exactly
+    specs = []
+    for i in range(count):
+        name, script = scripts[i % len(scripts)]
+        specs.append({'session': i, 'seed': seed + i, 'level': levels[i % len(levels)], 'script_name': name, 'script': script, 'frames': frames})
+    return specs
+
+def run_spec(spec):
+    result = run_session(spec['frames'], spec['script'], spec['seed'], spec['level'])
+    # every session starts from a fresh display, even when a worker runs several
+    pygame.quit()
+    result.update({key: spec[key] for key in ('session', 'seed', 'script_name')})
+    result['start_level'] = spec['level']
+    return result
+
+def run_batch(specs, processes=None):
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        return [run_spec(spec) for spec in specs]
+    # SDL catches SIGTERM in the workers, so let them exit on their own instead of terminating the pool
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(run_spec, specs, chunksize=max(1, len(specs) // (processes * 4)))
+    finally:
+        pool.close()
+        pool.join()
+
+def aggregate(results):
+    clears = {}
+    deaths = {}
+    histogram = [0] * HISTOGRAM_BUCKETS
+    for result in results:
+        for level, frames in result['clears']:
+            clears.setdefault(str(level), []).append(frames / FPS)
+        for level, count in result['deaths'].items():
+            deaths[level] = deaths.get(level, 0) + count
+        histogram = [a + b for a, b in zip(histogram, result['frame_times'])]
+    sessions = len(results)
+    return {
+        'sessions': sessions,
+        'game_seconds': sum(result['game_seconds'] for result in results),
+        'cpu_seconds': sum(result['seconds'] for result in results),
+        'clear_times': {level: {'count': len(times), 'mean': sum(times) / len(times), 'min': min(times), 'max': max(times)} for level, times in sorted(clears.items())},
+        'deaths': {level: {'total': count, 'per_session': count / sessions} for level, count in sorted(deaths.items())},
+        'arrows': sum(result['arrows'] for result in results),
+        'fireballs': sum(result['fireballs'] for result in results),
+        'frame_time_us': {'p50': histogram_percentile(histogram, 0.5), 'p90': histogram_percentile(histogram, 0.9), 'p99': histogram_percentile(histogram, 0.99), 'max': histogram_percentile(histogram, 1.0)},
+        'frame_time_histogram': histogram,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run many headless sessions across a process pool.')
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--frames', type=int, default=FPS * 60 * 5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--levels', type=int, nargs='+', default=[0])
+    parser.add_argument('--scripts', nargs='+', default=[], help='JSON input scripts, handed out round robin')
+    parser.add_argument('--processes', type=int)
+    parser.add_argument('--out', help='write every session and the summary to this JSON file')
+    args = parser.parse_args()
+
+    scripts = [(path, load_script(path)) for path in args.scripts] or [('idle', [])]
+    start = time.perf_counter()
+    results = run_batch(session_specs(args.sessions, args.frames, args.seed, args.levels, scripts), args.processes)
+    summary = aggregate(results)
+    summary['wall_seconds'] = time.perf_counter() - start
+    if args.out:
+        f = open(args.out, 'w')
+        json.dump({'summary': summary, 'sessions': results}, f)
+        f.close()
+    print(json.dumps({key: value for key, value in summary.items() if key != 'frame_time_histogram'}, indent=2))
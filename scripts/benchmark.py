@@ -0,0 +1,303 @@
+# MyPygame: benchmark
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import os
+import pygame
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import tempfile
+import time
+from scripts.game import Game
+from scripts.tilemap import Tilemap, level_template, clear_templates
+from scripts.entities import PhysicsEntity
+from scripts.particle import Particle
+from scripts.spark import Spark
+from scripts.stress import apply_scene
+from scripts.snapshot import capture, restore
+
+BENCHMARK_RESULTS = 'benchmark.json'
+DEFAULT_REPEATS = 7
+DEFAULT_COUNT = 1000
+# each sample loops the benchmark until it has run for at least this long
+MIN_SAMPLE_SECONDS = 0.02
+MAP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'maps')
+
+def map_ids(directory=MAP_DIR):
+    return sorted(int(name.split('.')[0]) for name in os.listdir(directory) if name.endswith('.json'))
+
+def use_headless_drivers():
+    # benchmarks never open a window or a sound device, unless the caller already picked drivers
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+def machine_info():
+    return {
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+    }
+
+def measure(run, repeats=DEFAULT_REPEATS, min_time=MIN_SAMPLE_SECONDS):
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    samples = [elapsed / loops * 1000]
+    for _ in range(repeats - 1):
+        samples.append(sample(run, loops))
+    return result(loops, samples)
+
+def sample(run, loops):
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return (time.perf_counter() - start) / loops * 1000
+
+def result(loops, samples):
+    return {
+        'unit': 'ms',
+        'loops': loops,
+        'samples': samples,
+        'mean': statistics.mean(samples),
+        'median': statistics.median(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'min': min(samples),
+    }
+
+def measure_interleaved(benchmarks, repeats=DEFAULT_REPEATS, min_time=MIN_SAMPLE_SECONDS):
+    # one sample of every benchmark per round, so the machine slowing down part way through hits them all alike
+    loops = {}
+    for name, (setup, run) in benchmarks.items():
+        if setup:
+            setup()
+        loops[name] = measure(run, 1, min_time)['loops']
+    samples = {name: [] for name in benchmarks}
+    for _ in range(repeats):
+        for name, (setup, run) in benchmarks.items():
+            if setup:
+                setup()
+            samples[name].append(sample(run, loops[name]))
+    return {name: result(loops[name], samples[name]) for name in benchmarks}
+
+def map_positions(tilemap, count, rng):
+    xs = [tile['pos'][0] for tile in tilemap.tilemap_dict.values()]
+    ys = [tile['pos'][1] for tile in tilemap.tilemap_dict.values()]
+    size = tilemap.tile_size
+    return [((min(xs) + rng.random() * (max(xs) - min(xs) + 1)) * size, (min(ys) + rng.random() * (max(ys) - min(ys) + 1)) * size) for _ in range(count)]
+
+def calibration():
+    # fixed pure Python work that never changes, so comparisons can factor out how fast the machine is running today
+    total = 0
+    for i in range(20000):
+        total += i * i % 7
+    return total
+
+# each group returns {name: (setup, run)}, setup puts the game back into the state run expects
+def tilemap_benchmarks(game, map_id, count):
+    game.load_level(map_id)
+    tilemap = game.tilemap
+    rng = random.Random(map_id)
+    positions = map_positions(tilemap, count, rng)
+    offset = (int(game.player.pos[0]) - 160, int(game.player.pos[1]) - 120)
+    path = os.path.join(tempfile.gettempdir(), 'benchmark_map_' + str(map_id) + '.json')
+    tilemap.save(path)
+    # the level's tiles are shared with its cached template, autotile gets a copy it can change
+    editable = Tilemap(game, tile_size=tilemap.tile_size)
+    editable.load(path)
+    prefix = 'tilemap/' + str(map_id) + '/'
+
+    def setup():
+        game.load_level(map_id)
+
+    def render():
+        tilemap.render(game.display, offset=offset)
+
+    def physics_rects_around():
+        for pos in positions:
+            tilemap.physics_rects_around(pos)
+
+    def solid_check():
+        for pos in positions:
+            tilemap.solid_check(pos)
+
+    def save():
+        tilemap.save(path)
+
+    def load():
+        editable.load(path)
+
+    return {
+        prefix + 'render': (setup, render),
+        prefix + 'physics_rects_around/' + str(count): (setup, physics_rects_around),
+        prefix + 'solid_check/' + str(count): (setup, solid_check),
+        prefix + 'autotile': (setup, editable.autotile),
+        prefix + 'save': (setup, save),
+        prefix + 'load': (setup, load),
+    }
+
+def entity_benchmarks(game, count):
+    game.load_level(0)
+    rng = random.Random(count)
+    spawns = [tuple(enemy.pos) for enemy in game.enemies] or [tuple(game.player.pos)]
+    starts = [spawns[i % len(spawns)] for i in range(count)]
+    entities = [PhysicsEntity(game, 'enemy', start, (8, 15)) for start in starts]
+    movements = [(rng.choice((-0.5, 0.5)), 0) for _ in range(count)]
+
+    def setup():
+        game.load_level(0)
+
+    def update():
+        # every call starts the entities back at their spawns so each one does the same work
+        for entity, start, movement in zip(entities, starts, movements):
+            entity.pos[0], entity.pos[1] = start
+            entity.velocity[1] = 0
+            entity.update(game.tilemap, movement=movement)
+
+    return {'entities/update/' + str(count): (setup, update)}
+
+def effect_benchmarks(game, count):
+    rng = random.Random(count)
+    sparks = [Spark((rng.random() * 320, rng.random() * 240), rng.random() * math.pi * 2, 2 + rng.random() * 3, (255, 255, 255)) for _ in range(count)]
+    speeds = [spark.speed for spark in sparks]
+    particles = [Particle(game, 'particle', (rng.random() * 320, rng.random() * 240), velocity=[rng.random() - 0.5, rng.random() - 0.5], frame=rng.randint(0, 7)) for _ in range(count)]
+    frames = [particle.animation.frame for particle in particles]
+
+    def spark_update():
+        for spark, speed in zip(sparks, speeds):
+            spark.speed = speed
+            spark.update()
+
+    def spark_render():
+        for spark in sparks:
+            spark.render(game.display)
+
+    def particle_update():
+        for particle, frame in zip(particles, frames):
+            particle.animation.frame = frame
+            particle.update()
+
+    def particle_render():
+        for particle in particles:
+            particle.render(game.display)
+
+    return {
+        'sparks/update/' + str(count): (None, spark_update),
+        'sparks/render/' + str(count): (None, spark_render),
+        'particles/update/' + str(count): (None, particle_update),
+        'particles/render/' + str(count): (None, particle_render),
+    }
+
+def level_benchmarks(game, map_id):
+    path = 'data/maps/' + str(map_id) + '.json'
+
+    def parse():
+        clear_templates()
+        level_template(path)
+
+    def respawn():
+        game.load_level(map_id)
+
+    return {'level/' + str(map_id) + '/parse': (None, parse), 'level/' + str(map_id) + '/respawn': (None, respawn)}
+
+def frame_benchmarks(game, map_id):
+    def frame():
+        game.step()
+        game.draw()
+
+    def draw():
+        game.draw()
+
+    def setup():
+        game.level = map_id
+        game.load_level(map_id)
+
+    return {'game/frame/' + str(map_id): (setup, frame), 'game/draw/' + str(map_id): (setup, draw)}
+
+def scene_benchmarks(game, path):
+    # scenes come from scripts.stress, the setup puts every enemy, arrow and spark back
+    def setup():
+        apply_scene(game, path)
+
+    def frame():
+        game.step()
+        game.draw()
+
+    return {'scene/' + os.path.splitext(os.path.basename(path))[0] + '/frame': (setup, frame)}
+
+def snapshot_benchmarks(game, frames=120):
+    # a level some way into play, with enemies walking and arrows in the air
+    def setup():
+        game.level = 0
+        game.load_level(0)
+        game.simulate(frames)
+
+    def take():
+        capture(game)
+
+    def put_back():
+        restore(game, snapshot)
+
+    setup()
+    snapshot = capture(game)
+    return {'snapshot/capture': (setup, take), 'snapshot/restore': (setup, put_back)}
+
+def collect_benchmarks(game, count=DEFAULT_COUNT, scenes=()):
+    benchmarks = {'calibration': (None, calibration)}
+    maps = map_ids()
+    for map_id in maps:
+        benchmarks.update(tilemap_benchmarks(game, map_id, count))
+        benchmarks.update(level_benchmarks(game, map_id))
+    benchmarks.update(entity_benchmarks(game, count))
+    benchmarks.update(effect_benchmarks(game, count))
+    for map_id in maps:
+        benchmarks.update(frame_benchmarks(game, map_id))
+    benchmarks.update(snapshot_benchmarks(game))
+    for path in scenes:
+        benchmarks.update(scene_benchmarks(game, path))
+    return benchmarks
+
+def run_benchmarks(names=None, count=DEFAULT_COUNT, repeats=DEFAULT_REPEATS, min_time=MIN_SAMPLE_SECONDS, scenes=(), interleave=False):
+    use_headless_drivers()
+    game = Game(seed=0)
+    benchmarks = {name: benchmark for name, benchmark in collect_benchmarks(game, count, scenes).items() if not names or any(part in name for part in names)}
+    if interleave:
+        results = measure_interleaved(benchmarks, repeats, min_time)
+    else:
+        results = {}
+        for name, (setup, run) in benchmarks.items():
+            if setup:
+                setup()
+            results[name] = measure(run, repeats, min_time)
+    return {'machine': machine_info(), 'count': count, 'repeats': repeats, 'interleaved': interleave, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+
+def write_results(report, path=BENCHMARK_RESULTS):
+    f = open(path, 'w')
+    json.dump(report, f, indent=1)
+    f.close()
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the game\'s hot paths headless and write the results as JSON.')
+    parser.add_argument('names', nargs='*', help='only run benchmarks whose name contains one of these')
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT, help='entities, sparks, particles and lookups per call')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--out', default=BENCHMARK_RESULTS)
+    parser.add_argument('--scene', nargs='+', default=[], help='also time whole frames of these scripts.stress scenes')
+    args = parser.parse_args()
+    report = run_benchmarks(args.names, args.count, args.repeats, scenes=args.scene)
+    for name, result in report['results'].items():
+        print(name.ljust(44) + format(result['median'], '10.4f') + ' ms  +- ' + format(result['stdev'], '.4f'))
+    print('results written to', write_results(report, args.out))
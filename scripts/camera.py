@@ -0,0 +1,41 @@
+# MyPygame: camera
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+
+CULL_MARGIN = 24
+
+class Camera:
+    def __init__(self, size, margin=CULL_MARGIN):
+        self.size = tuple(size)
+        self.margin = margin
+        self.view = pygame.Rect(-margin, -margin, self.size[0] + margin * 2, self.size[1] + margin * 2)
+        self.visible = 0
+        self.culled = 0
+
+    def move(self, render_scroll):
+        self.view.topleft = (render_scroll[0] - self.margin, render_scroll[1] - self.margin)
+        self.visible = 0
+        self.culled = 0
+
+    def sees(self, rect):
+        if self.view.colliderect(rect):
+            self.visible += 1
+            return True
+        self.culled += 1
+        return False
+
+    def sees_point(self, pos):
+        if self.view.left <= pos[0] < self.view.right and self.view.top <= pos[1] < self.view.bottom:
+            self.visible += 1
+            return True
+        self.culled += 1
+        return False
+
+    def visible_points(self, xs, ys):
+        left, top, right, bottom = self.view.left, self.view.top, self.view.right, self.view.bottom
+        indices = [i for i, x in enumerate(xs) if left <= x < right and top <= ys[i] < bottom]
+        self.visible += len(indices)
+        self.culled += len(xs) - len(indices)
+        return indices
@@ -4,6 +4,9 @@
 # 10/4/24
 
 import random
+import pygame
+
+CLOUD_BANDS = 4
 
 class Cloud:
     def __init__(self, pos, img, speed, depth):
@@ -19,17 +22,82 @@ class Cloud:
         render_pos = (self.pos[0] - offset[0] * self.depth, self.pos[1] - offset[1] * self.depth)
         surf.blit(self.img, (render_pos[0] % (surf.get_width() + self.img.get_width()) - self.img.get_width(), render_pos[1] % (surf.get_height() + self.img.get_height()) - self.img.get_height()) )
 
+class CloudLayer:
+    def __init__(self, depth, speed):
+        self.pos = [0, 0]
+        self.depth = depth
+        self.speed = speed
+        self.clouds = []
+        self.img = None
+        self.period = (0, 0)
+        self.view_size = (0, 0)
+
+    def add(self, cloud):
+        self.clouds.append(cloud)
+        self.img = None
+
+    def update(self):
+        self.pos[0] += self.speed
+
+    def build(self, view_size):
+        self.view_size = view_size
+        self.period = (view_size[0] + max(cloud.img.get_width() for cloud in self.clouds), view_size[1] + max(cloud.img.get_height() for cloud in self.clouds))
+        self.img = pygame.Surface((self.period[0] + view_size[0], self.period[1] + view_size[1]))
+        self.img.set_colorkey((0, 0, 0))
+        for cloud in self.clouds:
+            x = cloud.pos[0] % self.period[0]
+            y = cloud.pos[1] % self.period[1]
+            for dx in (-self.period[0], 0, self.period[0]):
+                for dy in (-self.period[1], 0, self.period[1]):
+                    self.img.blit(cloud.img, (x + dx, y + dy))
+
+    def area(self, offset):
+        return (int((offset[0] * self.depth - self.pos[0]) % self.period[0]), int((offset[1] * self.depth - self.pos[1]) % self.period[1]))
+
+    def sprites(self, commands, view_size, offset=(0,0)):
+        if self.img is None or self.view_size != view_size:
+            self.build(view_size)
+        x, y = self.area(offset)
+        commands.append((self.img, (0, 0), (x, y, view_size[0], view_size[1])))
+        return commands
+
+    def render(self, surf, offset=(0,0)):
+        return surf.blit(*self.sprites([], (surf.get_width(), surf.get_height()), offset)[0])
+
 class Clouds:
-    def __init__ (self, cloud_images, count=16):
+    def __init__ (self, cloud_images, count=16, bands=CLOUD_BANDS, rng=random):
         self.clouds_list = []
         for _ in range(count):
-            self.clouds_list.append(Cloud((random.random() * 99999, random.random() * 99999), random.choice(cloud_images), random.random() * 0.05 + 0.05, random.random() * 0.6 + 0.2) )
+            self.clouds_list.append(Cloud((rng.random() * 99999, rng.random() * 99999), rng.choice(cloud_images), rng.random() * 0.05 + 0.05, rng.random() * 0.6 + 0.2) )
         self.clouds_list.sort(key=lambda x: x.depth)
 
+        self.layers = []
+        groups = {}
+        for cloud in self.clouds_list:
+            groups.setdefault(min(int((cloud.depth - 0.2) / 0.6 * bands), bands - 1), []).append(cloud)
+        for band in sorted(groups):
+            group = groups[band]
+            layer = CloudLayer(sum(cloud.depth for cloud in group) / len(group), sum(cloud.speed for cloud in group) / len(group))
+            for cloud in group:
+                layer.add(cloud)
+            self.add_layer(layer)
+
+    def add_layer(self, layer):
+        self.layers.append(layer)
+        self.layers.sort(key=lambda x: x.depth)
+
+    def view_key(self, offset):
+        return tuple(layer.area(offset) if layer.img else None for layer in self.layers)
+
     def update(self):
-            for cloud in self.clouds_list:
-                cloud.update()
+            for layer in self.layers:
+                layer.update()
+
+    def sprites(self, commands, view_size, offset=(0,0)):
+            for layer in self.layers:
+                layer.sprites(commands, view_size, offset)
+            return commands
 
     def render(self, surf, offset=(0,0)):
-            for cloud in self.clouds_list:
-                cloud.render(surf, offset=offset)
+            for layer in self.layers:
+                layer.render(surf, offset=offset)
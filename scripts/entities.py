@@ -4,7 +4,6 @@
 # 9.14.24
 
 import pygame
-import random
 import math
 from scripts.spark import Spark
 
@@ -83,8 +82,13 @@ class PhysicsEntity:
         if self.collisions['down'] or self.collisions['up']:
             self.velocity[1] = 0
             
+    def sprites(self, commands, offset=(0,0)):
+        commands.append((self.animation.img(self.flip), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1])))
+        return commands
+
     def render(self, surf, offset=(0,0)):
-        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1]))
+        rects = [surf.blit(img, pos) for img, pos in self.sprites([], offset)]
+        return rects[0].unionall(rects[1:])
 
 
 
@@ -98,8 +102,8 @@ class Enemy(PhysicsEntity):
         enemy_rect = self.rect()
         if self.walking:
             movement = self.handle_walking(tilemap, enemy_rect, movement)
-        elif random.random() < 0.01:
-            self.walking = random.randint(30, 120)
+        elif self.game.rng.enemies.random() < 0.01:
+            self.walking = self.game.rng.enemies.randint(30, 120)
         super().update(tilemap, movement)
         self.update_action(movement)
 
@@ -130,9 +134,10 @@ class Enemy(PhysicsEntity):
 
     def shoot_projectile(self, enemy_rect, velocity_x):
         self.game.sfx['shoot'].play()
-        self.game.projectiles.append([[enemy_rect.centerx + (7 if velocity_x > 0 else -7), enemy_rect.centery], velocity_x, 0, self.flip])
+        pos = (enemy_rect.centerx + (7 if velocity_x > 0 else -7), enemy_rect.centery)
+        self.game.projectiles.spawn(pos, velocity_x, self.flip)
         for _ in range(4):
-            self.game.sparks.append(Spark(self.game.projectiles[-1][0], random.random() - 0.5 + (math.pi if velocity_x < 0 else 0), 2 + random.random(), (255, 255, 255)))
+            self.game.sparks.append(Spark(pos, self.game.rng.sparks.random() - 0.5 + (math.pi if velocity_x < 0 else 0), 2 + self.game.rng.sparks.random(), (255, 255, 255)))
 
     def update_action(self, movement):
         if movement[0] != 0:
@@ -140,14 +145,15 @@ class Enemy(PhysicsEntity):
         else:
             self.set_action('idle')
             
-    def render(self, surf, offset=(0,0)):
-        surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1] + 1))
-        img = pygame.transform.scale(self.game.assets['bow'], (4,8))
-        img = pygame.transform.rotate(img, -15)
+    def sprites(self, commands, offset=(0,0)):
+        commands.append((self.animation.img(self.flip), (self.pos[0] - offset[0] + self.anim_offset[0], self.pos[1] - offset[1] + self.anim_offset[1] + 1)))
         if self.flip:
-            surf.blit(pygame.transform.flip(img, self.flip, False ), ( self.rect().centerx - 5 - img.get_width() - offset[0], self.rect().centery - offset[1] - img.get_height() / 2) )
+            img = self.game.assets['bow/held_flipped']
+            commands.append((img, (self.rect().centerx - 5 - img.get_width() - offset[0], self.rect().centery - offset[1] - img.get_height() / 2)))
         else:
-            surf.blit(img, (self.rect().centerx + 5 - offset[0], self.rect().centery - offset[1] - img.get_height() / 2))
+            img = self.game.assets['bow/held']
+            commands.append((img, (self.rect().centerx + 5 - offset[0], self.rect().centery - offset[1] - img.get_height() / 2)))
+        return commands
 
 
 class Player(PhysicsEntity):
@@ -190,12 +196,12 @@ class Player(PhysicsEntity):
     def attack(self):
         self.attacking = True
 
-    def render(self, surf, offset=(0,0)):
-        #surf.blit
+    def sprites(self, commands, offset=(0,0)):
         if self.attacking and self.flip:
-            surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.attack_offset[0], self.pos[1] - offset[1] + self.attack_offset[1]))
+            commands.append((self.animation.img(self.flip), (self.pos[0] - offset[0] + self.attack_offset[0], self.pos[1] - offset[1] + self.attack_offset[1])))
         elif self.attacking:
-            surf.blit(pygame.transform.flip(self.animation.img(), self.flip, False), (self.pos[0] - offset[0] + self.attack_offset[0] - 5, self.pos[1] - offset[1] + self.attack_offset[1]))
+            commands.append((self.animation.img(self.flip), (self.pos[0] - offset[0] + self.attack_offset[0] - 5, self.pos[1] - offset[1] + self.attack_offset[1])))
         else:
-            surf.blit(pygame.transform.flip(self.game.assets['player/weapon'], self.flip, False) , (self.rect().centerx - offset[0] - (self.rect().width + 4 if self.flip else 2), self.rect().centery - offset[1] - 8))
-            super().render(surf, offset=offset)
+            commands.append((self.game.assets['player/weapon_flipped' if self.flip else 'player/weapon'], (self.rect().centerx - offset[0] - (self.rect().width + 4 if self.flip else 2), self.rect().centery - offset[1] - 8)))
+            super().sprites(commands, offset=offset)
+        return commands
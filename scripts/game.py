@@ -0,0 +1,436 @@
+# MyPygame: game
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import sys
+import math
+import os
+import time
+
+from scripts.startup import StartupTrace
+from scripts.rng import RandomStreams
+from scripts.replay import InputRecorder, state_digest
+from scripts.profiler import FrameProfiler
+from scripts.memory import AllocationTracker, GCMonitor, write_memory_report
+from scripts.telemetry import TelemetryWriter
+from scripts.snapshot import SnapshotRing, SNAPSHOT_INTERVAL
+from scripts.entities import PhysicsEntity, Player, Enemy
+from scripts.assets import shared_assets, STARTUP_ASSETS
+from scripts.tilemap import Tilemap, level_template
+from scripts.clouds import Clouds
+from scripts.particle import Particle, Projectile
+from scripts.projectiles import ArrowPool
+from scripts.renderer import FullRenderer, DirtyRectRenderer, RenderQueue, LAYER_BACKGROUND, LAYER_CLOUDS, LAYER_TILES, LAYER_ENTITIES, LAYER_PROJECTILES, LAYER_PARTICLES
+from scripts.spark import Spark
+from scripts.camera import Camera
+from scripts.audio import VoiceManager, SOUND_MANIFEST, ensure_mixer
+
+# optional, the game runs silent without it
+MUSIC_PATH = 'data/goblino_music.wav'
+
+class Game:
+    def __init__(self, dirty_rects=False, asset_budget=None, profile_startup=False, headless=False, level=0, seed=None, record=None, profile=False, snapshot_interval=SNAPSHOT_INTERVAL, diagnostics=False, gc_freeze=False, gc_schedule=False, telemetry=None):
+        self.startup = StartupTrace(trace_memory=profile_startup)
+        self.profile_startup = profile_startup
+        self.startup.add('imports', self.startup.start, time.perf_counter())
+        self.headless = headless
+        self.rng = RandomStreams(seed)
+        # diagnostics adds allocations per stage to the profile and times every collection
+        self.diagnostics = diagnostics
+        self.profiler = FrameProfiler(enabled=bool(profile or diagnostics or telemetry), memory=AllocationTracker() if diagnostics else None)
+        # telemetry is a file path or unix:PATH, streamed every frame from a background thread
+        self.telemetry = TelemetryWriter(telemetry) if telemetry else None
+        self.gc_monitor = GCMonitor(freeze=gc_freeze, schedule=gc_schedule)
+        if diagnostics:
+            self.gc_monitor.install()
+
+        # only the display is needed for the first frame, the mixer starts after it
+        with self.startup.phase('display'):
+            driver = os.environ.get('SDL_VIDEODRIVER')
+            if headless and not pygame.display.get_init():
+                # images still need a display to convert against, but it never opens a window
+                os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
+            # SDL only reads the driver when the display starts, later games in this process get their own
+            if driver is None:
+                os.environ.pop('SDL_VIDEODRIVER', None)
+            else:
+                os.environ['SDL_VIDEODRIVER'] = driver
+            
+            pygame.display.set_caption("Calen's Game")
+            self.movement = [False, False, False, False]
+            scr_res = (640,480)
+            
+            self.screen = pygame.display.set_mode(scr_res)
+            self.display = pygame.Surface((320, 240))
+            self.clock = pygame.time.Clock()
+        with self.startup.phase('renderer'):
+            self.renderer = None if headless else (DirtyRectRenderer if dirty_rects else FullRenderer)(self.screen, self.display)
+            self.queue = RenderQueue()
+            self.camera = Camera(self.display.get_size())
+        with self.startup.phase('assets'):
+            self.assets = shared_assets(asset_budget)
+            # drawn every frame for the whole game, so a budget never evicts them
+            self.assets.pin(STARTUP_ASSETS)
+
+        self.sfx = VoiceManager(SOUND_MANIFEST, muted=headless)
+
+        with self.startup.phase('level'):
+            self.player = Player(self,(50,50), (10,13))
+            self.projectiles = ArrowPool(self.assets['projectile/arrow'], self.assets['projectile/arrow_flipped'])
+            self.tilemap = Tilemap(self, tile_size=16)
+            self.level = level
+            self.pinned_level = None
+            self.started = False
+            self.frame = 0
+            self.level_start = 0
+            self.stats = {'clears': [], 'deaths': {}, 'fireballs': 0}
+            try:
+                self.load_level(self.level)
+            except FileNotFoundError:
+                pass
+        with self.startup.phase('clouds'):
+            self.clouds = Clouds(self.assets['clouds'], count=16, rng=self.rng.clouds)
+        self.screenshake = 0
+        self.shake_offset = (0, 0)
+        self.scroll_inc = 30
+        self.render_scroll = 0
+        self.recorder = InputRecorder(record, self.rng.seed, level) if record else None
+        self.snapshots = SnapshotRing(snapshot_interval) if snapshot_interval else None
+    
+    def load_level(self, map_id, path=None):
+        # path loads a map from outside data/maps, and respawning keeps using it
+        self.level_path = path
+        template = level_template(path or 'data/maps/' + str(map_id) + '.json')
+        self.tilemap.use(template)
+        self.leaf_spawners = [pygame.Rect(rect) for rect in template.tree_rects]
+
+        self.enemies = [Enemy(self, pos, (8,15)) for pos in template.enemy_spawns]
+        if template.player_spawn:
+            self.player.pos = list(template.player_spawn)
+            self.player.air_time = 0
+        if not self.headless:
+            self.pin_level_assets(map_id, include_next=self.started)
+                
+        self.projectiles.clear()
+        self.player_projectiles = []
+        self.particles = []
+        self.sparks = []
+        
+        self.scroll = [0,0]
+        self.enemy_rects = {}
+        self.dead = 0
+        self.transition = -30
+        self.gc_monitor.level_loaded()
+
+    def pin_level_assets(self, map_id, include_next=True):
+        if (map_id, include_next) == self.pinned_level:
+            return
+        types = self.tilemap.asset_types()
+        next_path = 'data/maps/' + str(map_id + 1) + '.json'
+        if include_next and os.path.exists(next_path):
+            types |= level_template(next_path).asset_types
+        self.assets.unpin(self.assets.pinned - types - set(STARTUP_ASSETS))
+        self.assets.pin(types)
+        self.pinned_level = (map_id, include_next)
+
+    def handle_enemies(self):
+        for enemy in self.enemies.copy():
+            enemy.update(self.tilemap, movement=(0,0))
+        for enemy in self.enemies:
+            self.enemy_rects[enemy] = enemy.rect()
+
+    def render_entities(self):
+        commands = self.queue.layer(LAYER_ENTITIES)
+        for enemy in self.enemies:
+            if self.camera.sees(enemy.rect()):
+                enemy.sprites(commands, offset=self.render_scroll)
+        if not self.dead and self.camera.sees(self.player.rect()):
+            self.player.sprites(commands, offset=self.render_scroll)
+        
+    def initial_sound(self):
+        ensure_mixer()
+        if os.path.exists(MUSIC_PATH):
+            pygame.mixer.music.load(MUSIC_PATH)
+            pygame.mixer.music.set_volume(0.4)
+            pygame.mixer.music.play(-1)
+
+        self.sfx['ambience'].play(-1)
+        self.sfx.preload(background=True)
+
+    def finish_startup(self):
+        self.started = True
+        self.startup.mark_first_frame()
+        with self.startup.phase('audio'):
+            self.initial_sound()
+        with self.startup.phase('next level assets'):
+            self.pin_level_assets(self.level)
+        if self.profile_startup:
+            print('startup report written to', self.startup.write())
+    def handle_scroll(self):
+        self.scroll[0] += (self.player.rect().centerx - self.display.get_width() / 2 - self.scroll[0]) / self.scroll_inc
+        self.scroll[1] += (self.player.rect().centery - self.display.get_height() / 2 - self.scroll[1]) / self.scroll_inc
+        self.render_scroll = (int(self.scroll[0]), int(self.scroll[1]))
+        self.camera.move(self.render_scroll)
+
+    def handle_kill_particles(self):
+        for spark in self.sparks.copy():
+            if spark.update():
+                self.sparks.remove(spark)
+        for particle in self.particles.copy():
+            kill = particle.update()
+            if particle.type == 'leaf':
+                particle.pos[0] += math.sin(particle.animation.frame * 0.035) * 0.3
+            if kill:
+                self.particles.remove(particle)
+    
+    def handle_player_projectiles(self):
+        for projectile in self.player_projectiles.copy():
+            kill = projectile.update()
+            if kill[0]:
+                for _ in range(30):
+                    angle = self.rng.sparks.random() * math.pi * 2
+                    speed = self.rng.sparks.random() * 5
+                    self.sparks.append(Spark( ((projectile.rect().right if projectile.velocity[0] > 0 else projectile.rect().left), projectile.rect().center[1]) , angle, speed, (255,119,0)))
+                if kill[2] == 'enemy':
+                    del self.enemy_rects[self.enemies.pop(self.enemies.index(kill[1]))]
+                    self.screenshake = max(16, self.screenshake)
+                self.sfx['explosion'].play()
+                self.player_projectiles.remove(projectile)
+    
+    def handle_enemy_projectiles(self):
+        self.projectiles.update()
+        tile_hits, player_hits = self.projectiles.collide(self.tilemap, self.player.rect())
+        for pos, velocity_x in tile_hits:
+            for _ in range(4):
+                self.sparks.append(Spark(pos, self.rng.sparks.random() - 0.5 + (math.pi if velocity_x > 0 else 0), 2 + self.rng.sparks.random(),(255,255,255)))
+        for _ in player_hits:
+            self.dead += 1
+            self.sfx['hit'].play()
+            self.screenshake = max(16, self.screenshake)
+            for _ in range(30):
+                angle = self.rng.sparks.random() * math.pi * 2
+                speed = self.rng.sparks.random() * 5
+                self.sparks.append(Spark(self.player.rect().center, angle, speed,(255,255,255)))
+                self.particles.append(Particle(self, 'particle', self.player.rect().center, velocity=[math.cos(angle + math.pi) * speed * 0.5, math.sin(angle + math.pi) * speed * 0.5], frame = self.rng.particles.randint(0, 7)))
+
+    def render_projectiles(self):
+        commands = self.queue.layer(LAYER_PROJECTILES)
+        self.projectiles.sprites(commands, offset=self.render_scroll, camera=self.camera)
+        for projectile in self.player_projectiles:
+            if self.camera.sees(projectile.rect()):
+                projectile.sprites(commands, offset=self.render_scroll)
+
+    def render_particles(self):
+        commands = self.queue.layer(LAYER_PARTICLES)
+        for particle in self.particles:
+            if self.camera.sees_point(particle.pos):
+                particle.sprites(commands, offset=self.render_scroll)
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.handle_quit_event()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.handle_mouse_event(event)
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                self.handle_keyboard_event(event)
+
+    def handle_quit_event(self):
+        self.stop_recording()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.profiler.frames:
+            print('frame profile written to', self.profiler.export(level=self.level))
+        if self.diagnostics:
+            print('memory report written to', write_memory_report(self.profiler.memory, self.gc_monitor))
+            self.gc_monitor.uninstall()
+        pygame.quit()
+        sys.exit()
+
+    def handle_mouse_event(self, event):
+        if event.button == 1 and not self.player.attacking:
+            self.player.attack()
+            self.stats['fireballs'] += 1
+            self.sfx['fireball'].play()
+            direction = -1.5 if self.player.flip else 1.5
+            offset_x = -16 if self.player.flip else 0
+            self.player_projectiles.append(
+                Projectile(self, self.tilemap, 'fireball', [self.player.pos[0] + offset_x, self.player.pos[1] - 3], [direction, 0])
+            )
+
+    def handle_keyboard_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.handle_keydown(event.key)
+        elif event.type == pygame.KEYUP:
+            self.handle_keyup(event.key)
+
+    def handle_keydown(self, key):
+        if key == pygame.K_a:
+            self.movement[0] = True
+        elif key == pygame.K_d:
+            self.movement[1] = True
+        elif key == pygame.K_w and self.player.jump():
+            self.sfx['jump'].play()
+        elif key == pygame.K_r and self.snapshots is not None:
+            self.snapshots.rewind(self)
+        elif key == pygame.K_F3:
+            self.profiler.toggle_overlay()
+        elif key == pygame.K_F4 and self.profiler.frames:
+            print('frame profile written to', self.profiler.export(level=self.level))
+        elif key == pygame.K_F5 and self.diagnostics:
+            print('memory report written to', write_memory_report(self.profiler.memory, self.gc_monitor))
+
+    def handle_keyup(self, key):
+        if key == pygame.K_a:
+            self.movement[0] = False
+        elif key == pygame.K_d:
+            self.movement[1] = False
+    
+    def handle_level_transition(self):
+        if not len(self.enemies):
+            self.transition += 1
+            if self.transition > 30:
+                self.stats['clears'].append((self.level, self.frame - self.level_start))
+                self.level = min(self.level + 1, len(os.listdir('data/maps')) - 1)
+                self.level_start = self.frame
+                self.gc_monitor.transition()
+                self.load_level(self.level)
+        if self.transition < 0:
+            self.transition += 1
+            
+        if self.dead:
+            self.dead += 1
+            if self.dead >= 10:
+                self.transition = min(30, self.transition + 1)
+            if self.dead > 40:
+                self.stats['deaths'][self.level] = self.stats['deaths'].get(self.level, 0) + 1
+                self.gc_monitor.transition()
+                self.load_level(self.level, self.level_path)
+    
+    def handle_leaf_spawners(self):
+        for rect in self.leaf_spawners:
+            if self.rng.leaves.random() * 49999 < rect.width * rect.height:
+                pos = (rect.x + self.rng.leaves.random() * rect.width, rect.y + self.rng.leaves.random() * rect.height)
+                self.particles.append(Particle(self, 'leaf', pos, velocity=[-0.1, .3], frame=self.rng.leaves.randint(0,20)))
+
+    def handle_transition(self):
+        if self.transition:
+            self.renderer.transition(self.transition)
+
+    
+    def render_static(self):
+        size = self.display.get_size()
+        self.queue.layer(LAYER_BACKGROUND).append((self.assets['background'], (0,0)))
+        self.clouds.sprites(self.queue.layer(LAYER_CLOUDS), size, offset=self.render_scroll)
+        self.tilemap.sprites(self.queue.layer(LAYER_TILES), size, offset=self.render_scroll)
+        self.queue.flush(self.renderer.static)
+
+    def render_sparks(self):
+        for spark in self.sparks:
+            if self.camera.sees_point(spark.pos):
+                self.renderer.mark(spark.render(self.display, offset=self.render_scroll))
+
+    def stop_recording(self):
+        if self.recorder:
+            self.recorder.close(self.frame, state_digest(self))
+            self.recorder = None
+
+    def step(self, events=()):
+        profiler = self.profiler
+        profiler.begin()
+        if self.recorder:
+            self.recorder.record(self.frame, events)
+        self.handle_events(events)
+        self.screenshake = max(0, self.screenshake - 1)
+        profiler.mark('input')
+
+        self.handle_level_transition()
+        profiler.mark('transition')
+        
+        self.handle_scroll()
+        profiler.mark('scroll')
+        
+        self.handle_leaf_spawners()
+        profiler.mark('leaves')
+        
+        self.clouds.update()
+        profiler.mark('clouds')
+
+        self.handle_enemies()
+        profiler.mark('enemies')
+        
+        if not self.dead:
+            self.player.update(self.tilemap, (self.movement[1] - self.movement[0], 0))
+        profiler.mark('player')
+
+        self.handle_enemy_projectiles()
+        profiler.mark('arrows')
+        
+        self.handle_player_projectiles()
+        profiler.mark('fireballs')
+
+        self.handle_kill_particles()
+        profiler.mark('particles')
+
+        self.sfx.update()
+
+        # rolled here rather than in draw so headless runs use the same random sequence
+        self.shake_offset = (self.rng.shake.random() * self.screenshake - self.screenshake / 2, self.rng.shake.random() * self.screenshake - self.screenshake / 2)
+        self.frame += 1
+        profiler.mark('audio')
+
+        if self.snapshots is not None:
+            self.snapshots.update(self)
+        profiler.mark('snapshot')
+
+    def draw(self):
+        profiler = self.profiler
+        self.queue.reset_stats()
+        if self.renderer.begin((self.render_scroll, self.clouds.view_key(self.render_scroll)), force=bool(self.screenshake or self.transition)):
+            self.render_static()
+            self.renderer.end_static()
+        profiler.mark('render static')
+
+        self.render_entities()
+        self.render_projectiles()
+        self.render_particles()
+        profiler.mark('render queue')
+
+        self.renderer.mark(self.queue.flush(self.display, rects=self.renderer.tracks_rects))
+        profiler.mark('render flush')
+        self.render_sparks()
+        profiler.mark('render sparks')
+
+        self.handle_transition()
+        if profiler.overlay:
+            self.renderer.mark(profiler.render(self.display))
+        
+        self.renderer.present(self.shake_offset)
+        profiler.mark('present')
+        self.end_frame()
+
+    def end_frame(self):
+        self.profiler.count('visible', self.camera.visible)
+        self.profiler.count('culled', self.camera.culled)
+        self.profiler.end()
+        if self.telemetry:
+            self.telemetry.record(self)
+
+    def simulate(self, frames, events=None):
+        # steps without drawing or a frame cap, events maps a frame number to its input events
+        events = events or {}
+        for _ in range(frames):
+            self.step(events.get(self.frame, ()))
+            self.end_frame()
+
+    def run(self):
+        if self.headless:
+            raise ValueError('a headless game has no window to run in, use simulate')
+        while True:
+            self.step(pygame.event.get())
+            self.draw()
+            if not self.started:
+                self.finish_startup()
+            self.clock.tick(60)
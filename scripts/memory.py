@@ -0,0 +1,166 @@
+# MyPygame: memory
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import gc
+import sys
+import time
+import tracemalloc
+from scripts.profiler import StageTimes, PROFILE_WINDOW
+
+MEMORY_REPORT = 'memory_report.txt'
+# one frame in this many is also traced site by site, which makes that frame much slower
+SITE_INTERVAL = 120
+TOP_SITES = 5
+GC_PAUSES = 240
+
+class AllocationTracker:
+    # driven by FrameProfiler, so every profiled stage also gets its allocations
+    def __init__(self, window=PROFILE_WINDOW, site_interval=SITE_INTERVAL):
+        self.window = window
+        self.site_interval = site_interval
+        self.stages = {}
+        self.sites = {}
+        self.frames = 0
+        self.snapshot = None
+        self.last = (0, 0)
+        self.frame_start = (0, 0)
+        self.churn = 0
+        # the tracker's and profiler's own bookkeeping is left out of the sites
+        self.ignored = {tracemalloc.__file__, __file__, sys.modules[StageTimes.__module__].__file__}
+
+    def counters(self):
+        return tracemalloc.get_traced_memory()[0], sys.getallocatedblocks()
+
+    def add(self, stage, retained, churn, blocks):
+        if stage not in self.stages:
+            self.stages[stage] = {'bytes': StageTimes(self.window), 'churn': StageTimes(self.window), 'blocks': StageTimes(self.window)}
+        times = self.stages[stage]
+        times['bytes'].add(retained)
+        times['churn'].add(churn)
+        times['blocks'].add(blocks)
+
+    def begin(self):
+        # started with the first frame rather than the game, so snapshots only hold what the frames allocated
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.site_interval and self.frames % self.site_interval == 0:
+            self.snapshot = tracemalloc.take_snapshot()
+        self.churn = 0
+        self.last = self.frame_start = self.counters()
+        tracemalloc.reset_peak()
+
+    def mark(self, stage):
+        current, peak = tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        # the peak above where the stage started counts memory that was allocated and freed inside it
+        churn = peak - self.last[0]
+        self.churn += churn
+        self.add(stage, current - self.last[0], churn, blocks - self.last[1])
+        if self.snapshot is not None:
+            snapshot = tracemalloc.take_snapshot()
+            sites = self.sites.setdefault(stage, {})
+            for stat in snapshot.compare_to(self.snapshot, 'lineno'):
+                # Snapshot.filter_traces is far slower than skipping the few sites afterward
+                if stat.size_diff > 0 and stat.traceback[0].filename not in self.ignored:
+                    site = str(stat.traceback[0])
+                    total = sites.get(site, (0, 0))
+                    sites[site] = (total[0] + stat.count_diff, total[1] + stat.size_diff)
+            self.snapshot = snapshot
+        # reading the counters allocates too, so the next stage starts after it
+        self.last = self.counters()
+        tracemalloc.reset_peak()
+
+    def end(self):
+        current, blocks = self.counters()
+        self.add('frame', current - self.frame_start[0], self.churn, blocks - self.frame_start[1])
+        self.snapshot = None
+        self.frames += 1
+
+    def top_sites(self, stage, count=TOP_SITES):
+        sites = self.sites.get(stage, {})
+        return sorted(sites.items(), key=lambda item: item[1][1], reverse=True)[:count]
+
+    def report(self):
+        lines = ['stage'.ljust(16) + 'bytes/frame'.rjust(14) + 'churn/frame'.rjust(14) + 'blocks/frame'.rjust(14)]
+        for stage, times in self.stages.items():
+            lines.append(stage.ljust(16) + ''.join(format(times[key].average(), '14.1f') for key in ('bytes', 'churn', 'blocks')))
+        sampled = (self.frames + self.site_interval - 1) // self.site_interval if self.site_interval else 0
+        for stage in self.sites:
+            lines.append('')
+            lines.append('top sites in ' + stage + ' over ' + str(sampled) + ' traced frames')
+            for site, (count, size) in self.top_sites(stage):
+                lines.append('  ' + site.ljust(44) + format(size / 1024, '10.1f') + ' KiB' + str(count).rjust(8) + ' blocks')
+        return '\n'.join(lines)
+
+class GCMonitor:
+    def __init__(self, freeze=False, schedule=False, window=GC_PAUSES):
+        self.freeze = freeze
+        self.schedule = schedule
+        self.pauses = StageTimes(window)
+        self.collections = [0, 0, 0]
+        self.collected = 0
+        self.scheduled = 0
+        self.during_play = 0
+        self.worst = 0
+        self.installed = False
+        self.in_scheduled = False
+        self.start = None
+
+    def install(self):
+        if not self.installed:
+            gc.callbacks.append(self.callback)
+            self.installed = True
+
+    def uninstall(self):
+        if self.installed:
+            gc.callbacks.remove(self.callback)
+            self.installed = False
+
+    def callback(self, phase, info):
+        if phase == 'start':
+            self.start = time.perf_counter_ns()
+            return
+        if self.start is None:
+            return
+        ns = time.perf_counter_ns() - self.start
+        self.start = None
+        self.pauses.add(ns)
+        self.collections[info['generation']] += 1
+        self.collected += info['collected']
+        if self.in_scheduled:
+            self.scheduled += 1
+        else:
+            self.during_play += 1
+            self.worst = max(self.worst, ns)
+
+    def level_loaded(self):
+        # whatever the level holds now lives until the next load, so later collections skip it
+        if self.freeze:
+            gc.freeze()
+
+    def transition(self):
+        # called while the screen is dark between levels, where a full collection cannot be seen
+        if not self.schedule:
+            return
+        if self.freeze:
+            gc.unfreeze()
+        self.in_scheduled = True
+        try:
+            gc.collect()
+        finally:
+            self.in_scheduled = False
+
+    def report(self):
+        lines = ['collections by generation: ' + ' '.join(str(count) for count in self.collections) + ', ' + str(self.collected) + ' objects freed']
+        lines.append('pauses: ' + format(self.pauses.average() / 1e6, '.3f') + ' ms mean, ' + format(self.pauses.percentile(0.99) / 1e6, '.3f') + ' ms p99, ' + format(self.pauses.percentile(1.0) / 1e6, '.3f') + ' ms max')
+        lines.append(str(self.during_play) + ' during play (worst ' + format(self.worst / 1e6, '.3f') + ' ms), ' + str(self.scheduled) + ' scheduled between levels, ' + str(gc.get_freeze_count()) + ' objects frozen')
+        return '\n'.join(lines)
+
+def write_memory_report(tracker, monitor, path=MEMORY_REPORT):
+    f = open(path, 'w')
+    if tracker is not None:
+        f.write(tracker.report() + '\n\n')
+    f.write(monitor.report() + '\n')
+    f.close()
+    return path
@@ -25,9 +25,13 @@ class Particle:
 
         return kill
 
-    def render(self, surf, offset=(0, 0)):
+    def sprites(self, commands, offset=(0, 0)):
         img  = self.animation.img()
-        surf.blit(img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2))
+        commands.append((img, (self.pos[0] - offset[0] - img.get_width() // 2, self.pos[1] - offset[1] - img.get_height() // 2)))
+        return commands
+
+    def render(self, surf, offset=(0, 0)):
+        return surf.blit(*self.sprites([], offset)[0])
 class Projectile(Particle):
     def __init__(self, game, tilemap, p_type, pos, velocity=[0,0], frame=0):
         super().__init__(game, 'fireball', pos, velocity)
@@ -53,7 +57,7 @@ class Projectile(Particle):
         self.projectileFTD -= 1
         self.animation.update()
         return kill
-    def render(self, surf, offset=(0,0)):
-        img  = self.animation.img()
-        img = pygame.transform.scale(img, (32,16))
-        surf.blit(pygame.transform.flip(img, (True if self.velocity[0] < 0 else False), False), (self.pos[0] - offset[0], self.pos[1] - offset[1]))
+    def sprites(self, commands, offset=(0,0)):
+        img  = self.animation.img(self.velocity[0] < 0)
+        commands.append((img, (self.pos[0] - offset[0], self.pos[1] - offset[1])))
+        return commands
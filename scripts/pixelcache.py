@@ -0,0 +1,70 @@
+# MyPygame: pixelcache
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import hashlib
+import mmap
+import os
+import struct
+
+PIXEL_CACHE_PATH = '.cache/pixels/'
+PIXEL_MAGIC = b'PXC1'
+# magic, source mtime_ns, width, height, has colorkey, colorkey rgb
+PIXEL_HEADER = struct.Struct('<4sqII4B')
+
+class PixelCache:
+    def __init__(self, path=PIXEL_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    def entry_path(self, source, colorkey=None):
+        key = source + '|' + (','.join(str(c) for c in colorkey[:3]) if colorkey else '')
+        return self.path + hashlib.sha1(key.encode()).hexdigest() + '.px'
+
+    def header(self, source, size, colorkey=None):
+        key = tuple(colorkey[:3]) if colorkey else (0, 0, 0)
+        return PIXEL_HEADER.pack(PIXEL_MAGIC, os.stat(source).st_mtime_ns, size[0], size[1], 1 if colorkey else 0, *key)
+
+    def load(self, source, colorkey=None):
+        try:
+            f = open(self.entry_path(source, colorkey), 'rb')
+        except OSError:
+            self.misses += 1
+            return None
+        with f:
+            if os.fstat(f.fileno()).st_size < PIXEL_HEADER.size:
+                self.misses += 1
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with buffer:
+            magic, mtime, width, height = PIXEL_HEADER.unpack_from(buffer)[:4]
+            if buffer[:PIXEL_HEADER.size] != self.header(source, (width, height), colorkey) or len(buffer) != PIXEL_HEADER.size + width * height * 4:
+                self.misses += 1
+                return None
+            pixels = memoryview(buffer)[PIXEL_HEADER.size:]
+            img = pygame.image.frombuffer(pixels, (width, height), 'RGBX').convert()
+            del pixels
+        if colorkey:
+            img.set_colorkey(colorkey)
+        self.hits += 1
+        return img
+
+    def store(self, source, img, colorkey=None):
+        entry = self.entry_path(source, colorkey)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            f = open(entry + '.tmp', 'wb')
+            f.write(self.header(source, img.get_size(), colorkey))
+            f.write(pygame.image.tobytes(img, 'RGBX'))
+            f.close()
+            os.replace(entry + '.tmp', entry)
+        except OSError:
+            pass
+
+    def clear(self):
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                if name.endswith('.px'):
+                    os.remove(self.path + name)
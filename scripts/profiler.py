@@ -0,0 +1,144 @@
+# MyPygame: profiler
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import time
+from array import array
+
+FRAME_BUDGET_NS = 1000000000 // 60
+PROFILE_WINDOW = 240
+OVERLAY_REFRESH = 15
+PROFILE_EXPORT = 'frame_profile.csv'
+
+class StageTimes:
+    # the last `size` samples of one stage in nanoseconds, overwritten in place
+    def __init__(self, size=PROFILE_WINDOW):
+        self.samples = array('q', bytes(8 * size))
+        self.index = 0
+        self.count = 0
+
+    def add(self, ns):
+        self.samples[self.index] = ns
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def values(self):
+        return self.samples[:self.count]
+
+    def average(self):
+        return sum(self.values()) / self.count if self.count else 0
+
+    def percentile(self, fraction):
+        values = sorted(self.values())
+        if not values:
+            return 0
+        return values[min(int(fraction * len(values)), len(values) - 1)]
+
+class FrameProfiler:
+    def __init__(self, enabled=False, window=PROFILE_WINDOW, memory=None):
+        self.enabled = enabled
+        self.window = window
+        # an AllocationTracker from scripts.memory, told about every stage as it is timed
+        self.memory = memory
+        self.overlay = False
+        self.stages = {}
+        # each stage's time in the most recent frame, for telemetry
+        self.latest = {}
+        # per frame counts shown under the stages, like how much the camera culled
+        self.counts = {}
+        self.frames = 0
+        self.start = None
+        self.last = None
+        self.font = None
+        self.panel = None
+
+    def begin(self):
+        if self.enabled:
+            if self.memory:
+                self.memory.begin()
+            self.start = self.last = time.perf_counter_ns()
+
+    def mark(self, stage):
+        # time since the previous mark goes to `stage`, so each stage costs one clock read
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if stage not in self.stages:
+            self.stages[stage] = StageTimes(self.window)
+        self.stages[stage].add(now - self.last)
+        self.latest[stage] = now - self.last
+        if self.memory:
+            self.memory.mark(stage)
+            # tracing is slow, leave it out of the next stage's time
+            now = time.perf_counter_ns()
+        self.last = now
+
+    def count(self, name, value):
+        if self.enabled:
+            self.counts[name] = value
+
+    def end(self):
+        if not self.enabled or self.start is None:
+            return
+        if 'frame' not in self.stages:
+            self.stages['frame'] = StageTimes(self.window)
+        self.latest['frame'] = time.perf_counter_ns() - self.start
+        self.stages['frame'].add(self.latest['frame'])
+        self.frames += 1
+        if self.memory:
+            self.memory.end()
+
+    def toggle_overlay(self):
+        self.overlay = not self.overlay
+        if self.overlay and not self.enabled:
+            self.enabled = True
+            self.begin()
+        self.panel = None
+
+    def summary(self):
+        rows = []
+        for stage, times in self.stages.items():
+            rows.append({'stage': stage, 'samples': times.count, 'mean_ms': times.average() / 1e6, 'p50_ms': times.percentile(0.5) / 1e6, 'p99_ms': times.percentile(0.99) / 1e6, 'max_ms': times.percentile(1.0) / 1e6})
+        return rows
+
+    def slowest(self):
+        stages = [row for row in self.summary() if row['stage'] != 'frame']
+        return max(stages, key=lambda row: row['p99_ms'])['stage'] if stages else None
+
+    def export(self, path=PROFILE_EXPORT, level=None):
+        f = open(path, 'w')
+        f.write('level,stage,samples,mean_ms,p50_ms,p99_ms,max_ms\n')
+        for row in self.summary():
+            f.write(','.join([str(level), row['stage'], str(row['samples'])] + [format(row[key], '.4f') for key in ('mean_ms', 'p50_ms', 'p99_ms', 'max_ms')]) + '\n')
+        f.close()
+        return path
+
+    def build_panel(self):
+        if self.font is None:
+            pygame.font.init()
+            self.font = pygame.font.Font(None, 12)
+        slowest = self.slowest()
+        lines = [('stage', 'avg', 'p99 ms', (255, 255, 255))]
+        for row in self.summary():
+            over = row['stage'] == 'frame' and row['p99_ms'] * 1e6 > FRAME_BUDGET_NS
+            color = (255, 90, 90) if over else (255, 220, 120) if row['stage'] == slowest else (255, 255, 255)
+            lines.append((row['stage'], format(row['mean_ms'], '.2f'), format(row['p99_ms'], '.2f'), color))
+        for name, value in self.counts.items():
+            lines.append((name, str(value), '', (160, 200, 255)))
+        cells = [[self.font.render(text, True, line[3]) for text in line[:3]] for line in lines]
+        widths = [max(row[column].get_width() for row in cells) + 6 for column in range(3)]
+        height = self.font.get_linesize()
+        self.panel = pygame.Surface((sum(widths) + 4, height * len(cells) + 4), pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 170))
+        for y, row in enumerate(cells):
+            # stage names line up on the left, numbers on the right of their column
+            self.panel.blit(row[0], (2, 2 + y * height))
+            self.panel.blit(row[1], (2 + widths[0] + widths[1] - 6 - row[1].get_width(), 2 + y * height))
+            self.panel.blit(row[2], (2 + sum(widths) - 6 - row[2].get_width(), 2 + y * height))
+
+    def render(self, surf, pos=(2, 2)):
+        # rebuilding the text every frame would show up in the numbers it is drawing
+        if self.panel is None or self.frames % OVERLAY_REFRESH == 0:
+            self.build_panel()
+        return surf.blit(self.panel, pos)
@@ -0,0 +1,77 @@
+# MyPygame: projectiles
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+from array import array
+
+ARROW_LIFETIME = 360
+
+class ArrowPool:
+    def __init__(self, img, flipped_img):
+        self.imgs = (img, flipped_img)
+        self.half_size = (self.imgs[0].get_width() / 2, self.imgs[0].get_height() / 2)
+        self.spawned = 0
+        self.clear()
+
+    def clear(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.vx = array('d')
+        self.age = array('H')
+        self.flip = array('B')
+
+    def __len__(self):
+        return len(self.x)
+
+    def spawn(self, pos, velocity_x, flip):
+        self.x.append(pos[0])
+        self.y.append(pos[1])
+        self.vx.append(velocity_x)
+        self.age.append(0)
+        self.flip.append(1 if flip else 0)
+        self.spawned += 1
+
+    def update(self):
+        self.x = array('d', [x + vx for x, vx in zip(self.x, self.vx)])
+        self.age = array('H', [age + 1 for age in self.age])
+
+    def sprites(self, commands, offset=(0,0), camera=None):
+        imgs = self.imgs
+        ox = offset[0] + self.half_size[0]
+        oy = offset[1] + self.half_size[1]
+        if camera is None:
+            commands += [(imgs[flip], (x - ox, y - oy)) for x, y, flip in zip(self.x, self.y, self.flip)]
+            return commands
+        x, y, flip = self.x, self.y, self.flip
+        commands += [(imgs[flip[i]], (x[i] - ox, y[i] - oy)) for i in camera.visible_points(x, y)]
+        return commands
+
+    def render(self, surf, offset=(0,0), camera=None):
+        return surf.blits(self.sprites([], offset, camera))
+
+    def collide(self, tilemap, player_rect):
+        tile_hits = []
+        player_hits = []
+        solid = tilemap.solid_check_many(zip(self.x, self.y))
+        left, top, right, bottom = player_rect.left, player_rect.top, player_rect.right, player_rect.bottom
+        keep = []
+        for i, x in enumerate(self.x):
+            y = self.y[i]
+            if solid[i]:
+                tile_hits.append(((x, y), self.vx[i]))
+            elif self.age[i] > ARROW_LIFETIME:
+                pass
+            elif left <= int(x) < right and top <= int(y) < bottom:
+                player_hits.append(((x, y), self.vx[i]))
+            else:
+                keep.append(i)
+        if len(keep) != len(self.x):
+            self.compact(keep)
+        return tile_hits, player_hits
+
+    def compact(self, keep):
+        self.x = array('d', [self.x[i] for i in keep])
+        self.y = array('d', [self.y[i] for i in keep])
+        self.vx = array('d', [self.vx[i] for i in keep])
+        self.age = array('H', [self.age[i] for i in keep])
+        self.flip = array('B', [self.flip[i] for i in keep])
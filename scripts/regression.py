@@ -0,0 +1,202 @@
+# MyPygame: regression
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+
+BASELINE_DIR = 'benchmarks/'
+# the paths every frame goes through, by benchmark name prefix
+GATE_BENCHMARKS = ['calibration', 'tilemap/0/render', 'tilemap/1/render', 'tilemap/2/render', 'entities/update', 'particles/update', 'game/frame']
+GATE_REPEATS = 25
+# longer samples than the benchmark default, each one averages out more of what else the machine is doing
+GATE_MIN_TIME = 0.1
+BASELINE_RUNS = 5
+# a benchmark regresses when its median is this much slower...
+TOLERANCE = 0.10
+# ...by more than this many times the combined noise of both runs...
+NOISE_SIGMAS = 3
+# ...and the samples are this unlikely to come from the same distribution
+SIGNIFICANCE = 0.05
+# the noise never lets a benchmark slow down by more than this, a noisier machine risks failing on noise instead
+MAX_ALLOWED = 0.25
+
+def machine_profile():
+    return '-'.join([platform.system().lower(), platform.machine().lower() or 'unknown', str(os.cpu_count()) + 'cpu', 'py' + '.'.join(platform.python_version_tuple()[:2])])
+
+def baseline_path(profile, directory=BASELINE_DIR):
+    return os.path.join(directory, profile + '.json')
+
+def load_baseline(profile, directory=BASELINE_DIR):
+    path = baseline_path(profile, directory)
+    if not os.path.exists(path):
+        return None
+    f = open(path, 'r')
+    baseline = json.load(f)
+    f.close()
+    return baseline
+
+def build_baseline(reports, profile):
+    # several runs, so the baseline also knows how much a median moves from one run to the next
+    names = sorted(set.intersection(*[set(report['results']) for report in reports]))
+    return {
+        'profile': profile,
+        'machine': reports[0]['machine'],
+        'count': reports[0]['count'],
+        'created': reports[0]['created'],
+        'interleaved': all(report.get('interleaved', False) for report in reports),
+        'runs': {name: [report['results'][name]['samples'] for report in reports] for name in names},
+    }
+
+def save_baseline(reports, profile, directory=BASELINE_DIR):
+    os.makedirs(directory, exist_ok=True)
+    baseline = build_baseline(reports, profile)
+    path = baseline_path(profile, directory)
+    f = open(path, 'w')
+    json.dump(baseline, f, indent=1, sort_keys=True)
+    f.close()
+    return path
+
+def noise(samples):
+    # median absolute deviation scaled to match a standard deviation, one slow sample barely moves it
+    median = statistics.median(samples)
+    return 1.4826 * statistics.median(abs(sample - median) for sample in samples)
+
+def median_error(samples):
+    # how far the median of this many samples wanders, which is what the gate compares
+    return 1.2533 * noise(samples) / math.sqrt(len(samples))
+
+def slower_p(baseline, samples):
+    # one sided Mann-Whitney U with the normal approximation: the chance `samples` is not slower
+    n, m = len(baseline), len(samples)
+    u = sum(1.0 if new > old else 0.5 if new == old else 0.0 for new in samples for old in baseline)
+    mean = n * m / 2
+    sd = math.sqrt(n * m * (n + m + 1) / 12)
+    if not sd:
+        return 1.0
+    z = (u - mean - 0.5) / sd
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def calibrated(runs, reference, interleaved=False):
+    # rescale each run to the speed the machine had when `reference` was measured,
+    # sample by sample when every sample has a calibration sample from the same round
+    if 'calibration' not in runs:
+        return runs
+    if interleaved:
+        return {name: [[sample * reference / speed for sample, speed in zip(samples, calibration)] for samples, calibration in zip(run_samples, runs['calibration'])] for name, run_samples in runs.items()}
+    return {name: [[sample * reference / statistics.median(calibration) for sample in samples] for samples, calibration in zip(run_samples, runs['calibration'])] for name, run_samples in runs.items()}
+
+def noise_allowance(baseline_runs, samples, sigmas=NOISE_SIGMAS):
+    # how far in ms the median moves by chance, between and within runs
+    baseline = [sample for run in baseline_runs for sample in run]
+    run_noise = statistics.stdev([statistics.median(run) for run in baseline_runs]) if len(baseline_runs) > 1 else 0.0
+    return sigmas * math.hypot(run_noise, median_error(baseline), median_error(samples))
+
+def allowed_change(baseline_runs, samples, tolerance=TOLERANCE, sigmas=NOISE_SIGMAS, limit=MAX_ALLOWED):
+    # the slowdown in ms a benchmark may show before it counts, never less than the tolerance or more than the limit
+    old = statistics.median([sample for run in baseline_runs for sample in run])
+    return max(tolerance * old, min(noise_allowance(baseline_runs, samples, sigmas), limit * old))
+
+def compare_benchmark(baseline_runs, samples, tolerance=TOLERANCE, sigmas=NOISE_SIGMAS, significance=SIGNIFICANCE):
+    baseline = [sample for run in baseline_runs for sample in run]
+    old, new = statistics.median(baseline), statistics.median(samples)
+    threshold = allowed_change(baseline_runs, samples, tolerance, sigmas)
+    change = new - old
+    if change > threshold and slower_p(baseline, samples) < significance:
+        status = 'regressed'
+    elif -change > threshold and slower_p(samples, baseline) < significance:
+        status = 'improved'
+    else:
+        status = 'ok'
+    return {'baseline_ms': old, 'current_ms': new, 'change': change / old if old else 0.0, 'threshold': threshold / old if old else 0.0, 'noise': noise_allowance(baseline_runs, samples, sigmas) / old if old else 0.0, 'p': slower_p(baseline, samples), 'status': status}
+
+def calibration_reference(baseline):
+    return statistics.median([sample for run in baseline['runs'].get('calibration', [[1.0]]) for sample in run])
+
+def too_noisy(baseline, limit=MAX_ALLOWED, sigmas=NOISE_SIGMAS):
+    # the noise each benchmark would show against a check about as noisy as its recorded runs, where it is over the limit
+    rows = {}
+    for name, runs in calibrated(baseline['runs'], calibration_reference(baseline), baseline.get('interleaved', False)).items():
+        if name == 'calibration':
+            continue
+        old = statistics.median([sample for run in runs for sample in run])
+        allowed = statistics.median([noise_allowance(runs, run, sigmas) for run in runs]) / old if old else 0.0
+        if allowed > limit:
+            rows[name] = allowed
+    return rows
+
+def compare(baseline, report, tolerance=TOLERANCE, sigmas=NOISE_SIGMAS, significance=SIGNIFICANCE):
+    reference = calibration_reference(baseline)
+    baseline_runs = calibrated(baseline['runs'], reference, baseline.get('interleaved', False))
+    current = {name: samples[0] for name, samples in calibrated({name: [result['samples']] for name, result in report['results'].items()}, reference, report.get('interleaved', False)).items()}
+    rows = {}
+    for name in sorted(set(baseline_runs) | set(current)):
+        if name == 'calibration':
+            continue
+        if name not in current:
+            rows[name] = {'status': 'missing'}
+        elif name not in baseline_runs:
+            rows[name] = {'current_ms': statistics.median(current[name]), 'status': 'new'}
+        else:
+            rows[name] = compare_benchmark(baseline_runs[name], current[name], tolerance, sigmas, significance)
+    return rows
+
+def format_diff(rows):
+    lines = ['benchmark'.ljust(36) + 'baseline'.rjust(11) + 'current'.rjust(11) + 'change'.rjust(9) + 'allowed'.rjust(9) + 'p'.rjust(8) + '  status']
+    for name, row in rows.items():
+        if 'baseline_ms' in row:
+            lines.append(name.ljust(36) + format(row['baseline_ms'], '9.4f') + 'ms' + format(row['current_ms'], '9.4f') + 'ms' + format(row['change'], '+9.1%') + format(row['threshold'], '9.1%') + format(row['p'], '8.3f') + '  ' + row['status'])
+        else:
+            lines.append(name.ljust(36) + ' ' * 56 + row['status'])
+    return '\n'.join(lines)
+
+def regressions(rows):
+    return [name for name, row in rows.items() if row['status'] == 'regressed']
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare the core benchmarks against the baseline stored for this machine.')
+    parser.add_argument('action', choices=['check', 'record'], help='check fails on a regression, record replaces the baseline')
+    parser.add_argument('--profile', default=machine_profile(), help='baseline name, defaults to one built from this machine')
+    parser.add_argument('--results', help='use a benchmark.json from scripts.benchmark instead of running the gate benchmarks')
+    parser.add_argument('--repeats', type=int, default=GATE_REPEATS)
+    parser.add_argument('--runs', type=int, default=BASELINE_RUNS, help='separate runs to record into a baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+    parser.add_argument('--force', action='store_true', help='record the baseline even if some benchmarks are too noisy to gate')
+    args = parser.parse_args()
+
+    if args.results:
+        f = open(args.results, 'r')
+        reports = [json.load(f)]
+        f.close()
+    else:
+        from scripts.benchmark import run_benchmarks
+        reports = [run_benchmarks(GATE_BENCHMARKS, repeats=args.repeats, min_time=GATE_MIN_TIME, interleave=True) for _ in range(args.runs if args.action == 'record' else 1)]
+    if args.action == 'record':
+        noisy = too_noisy(build_baseline(reports, args.profile))
+        for name, allowed in noisy.items():
+            print(name, 'moves ' + format(allowed, '.1%') + ' by chance, checks against it may fail on noise')
+        if noisy and not args.force:
+            print('baseline not written, record again on a quieter machine or pass --force')
+            sys.exit(3)
+        print('baseline written to', save_baseline(reports, args.profile))
+        sys.exit(0)
+    report = reports[0]
+    baseline = load_baseline(args.profile)
+    if baseline is None:
+        print('no baseline for', args.profile + ', run with record first')
+        sys.exit(2)
+    rows = compare(baseline, report, args.tolerance)
+    print(format_diff(rows))
+    loose = [name for name, row in rows.items() if row.get('noise', 0.0) > MAX_ALLOWED]
+    if loose:
+        print('warning: noisier than the ' + format(MAX_ALLOWED, '.0%') + ' limit, a failure may be noise:', ', '.join(loose))
+    failed = regressions(rows)
+    if failed:
+        print(len(failed), 'benchmark(s) regressed against', baseline_path(args.profile) + ':', ', '.join(failed))
+        sys.exit(1)
+    print('no regressions against', baseline_path(args.profile))
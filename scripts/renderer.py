@@ -0,0 +1,142 @@
+# MyPygame: renderer
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+
+DIRTY_RECT_LIMIT = 64
+TRANSITION_FRAMES = 30
+
+LAYER_BACKGROUND = 0
+LAYER_CLOUDS = 1
+LAYER_TILES = 2
+LAYER_ENTITIES = 3
+LAYER_PROJECTILES = 4
+LAYER_PARTICLES = 5
+
+def transition_masks(size):
+    masks = []
+    for frame in range(TRANSITION_FRAMES + 1):
+        mask = pygame.Surface(size, 0, 8)
+        mask.set_palette([(0, 0, 0), (255, 255, 255)])
+        pygame.draw.circle(mask, (255, 255, 255), (size[0] // 2, size[1] // 2), (TRANSITION_FRAMES - frame) * 8)
+        mask.set_colorkey((255, 255, 255))
+        masks.append(mask)
+    return masks
+
+class FullRenderer:
+    tracks_rects = False
+
+    def __init__(self, screen, display):
+        self.screen = screen
+        self.display = display
+        self.static = display
+        self.scaled = pygame.Surface(screen.get_size(), 0, display)
+        self.masks = transition_masks(display.get_size())
+
+    def begin(self, static_key, force=False):
+        return True
+
+    def end_static(self):
+        pass
+
+    def mark(self, rects):
+        pass
+
+    def transition(self, frame):
+        self.display.blit(self.masks[min(abs(frame), TRANSITION_FRAMES)], (0, 0))
+
+    def present(self, offset=(0,0)):
+        pygame.transform.scale(self.display, self.scaled.get_size(), self.scaled)
+        self.screen.blit(self.scaled, offset)
+        pygame.display.update()
+
+class DirtyRectRenderer(FullRenderer):
+    tracks_rects = True
+
+    def __init__(self, screen, display):
+        super().__init__(screen, display)
+        self.static = pygame.Surface(display.get_size())
+        self.scale = (screen.get_width() // display.get_width(), screen.get_height() // display.get_height())
+        self.static_key = None
+        self.forced = True
+        self.full = True
+        self.rects = []
+        self.prev_rects = []
+
+    def begin(self, static_key, force=False):
+        self.full = force or self.forced or static_key != self.static_key
+        self.static_key = static_key
+        self.forced = force
+        if not self.full:
+            for rect in self.prev_rects:
+                self.display.blit(self.static, rect, rect)
+        return self.full
+
+    def end_static(self):
+        if self.full:
+            self.display.blit(self.static, (0, 0))
+
+    def mark(self, rects):
+        if isinstance(rects, pygame.Rect):
+            rects = (rects,)
+        for rect in rects:
+            if rect.width and rect.height:
+                self.rects.append(rect)
+
+    def present(self, offset=(0,0)):
+        dirty = self.prev_rects + self.rects
+        if offset != (0, 0):
+            self.forced = True
+        if self.full or offset != (0, 0) or len(dirty) > DIRTY_RECT_LIMIT:
+            super().present(offset)
+        else:
+            bounds = self.display.get_rect()
+            screen_rects = []
+            for rect in dirty:
+                rect = rect.clip(bounds)
+                if rect.width and rect.height:
+                    screen_rect = pygame.Rect(rect.x * self.scale[0], rect.y * self.scale[1], rect.width * self.scale[0], rect.height * self.scale[1])
+                    pygame.transform.scale(self.display.subsurface(rect), screen_rect.size, self.scaled.subsurface(screen_rect))
+                    self.screen.blit(self.scaled, screen_rect, screen_rect)
+                    screen_rects.append(screen_rect)
+            pygame.display.update(screen_rects)
+        self.prev_rects = self.rects
+        self.rects = []
+
+class RenderQueue:
+    # one blits sequence per layer, callers cull against the camera and append (img, pos) or (img, pos, area) themselves
+    def __init__(self):
+        self.layers = {}
+        self.sort_keys = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.submitted = 0
+        self.batches = 0
+
+    def layer(self, layer):
+        if layer not in self.layers:
+            self.layers[layer] = []
+        return self.layers[layer]
+
+    def sort_layer(self, layer, key):
+        # key gets each command, sorting is stable so ties keep the order they were added in
+        self.sort_keys[layer] = key
+
+    def flush(self, surf, rects=False):
+        drawn = []
+        for layer in sorted(self.layers):
+            commands = self.layers[layer]
+            if not commands:
+                continue
+            if layer in self.sort_keys:
+                commands.sort(key=self.sort_keys[layer])
+            if rects:
+                drawn += surf.blits(commands)
+            else:
+                surf.blits(commands, doreturn=False)
+            self.submitted += len(commands)
+            self.batches += 1
+            commands.clear()
+        return drawn
@@ -0,0 +1,118 @@
+# MyPygame: replay
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import argparse
+import struct
+import sys
+import time
+import zlib
+
+REPLAY_MAGIC = b'CCRP'
+REPLAY_VERSION = 1
+# magic, version, seed, start level
+REPLAY_HEADER = struct.Struct('<4sHqH')
+# frame, kind, key or button; the last record is END with the state digest in place of a key
+REPLAY_RECORD = struct.Struct('<IBI')
+KEY_DOWN, KEY_UP, MOUSE_DOWN, END = 0, 1, 2, 255
+
+def state_digest(game):
+    state = (
+        game.frame, game.level, game.dead, game.transition, game.screenshake,
+        tuple(game.player.pos), tuple(game.player.velocity),
+        tuple(tuple(enemy.pos) for enemy in game.enemies),
+        tuple(game.projectiles.x), tuple(game.projectiles.y),
+        tuple(tuple(projectile.pos) for projectile in game.player_projectiles),
+        tuple(tuple(particle.pos) for particle in game.particles),
+        tuple(tuple(spark.pos) for spark in game.sparks),
+        game.rng.getstate(),
+    )
+    # repr keeps every float exactly, so two runs only match if they match bit for bit
+    return zlib.crc32(repr(state).encode())
+
+class InputRecorder:
+    def __init__(self, path, seed, level=0):
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(REPLAY_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, level))
+        self.records = 0
+
+    def record(self, frame, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                # anything after the quit is never handled
+                return
+            if event.type == pygame.KEYDOWN:
+                kind, value = KEY_DOWN, event.key
+            elif event.type == pygame.KEYUP:
+                kind, value = KEY_UP, event.key
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                kind, value = MOUSE_DOWN, event.button
+            else:
+                continue
+            self.file.write(REPLAY_RECORD.pack(frame, kind, value))
+            self.records += 1
+
+    def close(self, frame, digest):
+        if self.file.closed:
+            return
+        self.file.write(REPLAY_RECORD.pack(frame, END, digest))
+        self.file.close()
+
+def record_event(kind, value):
+    if kind == KEY_DOWN:
+        return pygame.event.Event(pygame.KEYDOWN, key=value)
+    if kind == KEY_UP:
+        return pygame.event.Event(pygame.KEYUP, key=value)
+    if kind == MOUSE_DOWN:
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=value)
+    raise ValueError('unknown replay record ' + str(kind))
+
+def load_replay(path):
+    f = open(path, 'rb')
+    data = f.read()
+    f.close()
+    if len(data) < REPLAY_HEADER.size:
+        raise ValueError(path + ' is not a replay')
+    magic, version, seed, level = REPLAY_HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+        raise ValueError(path + ' is not a version ' + str(REPLAY_VERSION) + ' replay')
+    replay = {'seed': seed, 'level': level, 'frames': 0, 'digest': None, 'events': {}}
+    # a crash can leave half a record at the end
+    end = len(data) - (len(data) - REPLAY_HEADER.size) % REPLAY_RECORD.size
+    for frame, kind, value in REPLAY_RECORD.iter_unpack(data[REPLAY_HEADER.size:end]):
+        if kind == END:
+            replay['frames'] = frame
+            replay['digest'] = value
+            break
+        replay['events'].setdefault(frame, []).append(record_event(kind, value))
+        # a session that never closed its log ends after its last input
+        replay['frames'] = frame + 1
+    return replay
+
+def play_replay(path):
+    from scripts.game import Game
+    replay = load_replay(path)
+    game = Game(headless=True, level=replay['level'], seed=replay['seed'])
+    start = time.perf_counter()
+    game.simulate(replay['frames'], replay['events'])
+    # the frame the session quit on only got as far as its input
+    game.handle_events(replay['events'].get(replay['frames'], ()))
+    seconds = time.perf_counter() - start
+    return game, replay, seconds
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Play a recorded session back headless at full speed.')
+    parser.add_argument('path', help='file written by --record')
+    args = parser.parse_args()
+    game, replay, seconds = play_replay(args.path)
+    digest = state_digest(game)
+    print('replayed', replay['frames'], 'frames in', round(seconds, 2), 'seconds, level', game.level)
+    if replay['digest'] is None:
+        print('recording was not closed, nothing to compare against')
+    elif digest == replay['digest']:
+        print('final state matches the recording')
+    else:
+        print('final state differs from the recording:', hex(digest), '!=', hex(replay['digest']))
+        sys.exit(1)
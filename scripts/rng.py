@@ -0,0 +1,24 @@
+# MyPygame: rng
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import random
+
+# one stream per subsystem, so extra rolls in one never shift the numbers another one gets
+STREAMS = ('enemies', 'sparks', 'particles', 'leaves', 'clouds', 'shake')
+
+class RandomStreams:
+    def __init__(self, seed=None, streams=STREAMS):
+        # an unseeded game still picks its seed from the global random module so it can be recorded
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.streams = streams
+        for name in streams:
+            # string seeds hash the same in every process, unlike hash() of a tuple
+            setattr(self, name, random.Random(str(self.seed) + ':' + name))
+
+    def getstate(self):
+        return {name: getattr(self, name).getstate() for name in self.streams}
+
+    def setstate(self, state):
+        for name in self.streams:
+            getattr(self, name).setstate(state[name])
@@ -0,0 +1,102 @@
+# MyPygame: simulation
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import pygame
+import argparse
+import json
+import time
+from scripts.game import Game
+
+FPS = 60
+# log-linear buckets: each power of two of microseconds is split into 2 ** SUB_BITS equal buckets,
+# so a bucket is never wider than 1/16 of the times in it, up to 2 ** HISTOGRAM_BITS microseconds
+SUB_BITS = 4
+SUB_BUCKETS = 2 ** SUB_BITS
+HISTOGRAM_BITS = 24
+HISTOGRAM_BUCKETS = (HISTOGRAM_BITS - SUB_BITS + 1) * SUB_BUCKETS
+SCRIPT_KEYS = {'left': pygame.K_a, 'right': pygame.K_d, 'jump': pygame.K_w}
+
+# a script is a list of [frame, action] or [frame, action, key] entries, e.g.
+# [[0, "press", "right"], [90, "release", "right"], [95, "press", "jump"], [120, "click"]]
+def script_events(script):
+    events = {}
+    for frame, action, *key in script:
+        if action == 'press':
+            event = pygame.event.Event(pygame.KEYDOWN, key=SCRIPT_KEYS[key[0]])
+        elif action == 'release':
+            event = pygame.event.Event(pygame.KEYUP, key=SCRIPT_KEYS[key[0]])
+        elif action == 'click':
+            event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1)
+        else:
+            raise ValueError('unknown script action ' + str(action))
+        events.setdefault(int(frame), []).append(event)
+    return events
+
+def load_script(path):
+    f = open(path, 'r')
+    script = json.load(f)
+    f.close()
+    return script
+
+def frame_time_bucket(ns):
+    us = ns // 1000
+    if us < SUB_BUCKETS:
+        return us
+    # the top SUB_BITS + 1 bits pick the bucket, the rest only set how wide it is
+    shift = us.bit_length() - SUB_BITS - 1
+    return min((shift + 1) * SUB_BUCKETS + (us >> shift) - SUB_BUCKETS, HISTOGRAM_BUCKETS - 1)
+
+def bucket_bounds(bucket):
+    # the microseconds [low, high) that land in `bucket`
+    if bucket < SUB_BUCKETS:
+        return bucket, bucket + 1
+    shift = bucket // SUB_BUCKETS - 1
+    top = bucket % SUB_BUCKETS + SUB_BUCKETS
+    return top << shift, (top + 1) << shift
+
+def histogram_percentile(histogram, fraction):
+    # the middle of the bucket the percentile falls in, within 1/32 of the real time
+    target = fraction * sum(histogram)
+    total = 0
+    for bucket, count in enumerate(histogram):
+        total += count
+        if count and total >= target:
+            low, high = bucket_bounds(bucket)
+            return (low + high) / 2
+    return 0
+
+def run_session(frames, script=(), seed=None, level=0):
+    game = Game(headless=True, level=level, seed=seed)
+    events = script_events(script)
+    histogram = [0] * HISTOGRAM_BUCKETS
+    start = time.perf_counter()
+    for _ in range(frames):
+        begin = time.perf_counter_ns()
+        game.step(events.get(game.frame, ()))
+        histogram[frame_time_bucket(time.perf_counter_ns() - begin)] += 1
+    seconds = time.perf_counter() - start
+    return {
+        'frames': game.frame,
+        'seconds': seconds,
+        'game_seconds': game.frame / FPS,
+        'level': game.level,
+        'enemies': len(game.enemies),
+        'player': list(game.player.pos),
+        'clears': [list(clear) for clear in game.stats['clears']],
+        'deaths': {str(level): count for level, count in game.stats['deaths'].items()},
+        'arrows': game.projectiles.spawned,
+        'fireballs': game.stats['fireballs'],
+        'frame_times': histogram,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Step the game without a window or frame cap.')
+    parser.add_argument('--frames', type=int, default=FPS * 60 * 60)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--script', help='JSON input script')
+    parser.add_argument('--level', type=int, default=0)
+    args = parser.parse_args()
+    result = run_session(args.frames, load_script(args.script) if args.script else (), args.seed, args.level)
+    print(json.dumps(result))
+    print('simulated', round(result['game_seconds']), 'game seconds in', round(result['seconds'], 2), 'seconds')
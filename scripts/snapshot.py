@@ -0,0 +1,143 @@
+# MyPygame: snapshot
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+from array import array
+from scripts.entities import Enemy
+from scripts.particle import Particle, Projectile
+from scripts.spark import Spark
+
+# a snapshot every 10 frames, 60 of them cover the last ten seconds
+SNAPSHOT_INTERVAL = 10
+SNAPSHOT_CAPACITY = 60
+# how far back the rewind key goes
+REWIND_FRAMES = 60
+
+def entity_state(entity):
+    return (entity.pos[0], entity.pos[1], entity.velocity[0], entity.velocity[1], entity.flip, entity.action, entity.animation.frame, entity.animation.done, tuple(entity.collisions.values()), entity.attacking, entity.attacking_frames)
+
+def set_entity_state(entity, state):
+    entity.pos[0], entity.pos[1], entity.velocity[0], entity.velocity[1], entity.flip, action, frame, done, collisions, entity.attacking, entity.attacking_frames = state
+    entity.set_action(action)
+    entity.animation.frame = frame
+    entity.animation.done = done
+    entity.collisions = dict(zip(('up', 'down', 'right', 'left'), collisions))
+
+def pack_random(streams):
+    # each stream's 625 word state as 2.5 KB of array rather than 625 int objects
+    return tuple((version, array('I', words), gauss) for version, words, gauss in (getattr(streams, name).getstate() for name in streams.streams))
+
+def unpack_random(streams, packed):
+    for name, (version, words, gauss) in zip(streams.streams, packed):
+        getattr(streams, name).setstate((version, tuple(words), gauss))
+
+def capture(game):
+    # plain tuples and copied arrays, nothing in a snapshot points back at live objects
+    player = game.player
+    arrows = game.projectiles
+    return (
+        game.frame, game.level, game.level_path,
+        game.dead, game.transition, game.screenshake, game.shake_offset, game.scroll[0], game.scroll[1],
+        entity_state(player) + (player.air_time, player.jumps),
+        tuple(entity_state(enemy) + (enemy.walking,) for enemy in game.enemies),
+        (arrows.x[:], arrows.y[:], arrows.vx[:], arrows.age[:], arrows.flip[:]),
+        tuple((projectile.pos[0], projectile.pos[1], projectile.velocity[0], projectile.velocity[1], projectile.projectileFTD, projectile.animation.frame) for projectile in game.player_projectiles),
+        tuple((particle.type, particle.pos[0], particle.pos[1], particle.velocity[0], particle.velocity[1], particle.animation.frame, particle.animation.done) for particle in game.particles),
+        tuple((spark.pos[0], spark.pos[1], spark.angle, spark.speed, spark.color) for spark in game.sparks),
+        tuple(layer.pos[0] for layer in game.clouds.layers),
+        pack_random(game.rng),
+    )
+
+def restore(game, snapshot):
+    frame, level, level_path, dead, transition, screenshake, shake_offset, scroll_x, scroll_y, player, enemies, arrows, projectiles, particles, sparks, clouds, rng = snapshot
+    if (level, level_path) != (game.level, game.level_path):
+        game.level = level
+        game.load_level(level, level_path)
+    game.dead, game.transition, game.screenshake, game.shake_offset = dead, transition, screenshake, shake_offset
+    game.scroll = [scroll_x, scroll_y]
+    game.render_scroll = (int(scroll_x), int(scroll_y))
+    game.camera.move(game.render_scroll)
+    set_entity_state(game.player, player[:-2])
+    game.player.air_time, game.player.jumps = player[-2:]
+
+    # enemies that are still alive are reused, so a restore only builds the ones that died since
+    live = game.enemies
+    game.enemies = []
+    for i, state in enumerate(enemies):
+        enemy = live[i] if i < len(live) else Enemy(game, state[:2], (8, 15))
+        set_entity_state(enemy, state[:-1])
+        enemy.walking = state[-1]
+        game.enemies.append(enemy)
+    game.enemy_rects = {enemy: enemy.rect() for enemy in game.enemies}
+
+    pool = game.projectiles
+    pool.x, pool.y, pool.vx, pool.age, pool.flip = (column[:] for column in arrows)
+    game.player_projectiles = []
+    for x, y, velocity_x, velocity_y, countdown, frame in projectiles:
+        projectile = Projectile(game, game.tilemap, 'fireball', [x, y], [velocity_x, velocity_y])
+        projectile.projectileFTD = countdown
+        projectile.animation.frame = frame
+        game.player_projectiles.append(projectile)
+    game.particles = []
+    for p_type, x, y, velocity_x, velocity_y, frame, done in particles:
+        particle = Particle(game, p_type, (x, y), velocity=[velocity_x, velocity_y], frame=frame)
+        particle.animation.done = done
+        game.particles.append(particle)
+    game.sparks = [Spark((x, y), angle, speed, color) for x, y, angle, speed, color in sparks]
+    for layer, x in zip(game.clouds.layers, clouds):
+        layer.pos[0] = x
+    unpack_random(game.rng, rng)
+
+class SnapshotRing:
+    # `capacity` slots allocated up front and overwritten oldest first
+    def __init__(self, interval=SNAPSHOT_INTERVAL, capacity=SNAPSHOT_CAPACITY):
+        self.interval = interval
+        self.slots = [None] * capacity
+        self.index = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.slots = [None] * len(self.slots)
+        self.index = 0
+        self.count = 0
+
+    def push(self, snapshot):
+        self.slots[self.index] = snapshot
+        self.index = (self.index + 1) % len(self.slots)
+        self.count = min(self.count + 1, len(self.slots))
+
+    def update(self, game):
+        if game.frame % self.interval == 0:
+            self.push(capture(game))
+
+    def get(self, age=0):
+        # age 0 is the newest snapshot
+        if age >= self.count:
+            return None
+        return self.slots[(self.index - 1 - age) % len(self.slots)]
+
+    def drop(self, count):
+        # forget the newest `count` snapshots, so the next rewind keeps going back instead of forward
+        for _ in range(min(count, self.count)):
+            self.index = (self.index - 1) % len(self.slots)
+            self.slots[self.index] = None
+            self.count -= 1
+
+    def rewind(self, game, frames=REWIND_FRAMES):
+        # restores the newest snapshot at least `frames` old with the player alive, or the oldest one,
+        # and drops it with everything newer so pressing again goes further back
+        for age in range(self.count):
+            snapshot = self.get(age)
+            if snapshot[0] <= game.frame - frames and not snapshot[3]:
+                break
+        else:
+            age = self.count - 1
+            if age < 0:
+                return False
+            snapshot = self.get(age)
+        restore(game, snapshot)
+        self.drop(age + 1)
+        return True
@@ -4,7 +4,6 @@
 # 9.14.24
 
 import pygame
-import random
 import math
 
 class Spark:
@@ -30,4 +29,4 @@ class Spark:
             (self.pos[0] + math.cos(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[0], self.pos[1] + math.sin(self.angle - math.pi * 0.5) * self.speed * 0.5 - offset[1]),
         ]
 
-        pygame.draw.polygon(surf, self.color, render_points)
+        return pygame.draw.polygon(surf, self.color, render_points)
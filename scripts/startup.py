@@ -0,0 +1,60 @@
+# MyPygame: startup
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+STARTUP_REPORT = 'startup_report.txt'
+# taken when this module is first imported, which the game does before anything else
+PROCESS_START = time.perf_counter()
+
+class StartupTrace:
+    def __init__(self, trace_memory=False, start=PROCESS_START):
+        self.start = start
+        self.trace_memory = trace_memory
+        self.phases = []
+        self.first_frame = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add(self, name, begin, end, allocated=None, peak=None):
+        self.phases.append({'name': name, 'at': begin - self.start, 'seconds': end - begin, 'allocated': allocated, 'peak': peak})
+
+    @contextmanager
+    def phase(self, name):
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                self.add(name, begin, end, current - before, peak - before)
+            else:
+                self.add(name, begin, end)
+
+    def mark_first_frame(self):
+        self.first_frame = time.perf_counter() - self.start
+
+    def report(self):
+        lines = ['phase'.ljust(24) + 'at ms'.rjust(10) + 'ms'.rjust(10) + 'alloc KiB'.rjust(12) + 'peak KiB'.rjust(12)]
+        for phase in self.phases:
+            line = phase['name'].ljust(24) + format(phase['at'] * 1000, '10.2f') + format(phase['seconds'] * 1000, '10.2f')
+            if phase['allocated'] is not None:
+                line += format(phase['allocated'] / 1024, '12.1f') + format(phase['peak'] / 1024, '12.1f')
+            lines.append(line)
+        if self.first_frame is not None:
+            lines.append('time to first frame'.ljust(24) + format(self.first_frame * 1000, '10.2f'))
+        return '\n'.join(lines)
+
+    def write(self, path=STARTUP_REPORT):
+        f = open(path, 'w')
+        f.write(self.report() + '\n')
+        f.close()
+        return path
@@ -0,0 +1,186 @@
+# MyPygame: stress
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import argparse
+import json
+import math
+import random
+import shutil
+import tempfile
+from scripts.tilemap import AUTOTILE_MAP
+
+TILE_SIZE = 16
+# empty rows above every band of platforms, enough to stand and jump in
+BAND_GAP = 5
+SPAN_LENGTH = (3, 16)
+SPAN_THICKNESS = (2, 3)
+# sizes of data/images/tiles/large_decor, so decor can be stood on the ground
+LARGE_DECOR_SIZES = {0: (31, 9), 1: (25, 12), 2: (33, 44)}
+TREE_VARIANT = 2
+# data/images/tiles/decor variants, the small on-grid decor the shipped maps use most
+DECOR_VARIANTS = 4
+# share of decor placed as on-grid tiles rather than large offgrid pieces
+GRID_DECOR = 0.75
+ENEMY_SIZE = (8, 15)
+
+def map_size(tiles, solid=0.3, aspect=8):
+    # a wide map that holds about `tiles` solid tiles at the given density
+    area = tiles / solid
+    height = max(BAND_GAP * 3, int(math.sqrt(area / aspect)))
+    # the first band starts below an empty gap, which holds no tiles
+    return max(SPAN_LENGTH[1], int(area // height)), height + BAND_GAP
+
+def span_variant(col, row, length, thickness):
+    neighbors = []
+    if col > 0:
+        neighbors.append((-1, 0))
+    if col < length - 1:
+        neighbors.append((1, 0))
+    if row > 0:
+        neighbors.append((0, -1))
+    if row < thickness - 1:
+        neighbors.append((0, 1))
+    return AUTOTILE_MAP.get(tuple(sorted(neighbors)), 0)
+
+def tile_json(x, y, tile_type, variant):
+    return '"' + str(x) + ';' + str(y) + '": {"type": "' + tile_type + '", "variant": ' + str(variant) + ', "pos": [' + str(x) + ', ' + str(y) + ']}'
+
+def generate_map(path, width, height, solid=0.3, decor=0.08, trees=0.03, spawners=0.02, seed=0):
+    # streams the map to `path` band by band, so memory stays flat from ten thousand to ten million tiles
+    rng = random.Random(seed)
+    stats = {'width': width, 'height': height, 'tiles': 0, 'decor': 0, 'offgrid': 0, 'enemies': 0}
+    out = open(path, 'w')
+    offgrid = tempfile.TemporaryFile('w+')
+    out.write('{"tile_size": ' + str(TILE_SIZE) + ', "tilemap": {')
+    separator = ''
+    player = False
+    y = BAND_GAP
+    while True:
+        thickness = rng.randint(*SPAN_THICKNESS)
+        if y + thickness > height:
+            break
+        coverage = min(1.0, solid * (thickness + BAND_GAP) / thickness)
+        mean_span = sum(SPAN_LENGTH) / 2
+        mean_gap = max(1.0, mean_span * (1 - coverage) / max(coverage, 0.001))
+        x = rng.randint(0, SPAN_LENGTH[0])
+        while x < width:
+            length = min(rng.randint(*SPAN_LENGTH), width - x)
+            if length >= 2:
+                tile_type = rng.choice(('grass', 'stone'))
+                chunk = []
+                for row in range(thickness):
+                    for col in range(length):
+                        chunk.append(tile_json(x + col, y + row, tile_type, span_variant(col, row, length, thickness)))
+                stats['tiles'] += length * thickness
+                for col in range(length):
+                    surface = (x + col, y - 1)
+                    if not player:
+                        chunk.append(tile_json(surface[0], surface[1], 'spawners', 0))
+                        player = True
+                        continue
+                    roll = rng.random()
+                    if roll < spawners:
+                        chunk.append(tile_json(surface[0], surface[1], 'spawners', 1))
+                        stats['enemies'] += 1
+                    elif roll < spawners + decor + trees:
+                        tree = roll < spawners + trees
+                        if not tree and rng.random() < GRID_DECOR:
+                            chunk.append(tile_json(surface[0], surface[1], 'decor', rng.randrange(DECOR_VARIANTS)))
+                            stats['decor'] += 1
+                            continue
+                        variant = TREE_VARIANT if tree else rng.randint(0, 1)
+                        size = LARGE_DECOR_SIZES[variant]
+                        pos = [(x + col) * TILE_SIZE + rng.random() * TILE_SIZE - size[0] / 2, y * TILE_SIZE - size[1]]
+                        offgrid.write(('' if not stats['offgrid'] else ', ') + json.dumps({'type': 'large_decor', 'variant': variant, 'pos': pos}))
+                        stats['offgrid'] += 1
+                out.write(separator + ', '.join(chunk))
+                separator = ', '
+            x += length + max(1, round(rng.random() * 2 * mean_gap))
+        y += thickness + BAND_GAP
+    out.write('}, "offgrid": [')
+    offgrid.seek(0)
+    shutil.copyfileobj(offgrid, out)
+    offgrid.close()
+    out.write(']}')
+    out.close()
+    return stats
+
+def standing_spots(tilemap_dict):
+    # tops of solid tiles with nothing solid above them, decor can be walked through
+    spots = []
+    for tile in tilemap_dict.values():
+        above = tilemap_dict.get(str(tile['pos'][0]) + ';' + str(tile['pos'][1] - 1))
+        if tile['type'] in ('grass', 'stone') and (above is None or above['type'] not in ('grass', 'stone')):
+            spots.append(tile['pos'])
+    return spots
+
+def generate_scene(path, map_path, enemies=100, arrows=100, sparks=100, seed=0):
+    rng = random.Random(seed)
+    f = open(map_path, 'r')
+    tilemap_dict = json.load(f)['tilemap']
+    f.close()
+    spots = standing_spots(tilemap_dict)
+    xs = [tile['pos'][0] for tile in tilemap_dict.values()]
+    ys = [tile['pos'][1] for tile in tilemap_dict.values()]
+    bounds = (min(xs) * TILE_SIZE, min(ys) * TILE_SIZE, (max(xs) + 1) * TILE_SIZE, (max(ys) + 1) * TILE_SIZE)
+    out = open(path, 'w')
+    out.write('{"map": ' + json.dumps(map_path) + ', "enemies": [')
+    for i in range(enemies):
+        spot = rng.choice(spots)
+        out.write((', ' if i else '') + json.dumps([spot[0] * TILE_SIZE + (TILE_SIZE - ENEMY_SIZE[0]) / 2, spot[1] * TILE_SIZE - ENEMY_SIZE[1]]))
+    out.write('], "arrows": [')
+    for i in range(arrows):
+        spot = rng.choice(spots)
+        flip = rng.random() < 0.5
+        out.write((', ' if i else '') + json.dumps([spot[0] * TILE_SIZE + rng.random() * TILE_SIZE, spot[1] * TILE_SIZE - 8, -1.5 if flip else 1.5, flip]))
+    out.write('], "sparks": [')
+    for i in range(sparks):
+        out.write((', ' if i else '') + json.dumps([bounds[0] + rng.random() * (bounds[2] - bounds[0]), bounds[1] + rng.random() * (bounds[3] - bounds[1]), rng.random() * math.pi * 2, 2 + rng.random() * 3]))
+    out.write(']}')
+    out.close()
+    return {'enemies': enemies, 'arrows': arrows, 'sparks': sparks, 'spots': len(spots)}
+
+def apply_scene(game, path):
+    from scripts.entities import Enemy
+    from scripts.spark import Spark
+    f = open(path, 'r')
+    scene = json.load(f)
+    f.close()
+    game.load_level(game.level, scene['map'])
+    for pos in scene['enemies']:
+        game.enemies.append(Enemy(game, pos, ENEMY_SIZE))
+    for x, y, velocity_x, flip in scene['arrows']:
+        game.projectiles.spawn((x, y), velocity_x, flip)
+    for x, y, angle, speed in scene['sparks']:
+        game.sparks.append(Spark((x, y), angle, speed, (255, 255, 255)))
+    return scene
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate large maps and busy scenes to measure how the game scales.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    map_parser = commands.add_parser('map', help='write a map the game and editor can load')
+    map_parser.add_argument('path')
+    map_parser.add_argument('--tiles', type=int, default=10000, help='roughly how many solid tiles to place')
+    map_parser.add_argument('--width', type=int)
+    map_parser.add_argument('--height', type=int)
+    map_parser.add_argument('--solid', type=float, default=0.3, help='share of the map that is solid')
+    map_parser.add_argument('--decor', type=float, default=0.08, help='chance of decor on each surface tile')
+    map_parser.add_argument('--trees', type=float, default=0.03, help='chance of a tree on each surface tile')
+    map_parser.add_argument('--spawners', type=float, default=0.02, help='chance of an enemy on each surface tile')
+    map_parser.add_argument('--seed', type=int, default=0)
+    scene_parser = commands.add_parser('scene', help='write a scene of enemies, arrows and sparks on a map')
+    scene_parser.add_argument('path')
+    scene_parser.add_argument('--map', default='data/maps/0.json')
+    scene_parser.add_argument('--enemies', type=int, default=100)
+    scene_parser.add_argument('--arrows', type=int, default=100)
+    scene_parser.add_argument('--sparks', type=int, default=100)
+    scene_parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'map':
+        width, height = map_size(args.tiles, args.solid)
+        stats = generate_map(args.path, args.width or width, args.height or height, args.solid, args.decor, args.trees, args.spawners, args.seed)
+    else:
+        stats = generate_scene(args.path, args.map, args.enemies, args.arrows, args.sparks, args.seed)
+    print(json.dumps(stats))
@@ -0,0 +1,213 @@
+# MyPygame: telemetry
+# Calen Cuesta
+# ProgLang
+# 10.19.26
+import argparse
+import json
+import os
+import queue
+import socket
+import struct
+import threading
+
+TELEMETRY_MAGIC = b'CCTM'
+TELEMETRY_VERSION = 3
+# magic, version, number of stages, then each stage name as a length byte and utf-8
+TELEMETRY_HEADER = struct.Struct('<4sHH')
+# frame, level, frame ns, then one ns count per stage and the counts below
+RECORD_PREFIX = '<IHQ'
+# 64 bit stage times, a load or a stall past 4.29 s would not fit in 32
+STAGE_FORMAT = 'Q'
+COUNTS = ('enemies', 'particles', 'sparks', 'arrows', 'fireballs', 'draws', 'batches', 'visible', 'culled')
+PERCENTILES = (0.5, 0.9, 0.99)
+# how long quitting waits for the writer to drain before giving up on a reader
+CLOSE_TIMEOUT = 2.0
+
+def record_struct(stage_count):
+    return struct.Struct(RECORD_PREFIX + STAGE_FORMAT * stage_count + 'I' * len(COUNTS))
+
+def open_target(target):
+    # 'unix:PATH' streams to a listening socket, anything else is a file, returns the file and the socket if any
+    if target.startswith('unix:'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(target[5:])
+        return sock.makefile('wb'), sock
+    return open(target, 'wb'), None
+
+class TelemetryWriter:
+    # the game only queues a tuple per frame, packing and writing happen on a background thread
+    def __init__(self, target):
+        self.target = target
+        self.file, self.socket = open_target(target)
+        self.queue = queue.SimpleQueue()
+        self.stages = None
+        self.records = 0
+        self.error = None
+        self.thread = threading.Thread(target=self.write_loop, name='telemetry', daemon=True)
+        self.thread.start()
+
+    def record(self, game):
+        profiler = game.profiler
+        if self.error or 'frame' not in profiler.latest:
+            return
+        if self.stages is None:
+            # the stages of the first frame make up the header, any that turn up later are left out
+            self.stages = tuple(stage for stage in profiler.latest if stage != 'frame')
+            self.queue.put(self.stages)
+        latest = profiler.latest
+        self.queue.put((game.frame, game.level, latest['frame']) + tuple(latest.get(stage, 0) for stage in self.stages) + (
+            len(game.enemies), len(game.particles), len(game.sparks), len(game.projectiles), len(game.player_projectiles), game.queue.submitted, game.queue.batches, game.camera.visible, game.camera.culled))
+        self.records += 1
+
+    def write_loop(self):
+        try:
+            self.write_records()
+        except (OSError, struct.error) as error:
+            # a reader that went away or a record that does not fit should not take the game with it
+            self.error = error
+
+    def write_records(self):
+        packer = None
+        while True:
+            items = [self.queue.get()]
+            # everything queued since the last write goes out in one call
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            chunk = bytearray()
+            done = False
+            for item in items:
+                if item is None:
+                    done = True
+                    break
+                if packer is None:
+                    chunk += TELEMETRY_HEADER.pack(TELEMETRY_MAGIC, TELEMETRY_VERSION, len(item))
+                    for stage in item:
+                        name = stage.encode()
+                        chunk += bytes([len(name)]) + name
+                    packer = record_struct(len(item))
+                else:
+                    chunk += packer.pack(*item)
+            self.file.write(chunk)
+            self.file.flush()
+            if done:
+                return
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        if self.file.closed:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout)
+        if self.thread.is_alive() and self.socket is not None:
+            # a reader that stopped reading would otherwise hold the game on quit, shutting the socket fails the stuck write
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.thread.join(timeout)
+        try:
+            self.file.close()
+            if self.socket is not None:
+                self.socket.close()
+        except OSError:
+            pass
+
+def read_telemetry(path):
+    f = open(path, 'rb')
+    data = f.read()
+    f.close()
+    if len(data) < TELEMETRY_HEADER.size:
+        raise ValueError(path + ' is not a telemetry stream')
+    magic, version, stage_count = TELEMETRY_HEADER.unpack_from(data)
+    if magic != TELEMETRY_MAGIC or version != TELEMETRY_VERSION:
+        raise ValueError(path + ' is not a version ' + str(TELEMETRY_VERSION) + ' telemetry stream')
+    offset = TELEMETRY_HEADER.size
+    stages = []
+    for _ in range(stage_count):
+        length = data[offset]
+        stages.append(data[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+    unpacker = record_struct(stage_count)
+    # a game that crashed can leave half a record at the end
+    end = len(data) - (len(data) - offset) % unpacker.size
+    return stages, unpacker.iter_unpack(data[offset:end])
+
+def percentile(values, fraction):
+    return values[min(int(fraction * len(values)), len(values) - 1)] if values else 0
+
+def summarize(path):
+    stages, records = read_telemetry(path)
+    columns = ['frame'] + stages
+    levels = {}
+    for record in records:
+        level = levels.setdefault(record[1], {'frames': 0, 'times': [[] for _ in columns], 'counts': [0] * len(COUNTS)})
+        level['frames'] += 1
+        for i in range(len(columns)):
+            level['times'][i].append(record[2 + i])
+        for i in range(len(COUNTS)):
+            level['counts'][i] += record[2 + len(columns) + i]
+    summary = {}
+    for level_id, level in sorted(levels.items()):
+        times = {}
+        for name, values in zip(columns, level['times']):
+            values.sort()
+            times[name] = {'mean_ms': sum(values) / len(values) / 1e6, 'max_ms': values[-1] / 1e6}
+            for fraction in PERCENTILES:
+                times[name]['p' + str(round(fraction * 100)) + '_ms'] = percentile(values, fraction) / 1e6
+        summary[str(level_id)] = {'frames': level['frames'], 'times': times, 'mean_counts': {name: total / level['frames'] for name, total in zip(COUNTS, level['counts'])}}
+    return summary
+
+def format_summary(summary):
+    lines = []
+    for level, row in summary.items():
+        lines.append('level ' + level + ', ' + str(row['frames']) + ' frames, ' + ', '.join(name + ' ' + format(count, '.1f') for name, count in row['mean_counts'].items()))
+        lines.append('  ' + 'stage'.ljust(16) + ''.join(key.rjust(10) for key in ('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')))
+        for stage, times in row['times'].items():
+            lines.append('  ' + stage.ljust(16) + ''.join(format(times[key], '10.3f') for key in ('mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms')))
+    return '\n'.join(lines)
+
+def listen(socket_path, out_path, ready=None, timeout=None):
+    # takes one game's stream from a unix socket and saves it for summarize,
+    # `ready` is set once a game can connect and `timeout` bounds each wait on the socket
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.settimeout(timeout)
+    server.bind(socket_path)
+    server.listen(1)
+    if ready is not None:
+        ready.set()
+    connection = server.accept()[0]
+    connection.settimeout(timeout)
+    out = open(out_path, 'wb')
+    total = 0
+    while True:
+        data = connection.recv(65536)
+        if not data:
+            break
+        out.write(data)
+        total += len(data)
+    out.close()
+    connection.close()
+    server.close()
+    os.remove(socket_path)
+    return total
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Summarize frame telemetry written by --telemetry, or receive it from a socket.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    summary_parser = commands.add_parser('summarize', help='frame and stage time percentiles per level')
+    summary_parser.add_argument('path')
+    summary_parser.add_argument('--json', action='store_true', help='print JSON instead of a table')
+    listen_parser = commands.add_parser('listen', help='save the stream a game sends to --telemetry unix:SOCKET')
+    listen_parser.add_argument('socket')
+    listen_parser.add_argument('out')
+    args = parser.parse_args()
+
+    if args.command == 'summarize':
+        summary = summarize(args.path)
+        print(json.dumps(summary, indent=1) if args.json else format_summary(summary))
+    else:
+        print('received', listen(args.socket, args.out), 'bytes into', args.out)
@@ -4,6 +4,8 @@
 # 9.14.24
 import pygame
 import json
+from collections import OrderedDict
+from types import MappingProxyType
 
 AUTOTILE_MAP = {
     tuple(sorted([(1, 0), (0, 1)]) ): 0,
@@ -20,6 +22,47 @@ AUTOTILE_MAP = {
 NEIGHBOR_OFFSETS = [(-1,0), (-1,-1), (0,-1), (1,-1), (1,0), (0,0), (-1,1), (0,1), (1,1)]
 PHYSICS_TILES = {'grass', 'stone'}
 AUTOTILE_TYPES = {'grass', 'stone'}
+# parsed levels kept in memory, the current and next level plus a few more
+TEMPLATE_CACHE_SIZE = 8
+# the part of a tree that drops leaves, relative to its top left corner
+LEAF_AREA = (4, 4, 23, 13)
+
+templates = OrderedDict()
+
+class LevelTemplate:
+    # a parsed map with its spawners taken out, shared read only by every load of the level
+    def __init__(self, path):
+        tilemap = Tilemap(None)
+        tilemap.load(path)
+        self.path = path
+        self.tile_size = tilemap.tile_size
+        self.tree_rects = tuple((LEAF_AREA[0] + tree['pos'][0], LEAF_AREA[1] + tree['pos'][1], LEAF_AREA[2], LEAF_AREA[3]) for tree in tilemap.extract([('large_decor', 2)], keep=True))
+        self.player_spawn = None
+        enemy_spawns = []
+        for spawner in tilemap.extract([('spawners', 0), ('spawners', 1)], keep=False):
+            if spawner['variant'] == 0:
+                self.player_spawn = tuple(spawner['pos'])
+            else:
+                enemy_spawns.append(tuple(spawner['pos']))
+        self.enemy_spawns = tuple(enemy_spawns)
+        self.tilemap_dict = MappingProxyType(tilemap.tilemap_dict)
+        self.offgrid_tiles = tuple(tilemap.offgrid_tiles)
+        self.asset_types = frozenset(tilemap.asset_types())
+
+def level_template(path):
+    # parsed once, after that a load never touches the disk
+    if path in templates:
+        templates.move_to_end(path)
+        return templates[path]
+    template = LevelTemplate(path)
+    templates[path] = template
+    while len(templates) > TEMPLATE_CACHE_SIZE:
+        templates.popitem(last=False)
+    return template
+
+def clear_templates():
+    # for tools that change maps on disk while the game is running
+    templates.clear()
 
 
 class Tilemap:
@@ -48,6 +91,9 @@ class Tilemap:
                     del self.tilemap_dict[loc]
         return matches                      
 
+    def asset_types(self):
+        return {tile['type'] for tile in list(self.tilemap_dict.values()) + list(self.offgrid_tiles)}
+
     def tiles_around(self, pos):
         tiles = []
         tile_loc = (int(pos[0] // self.tile_size), int(pos[1] // self.tile_size))
@@ -58,7 +104,7 @@ class Tilemap:
         return tiles
     def save(self, path):
         f = open(path, 'w')
-        json.dump({'tilemap' : self.tilemap_dict, 'tile_size' : self.tile_size, 'offgrid' : self.offgrid_tiles}, f)
+        json.dump({'tilemap' : dict(self.tilemap_dict), 'tile_size' : self.tile_size, 'offgrid' : self.offgrid_tiles}, f)
         f.close()
     def load(self, path):
         f = open(path, 'r')
@@ -68,11 +114,26 @@ class Tilemap:
         self.tile_size = map_data['tile_size']
         self.offgrid_tiles = map_data['offgrid']
 
+    def use(self, template):
+        # shares the template's tiles instead of copying them, so this takes the same time on any size of map
+        self.tilemap_dict = template.tilemap_dict
+        self.tile_size = template.tile_size
+        self.offgrid_tiles = template.offgrid_tiles
+
     def solid_check(self, pos):
         tile_loc = str(int(pos[0] // self.tile_size)) + ';' + str(int(pos[1] // self.tile_size))
         if tile_loc in self.tilemap_dict:
             if self.tilemap_dict[tile_loc]['type'] in PHYSICS_TILES:
                 return self.tilemap_dict[tile_loc]
+
+    def solid_check_many(self, positions):
+        tilemap_dict = self.tilemap_dict
+        tile_size = self.tile_size
+        solid = []
+        for pos in positions:
+            tile = tilemap_dict.get(str(int(pos[0] // tile_size)) + ';' + str(int(pos[1] // tile_size)))
+            solid.append(tile is not None and tile['type'] in PHYSICS_TILES)
+        return solid
     
     def physics_rects_around(self, pos):
         rects = []
@@ -94,13 +155,19 @@ class Tilemap:
                 tile['variant'] = AUTOTILE_MAP[neighbors]
 
                     
-    def render(self, surf, offset=(0,0)):
+    def sprites(self, commands, size, offset=(0,0)):
+        assets = self.game.assets
         for tile in self.offgrid_tiles:
-            surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1]))
-            
-        for x in range(offset[0] // self.tile_size, (offset[0] + surf.get_width()) // self.tile_size +1 ):
-            for y in range(offset[1] // self.tile_size, (offset[1] + surf.get_height()) // self.tile_size + 1):
-                loc = str(x) + ';' + str(y)
-                if loc in self.tilemap_dict:
-                    tile = self.tilemap_dict[loc]
-                    surf.blit(self.game.assets[tile['type']][tile['variant']], (tile['pos'][0] * 16 - offset[0], tile['pos'][1] * 16 - offset[1]))
\ No newline at end of file
+            commands.append((assets[tile['type']][tile['variant']], (tile['pos'][0] - offset[0], tile['pos'][1] - offset[1])))
+
+        get = self.tilemap_dict.get
+        for x in range(offset[0] // self.tile_size, (offset[0] + size[0]) // self.tile_size + 1):
+            column = str(x) + ';'
+            for y in range(offset[1] // self.tile_size, (offset[1] + size[1]) // self.tile_size + 1):
+                tile = get(column + str(y))
+                if tile:
+                    commands.append((assets[tile['type']][tile['variant']], (tile['pos'][0] * self.tile_size - offset[0], tile['pos'][1] * self.tile_size - offset[1])))
+        return commands
+
+    def render(self, surf, offset=(0,0)):
+        surf.blits(self.sprites([], (surf.get_width(), surf.get_height()), offset), doreturn=False)
\ No newline at end of file
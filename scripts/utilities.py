@@ -4,43 +4,93 @@
 # 9.13.24
 import pygame
 import os
+from scripts.atlas import Atlas, ATLAS_PATH, ATLAS_INDEX
+from scripts.pixelcache import PixelCache
 BASE_IMG_PATH = 'data/images/'
 
-def load_image(path):
-    img = pygame.image.load(BASE_IMG_PATH + path).convert()
-    img.set_colorkey((0,0,0))
+atlas = None
+pixel_cache = PixelCache()
+
+def get_atlas():
+    global atlas
+    if atlas is None:
+        atlas = Atlas.open(ATLAS_PATH, BASE_IMG_PATH, load_cached) if os.path.exists(ATLAS_PATH + ATLAS_INDEX) else False
+    return atlas
+
+def atlas_image(path):
+    return atlas.image(path) if get_atlas() else None
+
+def decode_image(path):
+    return pygame.image.load(BASE_IMG_PATH + path)
+
+def load_cached(source, colorkey=None):
+    img = pixel_cache.load(source, colorkey)
+    if img is None:
+        img = pygame.image.load(source).convert()
+        if colorkey:
+            img.set_colorkey(colorkey)
+        pixel_cache.store(source, img, colorkey)
     return img
 
-def load_image2(path):
-    img = pygame.image.load(BASE_IMG_PATH + path).convert()
-    img.set_colorkey((255,255,255))
+def cached_surface(path, colorkey=None):
+    img = atlas_image(path)
+    if img is None:
+        return pixel_cache.load(BASE_IMG_PATH + path, colorkey)
+    if colorkey:
+        img.set_colorkey(colorkey)
+    return img
+
+def finish_surface(path, img, colorkey=None):
+    img = img.convert()
+    if colorkey:
+        img.set_colorkey(colorkey)
+    pixel_cache.store(BASE_IMG_PATH + path, img, colorkey)
     return img
 
+def load_surface(path, colorkey=None):
+    img = cached_surface(path, colorkey)
+    if img is None:
+        img = finish_surface(path, decode_image(path), colorkey)
+    return img
+
+def list_images(path):
+    names = atlas.listdir(path) if get_atlas() else None
+    if names is None:
+        names = os.listdir(BASE_IMG_PATH + path)
+    return names
+
+def load_image(path):
+    return load_surface(path, (0,0,0))
+
+def load_image2(path):
+    return load_surface(path, (255,255,255))
+
 def load_images(path):
     images = []
-    for img_name in os.listdir(BASE_IMG_PATH + path):
+    for img_name in list_images(path):
         images.append(load_image(path + '/' + img_name))
     return images
 def load_images2(path):
     images = []
-    for img_name in os.listdir(BASE_IMG_PATH + path):
+    for img_name in list_images(path):
         img = load_image2(path + '/' + img_name)
         images.append(img)
     return images
 
 class Animation:
-    def __init__(self, images, img_dur=5, loop=True):
+    def __init__(self, images, img_dur=5, loop=True, flipped=None):
         self.images = images
+        self.flipped = flipped if flipped is not None else [pygame.transform.flip(img, True, False) for img in images]
         self.loop = loop
         self.img_duration = img_dur
         self.done = False
         self.frame = 0
 
     def copy(self):
-            return Animation(self.images, self.img_duration, self.loop)
+            return Animation(self.images, self.img_duration, self.loop, self.flipped)
 
-    def img(self):
-            return self.images[int(self.frame / self.img_duration)]
+    def img(self, flip=False):
+            return (self.flipped if flip else self.images)[int(self.frame / self.img_duration)]
 
     def update(self):
         if self.loop:
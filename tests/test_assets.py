@@ -0,0 +1,185 @@
+import pytest
+import pygame
+from scripts.utilities import Animation
+from scripts import assets
+from scripts.assets import AssetCache, AssetSpec, VariantSpec, ASSET_MANIFEST, EDITOR_TILES, STARTUP_ASSETS, WHITE, asset_size, shared_assets
+
+class TestAssets:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        
+        pygame.display.set_caption("Assets Test")
+        pygame.display.set_mode((640, 480))
+        
+        self.manifest = {
+            'grass': AssetSpec('tiles/grass'),
+            'stone': AssetSpec('tiles/stone'),
+            'decor': AssetSpec('tiles/decor'),
+            'bow': AssetSpec('Bow.png', WHITE),
+            'enemy/idle': AssetSpec('entities/goblin/idle', WHITE, {'img_dur': 6}),
+        }
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify specs load single images, image lists and animations with their colorkey
+    def test_spec_load(self):
+        bow = self.manifest['bow'].load()
+        assert isinstance(bow, pygame.Surface)
+        assert bow.get_colorkey() == (255, 255, 255, 255)
+        
+        grass = self.manifest['grass'].load()
+        assert isinstance(grass, list)
+        assert all(img.get_colorkey() == (0, 0, 0, 255) for img in grass)
+        
+        idle = self.manifest['enemy/idle'].load()
+        assert isinstance(idle, Animation)
+        assert idle.img_duration == 6
+    
+    # Verify assets are only loaded on first access and then reused
+    def test_lazy_load(self):
+        cache = AssetCache(self.manifest)
+        
+        assert cache.loads == 0
+        assert 'grass' in cache
+        assert 'missing' not in cache
+        assert list(cache) == list(self.manifest)
+        assert len(cache) == 5
+        assert cache.loads == 0
+        
+        grass = cache['grass']
+        assert cache['grass'] is grass
+        assert cache.loads == 1
+        assert cache.sizes['grass'] == asset_size(grass) > 0
+        
+        with pytest.raises(KeyError):
+            cache['missing']
+    
+    # Verify the oldest assets are evicted once the budget is exceeded
+    def test_eviction(self):
+        cache = AssetCache(self.manifest)
+        tile_set = asset_size(cache['grass'])
+        cache = AssetCache(self.manifest, budget=tile_set * 2)
+        
+        cache['grass']
+        cache['stone']
+        cache['decor']
+        
+        assert list(cache.loaded) == ['stone', 'decor']
+        assert cache.evictions == 1
+        assert cache.memory() <= cache.budget
+    
+    # Verify assets still drawn by something outside the cache are never evicted or loaded twice
+    def test_held_not_evicted(self):
+        cache = AssetCache(self.manifest, budget=1)
+        idle = cache['enemy/idle'].copy()
+        tile = cache['grass'][0]
+        cache['bow']
+        cache['stone']
+        
+        assert 'enemy/idle' in cache.loaded and 'grass' in cache.loaded
+        assert 'bow' not in cache.loaded
+        assert cache['enemy/idle'].images is idle.images
+        assert cache['grass'][0] is tile
+        assert cache.loads == 4
+        
+        del idle, tile
+        cache['decor']
+        assert list(cache.loaded) == ['decor']
+    
+    # Verify pinned assets are preloaded and survive eviction
+    def test_pinning(self):
+        cache = AssetCache(self.manifest, budget=1)
+        cache.pin(['grass', 'stone', 'not-an-asset'])
+        
+        assert cache.pinned == {'grass', 'stone'}
+        assert cache.loads == 2
+        
+        cache['decor']
+        cache['bow']
+        assert 'grass' in cache.loaded and 'stone' in cache.loaded
+        assert 'decor' not in cache.loaded
+        
+        cache.unpin(['grass'])
+        assert 'grass' not in cache.loaded
+        assert 'stone' in cache.loaded
+    
+    # Verify threaded decoding produces the same assets as loading one by one
+    def test_parallel_preload(self):
+        serial = AssetCache(self.manifest)
+        parallel = AssetCache(self.manifest)
+        parallel.preload(list(self.manifest), workers=4)
+        
+        assert parallel.loads == 5
+        for key in self.manifest:
+            expected = serial[key]
+            actual = parallel[key]
+            if isinstance(expected, Animation):
+                expected, actual = expected.images, actual.images
+            if isinstance(expected, pygame.Surface):
+                expected, actual = [expected], [actual]
+            assert [pygame.image.tobytes(img, 'RGB') for img in actual] == [pygame.image.tobytes(img, 'RGB') for img in expected]
+            assert [img.get_colorkey() for img in actual] == [img.get_colorkey() for img in expected]
+        
+        # Reusing a loaded asset does not decode it again
+        parallel.preload(['grass'], workers=4)
+        assert parallel.loads == 5
+    
+    # Verify per-group decode and convert timings are reported
+    def test_timings(self):
+        cache = AssetCache(self.manifest)
+        cache.preload(['grass', 'bow'], workers=2)
+        cache['stone']
+        
+        assert set(cache.timings) == {'grass', 'bow', 'stone'}
+        assert all(timing['decode'] >= 0 and timing['convert'] >= 0 for timing in cache.timings.values())
+        
+        report = cache.timing_report().splitlines()
+        assert len(report) == 3
+        assert report[0].startswith('grass')
+    
+    # Verify variants are derived once from their source in the order declared
+    def test_variants(self):
+        self.manifest['bow/held'] = VariantSpec('bow', size=(4, 8), rotate=-15)
+        self.manifest['bow/held_flipped'] = VariantSpec('bow', size=(4, 8), rotate=-15, flip=True)
+        self.manifest['enemy/idle/small'] = VariantSpec('enemy/idle', scale=0.5)
+        cache = AssetCache(self.manifest)
+        cache.preload(['bow/held', 'bow/held_flipped', 'enemy/idle/small'])
+        
+        bow = cache['bow']
+        held = pygame.transform.rotate(pygame.transform.scale(bow, (4, 8)), -15)
+        assert pygame.image.tobytes(cache['bow/held'], 'RGB') == pygame.image.tobytes(held, 'RGB')
+        assert pygame.image.tobytes(cache['bow/held_flipped'], 'RGB') == pygame.image.tobytes(pygame.transform.flip(held, True, False), 'RGB')
+        assert cache['bow/held'].get_colorkey() == (255, 255, 255, 255)
+        assert cache.loads == 5
+        
+        small = cache['enemy/idle/small']
+        idle = cache['enemy/idle']
+        assert isinstance(small, Animation)
+        assert small.img_duration == idle.img_duration
+        assert small.images[0].get_width() == idle.images[0].get_width() // 2
+        assert small.flipped[0].get_size() == small.images[0].get_size()
+        
+        with pytest.raises(ValueError):
+            VariantSpec('bow', shear=2).apply(bow)
+    
+    # Verify every variant in the game manifest points at a real asset
+    def test_manifest_variants(self):
+        for key, spec in ASSET_MANIFEST.items():
+            if isinstance(spec, VariantSpec):
+                assert spec.source in ASSET_MANIFEST
+        assert all(key in ASSET_MANIFEST for key in STARTUP_ASSETS)
+    
+    # Verify the game and editor share one cache built from the same manifest
+    def test_shared_assets(self):
+        assets.shared = None
+        cache = shared_assets()
+        
+        assert shared_assets() is cache
+        assert shared_assets(budget=1024).budget == 1024
+        assert all(key in ASSET_MANIFEST for key in EDITOR_TILES)
+        
+        assets.shared = None
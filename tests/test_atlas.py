@@ -0,0 +1,90 @@
+import os
+import pytest
+import pygame
+from scripts.atlas import Atlas, build_atlas, pack, walk_images
+
+class TestAtlas:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Atlas Test")
+        pygame.display.set_mode((640, 480))
+        
+        # Build a small image tree to pack
+        self.base = str(tmp_path / 'images') + '/'
+        self.out = str(tmp_path / 'atlas') + '/'
+        os.makedirs(self.base + 'tiles/grass')
+        self.colors = {}
+        for i in range(3):
+            img = pygame.Surface((16, 8 + i))
+            color = (40 * i, 200, 255 - 40 * i)
+            img.fill(color)
+            pygame.image.save(img, self.base + 'tiles/grass/' + str(i) + '.png')
+            self.colors['tiles/grass/' + str(i) + '.png'] = color
+        big = pygame.Surface((40, 30))
+        big.fill((255, 255, 255))
+        pygame.image.save(big, self.base + 'background.png')
+        self.colors['background.png'] = (255, 255, 255)
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify shelf packing keeps images inside their sheet without overlaps
+    def test_pack(self):
+        sizes = [(30, 20), (30, 20), (50, 10), (10, 50), (100, 100)]
+        sheets, placements = pack(sizes, sheet_size=64, padding=1)
+        
+        # The oversized image gets a sheet of its own
+        assert sheets[placements[4][0]] == (100, 100)
+        
+        rects = {}
+        for i, (sheet, x, y) in enumerate(placements):
+            rect = pygame.Rect(x, y, sizes[i][0], sizes[i][1])
+            assert rect.right <= sheets[sheet][0] and rect.bottom <= sheets[sheet][1]
+            for other in rects.get(sheet, []):
+                assert not rect.colliderect(other)
+            rects.setdefault(sheet, []).append(rect)
+    
+    # Verify directory listings are recorded in os.listdir order
+    def test_walk_images(self):
+        dirs, images = walk_images(self.base)
+        
+        assert dirs['tiles/grass'] == os.listdir(self.base + 'tiles/grass')
+        assert sorted(images) == sorted(self.colors)
+    
+    # Verify a built atlas returns subsurfaces with the original pixels
+    def test_build_and_open(self):
+        index = build_atlas(self.base, self.out, sheet_size=64)
+        
+        assert len(index['images']) == 4
+        assert os.path.exists(self.out + 'index.json')
+        
+        atlas = Atlas.open(self.out, self.base)
+        for path, color in self.colors.items():
+            img = atlas.image(path)
+            assert img.get_parent() is atlas.sheets[index['images'][path][0]]
+            assert img.get_size() == tuple(index['images'][path][3:5])
+            assert img.get_at((0, 0))[:3] == color
+            assert img.get_at((img.get_width() - 1, img.get_height() - 1))[:3] == color
+        
+        assert atlas.listdir('tiles/grass') == os.listdir(self.base + 'tiles/grass')
+        assert atlas.image('missing.png') is None
+        assert atlas.listdir('missing') is None
+    
+    # Verify entries whose source changed after the build are not served
+    def test_stale_entries(self):
+        build_atlas(self.base, self.out, sheet_size=64)
+        atlas = Atlas.open(self.out, self.base)
+        
+        stat = os.stat(self.base + 'background.png')
+        os.utime(self.base + 'background.png', ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        assert atlas.image('background.png') is None
+        assert atlas.image('tiles/grass/0.png') is not None
+        
+        pygame.image.save(pygame.Surface((4, 4)), self.base + 'tiles/grass/new.png')
+        os.utime(self.base + 'tiles/grass', ns=(stat.st_atime_ns, stat.st_mtime_ns + 5000))
+        assert atlas.listdir('tiles/grass') is None
@@ -0,0 +1,233 @@
+import wave
+from array import array
+import pytest
+import pygame
+from scripts import audio
+from scripts.audio import VoiceManager, ManagedSound, SoundSpec, StreamedSound, DEFAULT_SETTING
+
+class TestVoiceManager:
+    # Build fake sounds and channels so voices can be tracked without a mixer
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        class MockChannel:
+            def __init__(self, sound):
+                self.sound = sound
+                self.busy = True
+            
+            def get_busy(self):
+                return self.busy
+            
+            def get_sound(self):
+                return self.sound
+            
+            def stop(self):
+                self.busy = False
+        
+        class MockSound:
+            def __init__(self):
+                self.channels = []
+                self.volume = 1.0
+            
+            def play(self, loops=0):
+                self.channels.append(MockChannel(self))
+                return self.channels[-1]
+            
+            def set_volume(self, volume):
+                self.volume = volume
+            
+            def get_volume(self):
+                return self.volume
+        
+        self.time = [0]
+        self.sounds = {name: MockSound() for name in ['shoot', 'hit', 'ambience', 'jump']}
+        self.settings = {'shoot': (2, 0), 'hit': (3, 2), 'ambience': (1, 3)}
+        self.manager = VoiceManager(self.sounds, self.settings, max_voices=4, window=50, ticks=lambda: self.time[0])
+        
+        yield
+    
+    def advance(self, ms=100):
+        self.time[0] += ms
+    
+    # Verify the manager wraps every sound and keeps the sfx call sites working
+    def test_wrapping(self):
+        assert isinstance(self.manager['shoot'], ManagedSound)
+        assert set(self.manager) == set(self.sounds)
+        assert len(self.manager) == 4
+        assert self.manager.setting('jump') == DEFAULT_SETTING
+        
+        self.manager['shoot'].set_volume(0.2)
+        assert self.manager['shoot'].get_volume() == 0.2
+        
+        channel = self.manager['shoot'].play()
+        assert channel is self.sounds['shoot'].channels[0]
+        assert self.manager.played == 1
+    
+    # Verify repeated triggers inside the window coalesce into one voice
+    def test_coalesce(self):
+        for _ in range(10):
+            self.manager['shoot'].play()
+        
+        assert self.manager.played == 1
+        assert self.manager.coalesced == 9
+        
+        self.advance()
+        self.manager['shoot'].play()
+        assert self.manager.played == 2
+    
+    # Verify a sound over its own cap steals its oldest voice
+    def test_per_sound_cap(self):
+        for _ in range(3):
+            self.manager['shoot'].play()
+            self.advance()
+        
+        channels = self.sounds['shoot'].channels
+        assert [channel.busy for channel in channels] == [False, True, True]
+        assert len(self.manager.active('shoot')) == 2
+        assert self.manager.stolen == 1
+    
+    # Verify the global cap steals low priority voices and drops low priority requests
+    def test_priority_stealing(self):
+        self.manager['ambience'].play(-1)
+        self.advance()
+        self.manager['hit'].play()
+        self.advance()
+        self.manager['shoot'].play()
+        self.advance()
+        self.manager['shoot'].play()
+        self.advance()
+        assert len(self.manager.active()) == 4
+        
+        # A higher priority sound takes the oldest lowest priority voice
+        self.manager['hit'].play()
+        self.advance()
+        assert self.sounds['shoot'].channels[0].busy is False
+        assert self.sounds['ambience'].channels[0].busy is True
+        assert self.manager.stolen == 1
+        
+        self.manager['hit'].play()
+        self.advance()
+        assert self.manager.stolen == 2
+        
+        # With only higher priority voices left a low priority sound is dropped
+        assert self.manager['shoot'].play() is None
+        assert self.manager.dropped == 1
+        assert [voice[1] for voice in self.manager.active()] == ['ambience', 'hit', 'hit', 'hit']
+        
+        self.manager['hit'].stop()
+        assert [voice[1] for voice in self.manager.active()] == ['ambience']
+    
+    # Verify finished voices free their slot
+    def test_finished_voices(self):
+        channel = self.manager['hit'].play()
+        channel.busy = False
+        
+        assert self.manager.active() == []
+
+class TestSoundLoading:
+    # Initialize the mixer on the dummy driver and write short wav files to load
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        # machines without a sound device still run these
+        monkeypatch.setenv('SDL_AUDIODRIVER', 'dummy')
+        pygame.mixer.init()
+        
+        self.freq, size, self.channels = pygame.mixer.get_init()
+        self.path = str(tmp_path / 'tone.wav')
+        self.write_wav(self.path, 2, [1000, -1000] * self.freq)
+        self.wide_path = str(tmp_path / 'wide.wav')
+        self.write_wav(self.wide_path, 3, [0x123456, -0x123456] * self.freq)
+        
+        yield
+        
+        audio.sound_cache.clear()
+        pygame.mixer.quit()
+    
+    def write_wav(self, path, width, samples):
+        writer = wave.open(path, 'wb')
+        writer.setnchannels(self.channels)
+        writer.setsampwidth(width)
+        writer.setframerate(self.freq)
+        writer.writeframes(b''.join(sample.to_bytes(width, 'little', signed=True) for sample in samples))
+        writer.close()
+    
+    # Verify sounds are decoded on first play into a cache shared across managers
+    def test_lazy_load(self):
+        manager = VoiceManager({'tone': SoundSpec(self.path, 0.5)})
+        
+        assert manager['tone'].loaded is None
+        assert audio.sound_cache == {}
+        
+        manager['tone'].play()
+        assert manager['tone'].loaded is audio.sound_cache[self.path]
+        assert manager['tone'].get_volume() == pytest.approx(0.5, abs=0.01)
+        
+        other = VoiceManager({'tone': SoundSpec(self.path, 0.5)})
+        other.preload()
+        assert other['tone'].sound is manager['tone'].sound
+    
+    # Verify preloading can run on a background thread
+    def test_background_preload(self):
+        manager = VoiceManager({'tone': SoundSpec(self.path)})
+        loader = manager.preload(background=True)
+        loader.join()
+        
+        assert manager['tone'].loaded is not None
+    
+    # Verify long tracks play from disk with the next chunk queued
+    def test_streamed_sound(self):
+        manager = VoiceManager({'tone': SoundSpec(self.path, 0.3, stream=True)})
+        channel = manager['tone'].play(-1)
+        stream = manager['tone'].sound
+        
+        assert isinstance(stream, StreamedSound)
+        assert stream.channel is channel
+        assert channel.get_queue() is not None
+        assert channel.get_sound().get_volume() == pytest.approx(0.3, abs=0.01)
+        assert len(manager.active()) == 1
+        
+        manager['tone'].stop()
+        manager.update()
+        assert stream.channel is None
+        assert manager.active() == []
+    
+    # Verify an optional track that is missing plays nothing instead of failing
+    def test_optional_missing(self, tmp_path):
+        manager = VoiceManager({'ambience': SoundSpec(str(tmp_path / 'missing.wav'), 0.2, stream=True, optional=True)})
+        
+        assert manager['ambience'].play(-1) is None
+        assert manager['ambience'].get_volume() == 0.2
+        assert manager.dropped == 1
+        manager['ambience'].stop()
+        manager.update()
+    
+    # Verify a looping stream picks up again after a stall drains its channel, and a finished one stops
+    def test_stream_stall(self):
+        stream = StreamedSound(self.path)
+        channel = stream.play(-1)
+        channel.stop()
+        stream.update()
+        
+        assert stream.channel is channel
+        assert channel.get_busy()
+        assert channel.get_queue() is not None
+        
+        stream.play(0)
+        while stream.next_chunk() is not None:
+            pass
+        stream.channel.stop()
+        stream.update()
+        
+        assert stream.channel is None
+    
+    # Verify chunks wider than 16 bits are cut down to the mixer format
+    def test_stream_chunk_format(self):
+        stream = StreamedSound(self.wide_path)
+        
+        assert stream.compatible()
+        stream.reader = wave.open(self.wide_path, 'rb')
+        stream.frames = 2
+        samples = array('h', stream.next_chunk().get_raw())
+        stream.reader.close()
+        
+        assert list(samples[:2]) == [0x1234, -0x1235]
+        assert not StreamedSound(self.path + '.missing').compatible()
@@ -0,0 +1,69 @@
+import pytest
+import pygame
+from scripts.batch import session_specs, run_batch, aggregate
+from scripts.simulation import HISTOGRAM_BUCKETS, histogram_percentile, frame_time_bucket, bucket_bounds
+
+class TestBatch:
+    # Shut pygame down after the in-process sessions
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.scripts = [('idle', []), ('walk', [[0, 'press', 'right'], [20, 'click']])]
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify each session gets its own seed and the levels and scripts are handed out round robin
+    def test_session_specs(self):
+        specs = session_specs(4, 30, seed=10, levels=[0, 1], scripts=self.scripts)
+        
+        assert [spec['seed'] for spec in specs] == [10, 11, 12, 13]
+        assert [spec['level'] for spec in specs] == [0, 1, 0, 1]
+        assert [spec['script_name'] for spec in specs] == ['idle', 'walk', 'idle', 'walk']
+        assert all(spec['frames'] == 30 for spec in specs)
+    
+    # Verify a pooled batch plays out the same as running the sessions in this process
+    def test_reproducible(self):
+        specs = session_specs(4, 60, seed=3, levels=[0, 1], scripts=self.scripts)
+        pooled = run_batch(specs, processes=2)
+        local = run_batch(specs, processes=1)
+        
+        assert [result['session'] for result in pooled] == [0, 1, 2, 3]
+        for first, second in zip(pooled, local):
+            assert first['player'] == second['player']
+            assert first['enemies'] == second['enemies']
+            assert first['level'] == second['level'] == first['start_level']
+            assert sum(first['frame_times']) == 60
+        assert pooled[1]['fireballs'] == 1
+    
+    # Verify results are summed into per level clear times, deaths and frame time percentiles
+    def test_aggregate(self):
+        histogram = [0] * HISTOGRAM_BUCKETS
+        histogram[frame_time_bucket(1100000)] = 9
+        histogram[frame_time_bucket(5300000)] = 1
+        results = [
+            {'clears': [[0, 600]], 'deaths': {'0': 2}, 'arrows': 5, 'fireballs': 1, 'frame_times': histogram, 'seconds': 0.5, 'game_seconds': 10},
+            {'clears': [[0, 1200], [1, 300]], 'deaths': {'1': 1}, 'arrows': 3, 'fireballs': 0, 'frame_times': histogram, 'seconds': 0.5, 'game_seconds': 10},
+        ]
+        summary = aggregate(results)
+        
+        assert summary['sessions'] == 2
+        assert summary['clear_times']['0'] == {'count': 2, 'mean': 15, 'min': 10, 'max': 20}
+        assert summary['clear_times']['1']['count'] == 1
+        assert summary['deaths'] == {'0': {'total': 2, 'per_session': 1}, '1': {'total': 1, 'per_session': 0.5}}
+        assert summary['arrows'] == 8
+        assert summary['frame_time_us']['p50'] == pytest.approx(1100, rel=1 / 32)
+        assert summary['frame_time_us']['p99'] == pytest.approx(5300, rel=1 / 32)
+        assert histogram_percentile([0] * HISTOGRAM_BUCKETS, 0.5) == 0
+    
+    # Verify every frame time lands in a bucket that holds it and is at most 1/16 as wide
+    def test_buckets(self):
+        buckets = [frame_time_bucket(us * 1000) for us in range(40000)]
+        
+        assert buckets == sorted(buckets)
+        assert set(range(buckets[-1] + 1)) <= set(buckets)
+        for us in (0, 7, 16, 31, 32, 1100, 2047, 2048, 16666, 39999):
+            low, high = bucket_bounds(frame_time_bucket(us * 1000))
+            assert low <= us < high
+            assert high - low <= max(1, low / 16)
+        assert frame_time_bucket(10 ** 12) == HISTOGRAM_BUCKETS - 1
@@ -0,0 +1,50 @@
+import json
+import pytest
+import pygame
+from scripts.benchmark import measure, run_benchmarks, write_results, map_ids
+
+class TestBenchmark:
+    # Shut pygame down after the benchmark game
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        yield
+        
+        pygame.quit()
+    
+    # Verify a measurement loops until each sample is long enough and keeps every sample
+    def test_measure(self):
+        calls = []
+        result = measure(lambda: calls.append(1), repeats=3, min_time=0.001)
+        
+        assert result['loops'] > 1
+        assert len(result['samples']) == 3
+        assert len(calls) >= result['loops'] * 3
+        assert result['min'] <= result['median'] <= max(result['samples'])
+        assert result['unit'] == 'ms'
+    
+    # Verify benchmarks can be picked by name and the report is plain JSON
+    def test_run_benchmarks(self, tmp_path):
+        report = run_benchmarks(['tilemap/0/solid_check', 'sparks/update', 'game/frame/1'], count=10, repeats=2, min_time=0.001)
+        path = write_results(report, str(tmp_path / 'benchmark.json'))
+        f = open(path)
+        saved = json.load(f)
+        f.close()
+        
+        assert sorted(saved['results']) == ['game/frame/1', 'sparks/update/10', 'tilemap/0/solid_check/10']
+        assert saved['count'] == 10
+        assert saved['machine']['python']
+        assert all(len(result['samples']) == 2 for result in saved['results'].values())
+    
+    # Verify interleaved rounds take the same number of samples of every benchmark
+    def test_interleaved(self):
+        report = run_benchmarks(['calibration', 'sparks/update'], count=10, repeats=3, min_time=0.001, interleave=True)
+        
+        assert sorted(report['results']) == ['calibration', 'sparks/update/10']
+        assert report['interleaved']
+        assert all(len(result['samples']) == 3 and result['loops'] >= 1 for result in report['results'].values())
+    
+    # Verify the maps are found from any working directory
+    def test_map_ids(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        
+        assert map_ids() == [0, 1, 2]
@@ -0,0 +1,55 @@
+import pytest
+import pygame
+from array import array
+from scripts.camera import Camera, CULL_MARGIN
+
+class TestCamera:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Camera Test")
+        pygame.display.set_mode((640, 480))
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify the view follows the render scroll with a culling margin
+    def test_move(self):
+        camera = Camera((320, 240))
+        camera.move((100, 50))
+        
+        assert camera.view == pygame.Rect(100 - CULL_MARGIN, 50 - CULL_MARGIN, 320 + CULL_MARGIN * 2, 240 + CULL_MARGIN * 2)
+    
+    # Verify rect and point queries count visible and culled objects
+    def test_visibility_counts(self):
+        camera = Camera((320, 240), margin=10)
+        camera.move((0, 0))
+        
+        assert camera.sees(pygame.Rect(100, 100, 10, 10)) == True
+        assert camera.sees(pygame.Rect(-15, -15, 8, 8)) == True
+        assert camera.sees(pygame.Rect(400, 100, 10, 10)) == False
+        assert camera.sees_point((329, 249)) == True
+        assert camera.sees_point((-11, 0)) == False
+        
+        assert camera.visible == 3
+        assert camera.culled == 2
+        
+        # Counts are per frame
+        camera.move((0, 0))
+        assert camera.visible == 0 and camera.culled == 0
+    
+    # Verify bulk point queries return the indices of visible points
+    def test_visible_points(self):
+        camera = Camera((320, 240), margin=0)
+        camera.move((1000, 0))
+        
+        xs = array('d', [999, 1000, 1319.5, 1320, 1100])
+        ys = array('d', [10, 10, 10, 10, 300])
+        
+        assert camera.visible_points(xs, ys) == [1, 2]
+        assert camera.visible == 2
+        assert camera.culled == 3
@@ -2,7 +2,7 @@ import math
 import pytest
 import pygame
 import random
-from scripts.clouds import Cloud, Clouds
+from scripts.clouds import Cloud, CloudLayer, Clouds
 
 class TestCloud:
     # Initialize pygame for testing and clean up afterward
@@ -142,22 +142,36 @@ class TestClouds:
         clouds = Clouds(self.cloud_images)
         assert len(clouds.clouds_list) == 16  # Default count
     
-    # Verify Clouds update calls update on all Cloud instances
+    # Verify clouds are grouped into depth-ordered layers
+    def test_clouds_layers(self):
+        clouds = Clouds(self.cloud_images, count=64, bands=4)
+        
+        assert 0 < len(clouds.layers) <= 4
+        assert sum(len(layer.clouds) for layer in clouds.layers) == 64
+        
+        depths = [layer.depth for layer in clouds.layers]
+        assert depths == sorted(depths)
+        
+        # Every cloud in a layer sits within that layer's depth band
+        for layer in clouds.layers:
+            assert min(c.depth for c in layer.clouds) <= layer.depth <= max(c.depth for c in layer.clouds)
+    
+    # Verify Clouds update advances every layer
     def test_clouds_update(self):
         # Create clouds
         clouds = Clouds(self.cloud_images, count=3)
         
         # Save initial positions
-        initial_positions = [cloud.pos[0] for cloud in clouds.clouds_list]
+        initial_positions = [layer.pos[0] for layer in clouds.layers]
         
         # Update clouds
         clouds.update()
         
-        # Verify all clouds have moved
-        for i, cloud in enumerate(clouds.clouds_list):
-            assert cloud.pos[0] != initial_positions[i]
+        # Verify all layers have moved
+        for i, layer in enumerate(clouds.layers):
+            assert layer.pos[0] != initial_positions[i]
     
-    # Verify Clouds render calls render on all Cloud instances
+    # Verify Clouds render blits each layer once regardless of cloud count
     def test_clouds_render(self):
         # Create a tracking surface class to verify blitting
         class BlitTracker:
@@ -167,7 +181,7 @@ class TestClouds:
                 
             def blit(self, source, pos, *args, **kwargs):
                 self.blit_count += 1
-                return self.surface.blit(source, pos)
+                return self.surface.blit(source, pos, *args)
                 
             def get_width(self):
                 return self.surface.get_width()
@@ -176,12 +190,40 @@ class TestClouds:
                 return self.surface.get_height()
         
         # Create clouds and test surface
-        cloud_count = 3
-        clouds = Clouds(self.cloud_images, count=cloud_count)
+        clouds = Clouds(self.cloud_images, count=200)
         tracker = BlitTracker()
         
         # Render clouds
         clouds.render(tracker, offset=(10, 5))
         
-        # Verify correct number of blits (one per cloud)
-        assert tracker.blit_count == cloud_count
\ No newline at end of file
+        # Verify one blit per layer
+        assert tracker.blit_count == len(clouds.layers)
+        
+        # Layers are composited once and reused on later frames
+        images = [layer.img for layer in clouds.layers]
+        clouds.update()
+        clouds.render(tracker, offset=(40, 20))
+        assert [layer.img for layer in clouds.layers] == images
+    
+    # Verify a layer wraps seamlessly and is rebuilt when its contents change
+    def test_cloud_layer_wrap(self):
+        layer = CloudLayer(0.5, 0.1)
+        layer.add(Cloud((0, 0), self.cloud_images[0], 0.1, 0.5))
+        
+        surf = pygame.Surface((100, 80))
+        layer.render(surf)
+        period = layer.period
+        assert period == (100 + 32, 80 + 16)
+        
+        # Offsets one full period apart show the same view
+        first = pygame.Surface((100, 80))
+        second = pygame.Surface((100, 80))
+        layer.render(first, offset=(10, 6))
+        layer.render(second, offset=(10 + period[0] / layer.depth, 6 + period[1] / layer.depth))
+        assert pygame.image.tobytes(first, 'RGB') == pygame.image.tobytes(second, 'RGB')
+        
+        # Adding a cloud invalidates the composited surface
+        layer.add(Cloud((50, 50), self.cloud_images[2], 0.1, 0.5))
+        assert layer.img is None
+        layer.render(surf)
+        assert layer.period == (100 + 64, 80 + 32)
@@ -3,6 +3,7 @@ import pygame
 from scripts.entities import PhysicsEntity, Player, Enemy
 from scripts.utilities import Animation
 from scripts.spark import Spark
+from scripts.rng import RandomStreams
 
 class TestPhysicsEntity:
     # Initialize pygame for testing and clean up afterward
@@ -23,9 +24,11 @@ class TestPhysicsEntity:
                     'player/jump': Animation([pygame.Surface((16, 16))], img_dur=5),
                     'player/attack': Animation([pygame.Surface((32, 32))], img_dur=4, loop=False),
                     'player/weapon': pygame.Surface((16, 16)),
+                    'player/weapon_flipped': pygame.Surface((16, 16)),
                     'enemy/idle': Animation([pygame.Surface((16, 16))], img_dur=5),
                     'enemy/run': Animation([pygame.Surface((16, 16))], img_dur=5),
-                    'bow': pygame.Surface((8, 16))
+                    'bow/held': pygame.Surface((6, 9)),
+                    'bow/held_flipped': pygame.Surface((6, 9))
                 }
                 self.screenshake = 0
                 self.dead = 0
@@ -36,6 +39,7 @@ class TestPhysicsEntity:
                 }
                 self.projectiles = []
                 self.sparks = []
+                self.rng = RandomStreams(0)
         
         # Mock sound class
         class MockSound:
@@ -0,0 +1,99 @@
+import gc
+import tracemalloc
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.memory import AllocationTracker, GCMonitor, write_memory_report
+from scripts.profiler import FrameProfiler
+
+class TestMemory:
+    # Leave tracing, collector callbacks and frozen objects as they were found
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tracing = tracemalloc.is_tracing()
+        callbacks = list(gc.callbacks)
+
+        yield
+
+        gc.callbacks[:] = callbacks
+        gc.unfreeze()
+        if not tracing:
+            tracemalloc.stop()
+        pygame.quit()
+
+    # Verify each stage is charged what it keeps and what it allocates and frees
+    def test_stages(self):
+        tracker = AllocationTracker(window=8, site_interval=0)
+        profiler = FrameProfiler(enabled=True, memory=tracker)
+        kept = []
+        profiler.begin()
+        kept.append(bytearray(50000))
+        profiler.mark('keep')
+        assert len(bytes(80000)) == 80000
+        profiler.mark('churn')
+        profiler.end()
+
+        assert list(tracker.stages) == ['keep', 'churn', 'frame']
+        assert tracker.stages['keep']['bytes'].average() >= 50000
+        assert tracker.stages['churn']['bytes'].average() < 5000
+        assert tracker.stages['churn']['churn'].average() >= 75000
+        assert tracker.stages['frame']['churn'].average() >= 125000
+        assert tracker.frames == 1
+
+    # Verify traced frames name the lines that allocated in each stage
+    def test_sites(self):
+        tracker = AllocationTracker(site_interval=2)
+        profiler = FrameProfiler(enabled=True, memory=tracker)
+        kept = []
+        for _ in range(3):
+            profiler.begin()
+            kept.append([object() for _ in range(500)])
+            profiler.mark('objects')
+            profiler.end()
+        site, (count, size) = tracker.top_sites('objects')[0]
+
+        assert site.startswith(__file__)
+        assert count >= 1000
+        assert 'top sites in objects over 2 traced frames' in tracker.report()
+
+    # Verify collections are timed and split into scheduled ones and ones during play
+    def test_gc_monitor(self, tmp_path):
+        monitor = GCMonitor(freeze=True, schedule=True)
+        monitor.install()
+        gc.collect()
+        monitor.transition()
+        monitor.level_loaded()
+        monitor.uninstall()
+        gc.collect()
+        path = write_memory_report(None, monitor, str(tmp_path / 'memory.txt'))
+        f = open(path)
+        report = f.read()
+        f.close()
+
+        assert monitor.collections[2] == 2
+        assert (monitor.during_play, monitor.scheduled) == (1, 1)
+        assert monitor.pauses.count == 2
+        assert gc.get_freeze_count() > 0
+        assert '1 during play' in report
+
+    # Verify a transition without scheduling never collects
+    def test_unscheduled(self):
+        monitor = GCMonitor()
+        monitor.install()
+        monitor.transition()
+        monitor.level_loaded()
+        monitor.uninstall()
+
+        assert monitor.collections == [0, 0, 0]
+        assert gc.get_freeze_count() == 0
+
+    # Verify a game in diagnostics mode profiles allocations for every stage and freezes its level
+    def test_game(self):
+        game = Game(headless=True, seed=1, diagnostics=True, gc_freeze=True)
+        game.simulate(20)
+        game.gc_monitor.uninstall()
+
+        assert list(game.profiler.memory.stages) == list(game.profiler.stages)
+        assert game.profiler.memory.frames == 20
+        assert 'enemies' in game.profiler.memory.sites
+        assert gc.get_freeze_count() > 0
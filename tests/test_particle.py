@@ -258,7 +258,6 @@ class TestProjectile:
                 self.blit_count = 0
                 self.last_blit_source = None
                 self.last_blit_pos = None
-                self.last_transform_flip = None
                 
             def blit(self, source, pos, *args, **kwargs):
                 self.blit_count += 1
@@ -268,24 +267,14 @@ class TestProjectile:
         
         tracker = BlitTracker()
         
-        # Mock the transform.flip and transform.scale methods to track calls
-        original_flip = pygame.transform.flip
-        
-        def mock_flip(surface, x_flip, y_flip):
-            tracker.last_transform_flip = (x_flip, y_flip)
-            return original_flip(surface, x_flip, y_flip)
-
-        
-        pygame.transform.flip = mock_flip
-        
         # Render with no offset
         projectile.render(tracker)
         
         # Verify blit was called once
         assert tracker.blit_count == 1
         
-        # Should not be flipped when moving right
-        assert tracker.last_transform_flip == (False, False)
+        # Should use the unflipped frame when moving right
+        assert tracker.last_blit_source is projectile.animation.images[0]
         
         # Test with negative velocity (moving left)
         projectile.velocity = [-2, 0]
@@ -296,8 +285,8 @@ class TestProjectile:
         # Verify blit was called once
         assert tracker.blit_count == 1
         
-        # Should be flipped when moving left
-        assert tracker.last_transform_flip == (True, False)
+        # Should use the precomputed flipped frame when moving left
+        assert tracker.last_blit_source is projectile.animation.flipped[0]
         
         # Test with offset
         tracker.blit_count = 0
@@ -306,7 +295,4 @@ class TestProjectile:
         # Position should be adjusted by offset
         expected_x = projectile.pos[0] - 10
         expected_y = projectile.pos[1] - 20
-        assert tracker.last_blit_pos == (expected_x, expected_y)
-        
-        # Restore original methods
-        pygame.transform.flip = original_flip
\ No newline at end of file
+        assert tracker.last_blit_pos == (expected_x, expected_y)
\ No newline at end of file
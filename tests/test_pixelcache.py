@@ -0,0 +1,68 @@
+import os
+import pytest
+import pygame
+from scripts.pixelcache import PixelCache
+
+class TestPixelCache:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Pixel Cache Test")
+        pygame.display.set_mode((640, 480))
+        
+        # Save a small source image and point the cache at a temp folder
+        self.source = str(tmp_path / 'image.png')
+        self.img = pygame.Surface((12, 7))
+        self.img.fill((30, 60, 90))
+        self.img.set_at((3, 2), (255, 255, 255))
+        pygame.image.save(self.img, self.source)
+        self.cache = PixelCache(str(tmp_path / 'pixels') + '/')
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify a stored image loads back with the same pixels and colorkey
+    def test_round_trip(self):
+        assert self.cache.load(self.source) is None
+        assert self.cache.misses == 1
+        
+        self.cache.store(self.source, self.img.convert(), (255, 255, 255))
+        img = self.cache.load(self.source, (255, 255, 255))
+        
+        assert self.cache.hits == 1
+        assert img.get_size() == (12, 7)
+        assert img.get_colorkey() == (255, 255, 255, 255)
+        assert img.get_bitsize() == pygame.display.get_surface().get_bitsize()
+        assert pygame.image.tobytes(img, 'RGB') == pygame.image.tobytes(self.img, 'RGB')
+    
+    # Verify entries are keyed by colorkey as well as path
+    def test_colorkey_key(self):
+        self.cache.store(self.source, self.img.convert(), (0, 0, 0))
+        
+        assert self.cache.load(self.source, (255, 255, 255)) is None
+        assert self.cache.load(self.source) is None
+        assert self.cache.load(self.source, (0, 0, 0)) is not None
+    
+    # Verify an entry is ignored once its source file changes
+    def test_invalidation(self):
+        self.cache.store(self.source, self.img.convert())
+        stat = os.stat(self.source)
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        
+        assert self.cache.load(self.source) is None
+    
+    # Verify truncated entries are treated as misses and clear removes entries
+    def test_corrupt_and_clear(self):
+        self.cache.store(self.source, self.img.convert())
+        entry = self.cache.entry_path(self.source)
+        with open(entry, 'r+b') as f:
+            f.truncate(os.path.getsize(entry) - 4)
+        
+        assert self.cache.load(self.source) is None
+        
+        self.cache.clear()
+        assert os.listdir(self.cache.path) == []
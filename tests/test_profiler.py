@@ -0,0 +1,106 @@
+import pytest
+import pygame
+from scripts.profiler import StageTimes, FrameProfiler
+
+class TestProfiler:
+    # Initialize pygame for the overlay and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        pygame.display.set_mode((640, 480))
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify the ring buffer keeps only the newest samples
+    def test_stage_times(self):
+        times = StageTimes(size=4)
+        for ns in [100, 200, 300, 400, 500, 600]:
+            times.add(ns)
+        
+        assert sorted(times.values()) == [300, 400, 500, 600]
+        assert times.average() == 450
+        assert times.percentile(0.5) == 500
+        assert times.percentile(1.0) == 600
+        assert StageTimes().average() == 0
+    
+    # Verify a disabled profiler records nothing
+    def test_disabled(self):
+        profiler = FrameProfiler()
+        profiler.begin()
+        profiler.mark('input')
+        profiler.end()
+        
+        assert profiler.stages == {}
+        assert profiler.frames == 0
+    
+    # Verify every mark is charged the time since the one before it
+    def test_marks(self):
+        profiler = FrameProfiler(enabled=True, window=8)
+        for _ in range(3):
+            profiler.begin()
+            profiler.mark('input')
+            sum(range(20000))
+            profiler.mark('enemies')
+            profiler.end()
+        
+        assert list(profiler.stages) == ['input', 'enemies', 'frame']
+        assert profiler.frames == 3
+        assert profiler.stages['enemies'].count == 3
+        assert profiler.stages['frame'].average() >= profiler.stages['enemies'].average() > profiler.stages['input'].average()
+        assert profiler.slowest() == 'enemies'
+    
+    # Verify the export has one row per stage
+    def test_export(self, tmp_path):
+        profiler = FrameProfiler(enabled=True)
+        profiler.begin()
+        profiler.mark('scroll')
+        profiler.end()
+        f = open(profiler.export(str(tmp_path / 'profile.csv'), level=2))
+        lines = f.read().splitlines()
+        f.close()
+        
+        assert lines[0] == 'level,stage,samples,mean_ms,p50_ms,p99_ms,max_ms'
+        assert [line.split(',')[:3] for line in lines[1:]] == [['2', 'scroll', '1'], ['2', 'frame', '1']]
+    
+    # Verify the overlay turns profiling on and draws onto the display
+    def test_overlay(self):
+        profiler = FrameProfiler()
+        profiler.toggle_overlay()
+        profiler.mark('input')
+        profiler.end()
+        surf = pygame.Surface((320, 240))
+        rect = profiler.render(surf)
+        
+        assert profiler.enabled and profiler.overlay
+        assert rect.width > 0 and rect.height > 0
+        assert rect.topleft == (2, 2)
+    
+    # Verify counts are listed under the stages in the overlay
+    def test_overlay_counts(self):
+        profiler = FrameProfiler()
+        profiler.toggle_overlay()
+        profiler.mark('input')
+        profiler.end()
+        height = profiler.render(pygame.Surface((320, 240))).height
+        profiler.count('visible', 12)
+        profiler.count('culled', 30)
+        profiler.build_panel()
+        disabled = FrameProfiler()
+        disabled.count('visible', 1)
+        
+        assert profiler.counts == {'visible': 12, 'culled': 30}
+        assert profiler.panel.get_height() == height + 2 * profiler.font.get_linesize()
+        assert disabled.counts == {}
+    
+    # Verify a headless game times each update stage once per frame
+    def test_game_stages(self):
+        from scripts.game import Game
+        game = Game(headless=True, seed=1, profile=True)
+        game.simulate(30)
+        
+        assert list(game.profiler.stages) == ['input', 'transition', 'scroll', 'leaves', 'clouds', 'enemies', 'player', 'arrows', 'fireballs', 'particles', 'audio', 'snapshot', 'frame']
+        assert game.profiler.frames == 30
+        assert all(times.count == 30 for times in game.profiler.stages.values())
+        assert sorted(game.profiler.counts) == ['culled', 'visible']
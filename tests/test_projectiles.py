@@ -0,0 +1,124 @@
+import pytest
+import pygame
+from scripts.projectiles import ArrowPool, ARROW_LIFETIME
+from scripts.tilemap import Tilemap
+from scripts.camera import Camera
+
+class TestArrowPool:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Projectile Test")
+        pygame.display.set_mode((640, 480))
+        
+        # Arrow sprites as the asset table provides them, already scaled and flipped
+        self.arrow_img = pygame.Surface((18, 9))
+        self.arrow_img.fill((0, 0, 255))
+        self.flipped_img = pygame.Surface((18, 9))
+        self.flipped_img.fill((255, 0, 0))
+        
+        class GameMock:
+            def __init__(self):
+                self.assets = {}
+        
+        self.tilemap = Tilemap(GameMock())
+        self.tilemap.tilemap_dict['5;0'] = {'type': 'stone', 'variant': 0, 'pos': [5, 0]}
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify arrows are drawn with the precomputed sprite matching their direction
+    def test_sprites(self):
+        pool = ArrowPool(self.arrow_img, self.flipped_img)
+        pool.spawn((20, 20), 1.5, False)
+        pool.spawn((60, 20), -1.5, True)
+        
+        surf = pygame.Surface((100, 40))
+        pool.render(surf)
+        
+        assert pool.half_size == (9, 4.5)
+        assert surf.get_at((20, 20))[:3] == (0, 0, 255)
+        assert surf.get_at((60, 20))[:3] == (255, 0, 0)
+    
+    # Verify spawn, update and clear operate on the packed arrays
+    def test_spawn_and_update(self):
+        pool = ArrowPool(self.arrow_img, self.flipped_img)
+        pool.spawn((10, 20), 1.5, False)
+        pool.spawn((30, 40), -1.5, True)
+        
+        assert len(pool) == 2
+        
+        pool.update()
+        
+        assert list(pool.x) == [11.5, 28.5]
+        assert list(pool.y) == [20, 40]
+        assert list(pool.age) == [1, 1]
+        assert list(pool.flip) == [0, 1]
+        
+        pool.clear()
+        assert len(pool) == 0
+    
+    # Verify collide reports tile and player hits and removes expired arrows
+    def test_collide(self):
+        pool = ArrowPool(self.arrow_img, self.flipped_img)
+        pool.spawn((84, 8), 1.5, False)     # inside the stone tile
+        pool.spawn((200, 200), -1.5, True)  # inside the player
+        pool.spawn((300, 8), 1.5, False)    # expired
+        pool.spawn((400, 8), 1.5, False)    # still flying
+        pool.age[2] = ARROW_LIFETIME + 1
+        
+        tile_hits, player_hits = pool.collide(self.tilemap, pygame.Rect(195, 195, 10, 13))
+        
+        assert tile_hits == [((84, 8), 1.5)]
+        assert player_hits == [((200, 200), -1.5)]
+        assert len(pool) == 1
+        assert list(pool.x) == [400]
+    
+    # Verify all arrows are drawn in a single batched call
+    def test_render(self):
+        class BlitsTracker:
+            def __init__(self):
+                self.surface = pygame.Surface((640, 480))
+                self.calls = 0
+                self.drawn = 0
+            
+            def blits(self, blit_sequence):
+                self.calls += 1
+                self.drawn += len(blit_sequence)
+                return self.surface.blits(blit_sequence)
+        
+        pool = ArrowPool(self.arrow_img, self.flipped_img)
+        for i in range(50):
+            pool.spawn((i * 10, 100), 1.5, i % 2)
+        
+        tracker = BlitsTracker()
+        pool.render(tracker, offset=(5, 5))
+        
+        assert tracker.calls == 1
+        assert tracker.drawn == 50
+    
+    # Verify arrows outside the camera are skipped before drawing
+    def test_render_culled(self):
+        class BlitsTracker:
+            def __init__(self):
+                self.drawn = 0
+            
+            def blits(self, blit_sequence):
+                self.drawn += len(blit_sequence)
+                return []
+        
+        pool = ArrowPool(self.arrow_img, self.flipped_img)
+        for i in range(10):
+            pool.spawn((i * 100, 100), 1.5, False)
+        
+        camera = Camera((320, 240), margin=0)
+        camera.move((0, 0))
+        tracker = BlitsTracker()
+        pool.render(tracker, camera=camera)
+        
+        assert tracker.drawn == 4
+        assert camera.culled == 6
@@ -0,0 +1,97 @@
+import pytest
+from scripts.regression import save_baseline, load_baseline, build_baseline, compare, compare_benchmark, slower_p, regressions, format_diff, too_noisy
+
+def report(results, created='now'):
+    return {'machine': {'python': '3'}, 'count': 10, 'created': created, 'results': {name: {'samples': samples} for name, samples in results.items()}}
+
+class TestRegression:
+    # Set up steady and noisy timings
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.steady = [1.00, 1.01, 0.99, 1.02, 0.98, 1.00, 1.01]
+        self.noisy = [1.0, 1.6, 0.7, 1.3, 0.8, 1.5, 0.9]
+        # what the gate records on a busy machine: 15 samples a run scattered by about 8%, run medians 5% apart
+        jitter = [1.00, 1.09, 0.93, 1.04, 0.96, 1.12, 0.90, 1.02, 0.98, 1.07, 0.94, 1.01, 1.15, 0.97, 1.05]
+        self.realistic = [[sample * scale for sample in jitter] for scale in (1.0, 1.05, 0.96)]
+    
+    # Verify the rank test only calls clearly slower samples slower
+    def test_slower_p(self):
+        assert slower_p(self.steady, [sample * 1.5 for sample in self.steady]) < 0.01
+        assert slower_p(self.steady, self.steady) > 0.4
+        assert slower_p(self.steady, [sample * 0.5 for sample in self.steady]) > 0.99
+    
+    # Verify a slowdown past the tolerance fails while small noise passes
+    def test_compare_benchmark(self):
+        assert compare_benchmark([self.steady], [sample * 1.3 for sample in self.steady])['status'] == 'regressed'
+        assert compare_benchmark([self.steady], [sample * 1.05 for sample in self.steady])['status'] == 'ok'
+        assert compare_benchmark([self.steady], [sample * 0.7 for sample in self.steady])['status'] == 'improved'
+    
+    # Verify noisy baselines widen the allowed change but never past the limit
+    def test_noise_aware(self):
+        slower = [sample * 1.3 for sample in self.noisy]
+        runs = [self.steady, [sample * 1.25 for sample in self.steady], [sample * 0.8 for sample in self.steady]]
+        
+        assert compare_benchmark([self.noisy], slower)['status'] == 'ok'
+        assert compare_benchmark(runs, [sample * 1.2 for sample in self.steady])['status'] == 'ok'
+        
+        row = compare_benchmark(runs, [sample * 1.3 for sample in self.steady])
+        assert row['status'] == 'regressed'
+        assert row['threshold'] == pytest.approx(0.25)
+        assert row['noise'] > 0.25
+        assert compare_benchmark(runs, [sample * 3 for sample in self.steady])['status'] == 'regressed'
+    
+    # Verify a 30 to 50% slowdown of a realistically noisy baseline fails and the same noise alone passes
+    def test_realistic(self):
+        for run in self.realistic:
+            assert compare_benchmark(self.realistic, run)['status'] == 'ok'
+        for slowdown in (1.3, 1.4, 1.5):
+            row = compare_benchmark(self.realistic, [sample * slowdown for sample in self.realistic[1]])
+            
+            assert row['status'] == 'regressed'
+            assert row['threshold'] < 0.25
+    
+    # Verify a baseline noisier than the limit is named before it is recorded
+    def test_too_noisy(self):
+        quiet = build_baseline([report({'game/frame/0': run}) for run in self.realistic], 'test')
+        loud = build_baseline([report({'game/frame/0': self.noisy}), report({'game/frame/0': [sample * 1.5 for sample in self.noisy]})], 'test')
+        
+        assert too_noisy(quiet) == {}
+        assert too_noisy(loud)['game/frame/0'] > 0.25
+    
+    # Verify timings are rescaled by the calibration benchmark before comparing
+    def test_calibration(self, tmp_path):
+        save_baseline([report({'calibration': self.steady, 'game/frame/0': self.steady})], 'test', str(tmp_path))
+        baseline = load_baseline('test', str(tmp_path))
+        
+        # the whole machine running twice as slow is not a regression
+        slow_machine = report({'calibration': [sample * 2 for sample in self.steady], 'game/frame/0': [sample * 2 for sample in self.steady]})
+        assert compare(baseline, slow_machine)['game/frame/0']['status'] == 'ok'
+        # one benchmark getting slower on the same machine is
+        slow_frame = report({'calibration': self.steady, 'game/frame/0': [sample * 2 for sample in self.steady]})
+        assert compare(baseline, slow_frame)['game/frame/0']['status'] == 'regressed'
+    
+    # Verify interleaved runs are rescaled round by round, so a slow spell inside a run cancels out
+    def test_interleaved(self, tmp_path):
+        spell = [1, 1, 1, 1.6, 1.6, 1.6, 1]
+        drifting = report({'calibration': [sample * speed for sample, speed in zip(self.steady, spell)], 'game/frame/0': [sample * speed for sample, speed in zip(self.steady, spell)]})
+        drifting['interleaved'] = True
+        save_baseline([report({'calibration': self.steady, 'game/frame/0': self.steady})], 'test', str(tmp_path))
+        baseline = load_baseline('test', str(tmp_path))
+        row = compare(baseline, drifting)['game/frame/0']
+        
+        assert row['status'] == 'ok'
+        assert abs(row['change']) < 0.01
+    
+    # Verify the per benchmark diff names every regression, new and missing benchmark
+    def test_diff(self, tmp_path):
+        save_baseline([report({'tilemap/0/render': self.steady, 'sparks/update/10': self.steady}), report({'tilemap/0/render': self.steady, 'sparks/update/10': self.steady})], 'test', str(tmp_path))
+        baseline = load_baseline('test', str(tmp_path))
+        rows = compare(baseline, report({'tilemap/0/render': [sample * 2 for sample in self.steady], 'entities/update/10': self.steady}))
+        diff = format_diff(rows)
+        
+        assert len(baseline['runs']['tilemap/0/render']) == 2
+        assert regressions(rows) == ['tilemap/0/render']
+        assert rows['sparks/update/10']['status'] == 'missing'
+        assert rows['entities/update/10']['status'] == 'new'
+        assert '+100.0%' in diff and 'regressed' in diff
+        assert load_baseline('other', str(tmp_path)) is None
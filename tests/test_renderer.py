@@ -0,0 +1,216 @@
+import pytest
+import pygame
+from scripts.renderer import FullRenderer, DirtyRectRenderer, RenderQueue, TRANSITION_FRAMES, LAYER_TILES, LAYER_ENTITIES, LAYER_PARTICLES
+
+class TestRenderer:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Renderer Test")
+        self.screen = pygame.display.set_mode((640, 480))
+        self.display = pygame.Surface((320, 240))
+        
+        # Striped background so restored regions can be told apart
+        self.background = pygame.Surface((320, 240))
+        for x in range(0, 320, 8):
+            self.background.fill((x % 256, 40, 90), pygame.Rect(x, 0, 4, 240))
+        
+        self.sprite = pygame.Surface((12, 12))
+        self.sprite.fill((250, 250, 0))
+        
+        yield
+        
+        pygame.quit()
+    
+    def draw_frame(self, renderer, sprite_pos, key=(0, 0), force=False):
+        if renderer.begin(key, force=force):
+            renderer.static.blit(self.background, (0, 0))
+            renderer.end_static()
+        renderer.mark(self.display.blit(self.sprite, sprite_pos))
+        renderer.present()
+        return pygame.image.tobytes(self.screen, 'RGB')
+    
+    # Verify the full renderer always redraws the static layer
+    def test_full_renderer(self):
+        renderer = FullRenderer(self.screen, self.display)
+        
+        assert renderer.static is self.display
+        assert renderer.begin((0, 0)) == True
+        assert renderer.begin((0, 0)) == True
+    
+    # Verify a moving sprite over a static scene matches a full redraw every frame
+    def test_dirty_matches_full(self):
+        dirty = DirtyRectRenderer(self.screen, self.display)
+        full = FullRenderer(self.screen, pygame.Surface((320, 240)))
+        
+        for frame in range(20):
+            pos = (10 + frame * 7, 30 + frame * 3)
+            dirty_frame = self.draw_frame(dirty, pos)
+            
+            full.display.blit(self.background, (0, 0))
+            full.display.blit(self.sprite, pos)
+            full.present()
+            assert dirty_frame == pygame.image.tobytes(self.screen, 'RGB')
+    
+    # Verify partial frames only happen while the static layer is unchanged
+    def test_dirty_full_redraw_conditions(self):
+        renderer = DirtyRectRenderer(self.screen, self.display)
+        
+        # First frame always redraws
+        assert renderer.begin((0, 0)) == True
+        renderer.end_static()
+        renderer.present()
+        
+        # Stationary camera skips the static redraw
+        assert renderer.begin((0, 0)) == False
+        renderer.present()
+        
+        # Camera movement forces a full redraw
+        assert renderer.begin((1, 0)) == True
+        renderer.present()
+        
+        # A forced frame (screenshake or transition) also redraws the frame after it
+        assert renderer.begin((1, 0), force=True) == True
+        renderer.present()
+        assert renderer.begin((1, 0)) == True
+        renderer.present()
+        assert renderer.begin((1, 0)) == False
+        renderer.present()
+        
+        # A shaken present makes the next frame full as well
+        renderer.begin((1, 0))
+        renderer.present((3, -2))
+        assert renderer.begin((1, 0)) == True
+    
+    # Verify only dirty regions are collected and offscreen blits are ignored
+    def test_mark(self):
+        renderer = DirtyRectRenderer(self.screen, self.display)
+        
+        renderer.mark(pygame.Rect(5, 5, 10, 10))
+        renderer.mark([pygame.Rect(20, 20, 4, 4), pygame.Rect(400, 400, 0, 0)])
+        
+        assert renderer.rects == [pygame.Rect(5, 5, 10, 10), pygame.Rect(20, 20, 4, 4)]
+        
+        renderer.present()
+        assert renderer.rects == []
+        assert len(renderer.prev_rects) == 2
+    
+    # Verify cached transition masks match drawing the circle every frame
+    def test_transition_masks(self):
+        renderer = FullRenderer(self.screen, self.display)
+        
+        assert len(renderer.masks) == TRANSITION_FRAMES + 1
+        
+        for transition in range(-30, 31, 7):
+            self.display.blit(self.background, (0, 0))
+            renderer.transition(transition)
+            cached = pygame.image.tobytes(self.display, 'RGB')
+            
+            expected = self.background.copy()
+            transition_surf = pygame.Surface((320, 240))
+            pygame.draw.circle(transition_surf, (255, 255, 255), (160, 120), (30 - abs(transition)) * 8)
+            transition_surf.set_colorkey((255, 255, 255))
+            expected.blit(transition_surf, (0, 0))
+            
+            assert cached == pygame.image.tobytes(expected, 'RGB')
+    
+    # Verify presenting reuses the same scaled buffer every frame
+    def test_present_reuses_buffer(self):
+        renderer = FullRenderer(self.screen, self.display)
+        scaled = renderer.scaled
+        self.display.blit(self.background, (0, 0))
+        
+        renderer.present()
+        renderer.present((4, -3))
+        
+        assert renderer.scaled is scaled
+        assert self.screen.get_at((4 + 9, 0)) == self.display.get_at((4, 1))
+
+
+class TestRenderQueue:
+    # Initialize pygame for testing and clean up afterward
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        pygame.init()
+        
+        # Minimal display setup needed for testing
+        pygame.display.set_caption("Render Queue Test")
+        pygame.display.set_mode((640, 480))
+        
+        self.red = pygame.Surface((10, 10))
+        self.red.fill((255, 0, 0))
+        self.blue = pygame.Surface((10, 10))
+        self.blue.fill((0, 0, 255))
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify flush counts submitted draws and batches and empties the layers
+    def test_counters(self):
+        queue = RenderQueue()
+        
+        queue.layer(LAYER_TILES).append((self.red, (5, 5)))
+        queue.layer(LAYER_TILES).append((self.red, (315, 235)))
+        queue.layer(LAYER_ENTITIES)
+        
+        drawn = queue.flush(pygame.Surface((320, 240)))
+        assert drawn == []
+        assert queue.submitted == 2
+        assert queue.batches == 1
+        assert queue.layer(LAYER_TILES) == []
+        
+        queue.reset_stats()
+        assert queue.submitted == 0 and queue.batches == 0
+    
+    # Verify layers are drawn in order with one batch per layer
+    def test_layer_order(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((320, 240))
+        
+        queue.layer(LAYER_PARTICLES).append((self.blue, (0, 0)))
+        tiles = queue.layer(LAYER_TILES)
+        for x in range(0, 100, 10):
+            tiles.append((self.red, (x, 0)))
+        
+        drawn = queue.flush(surf, rects=True)
+        
+        assert len(drawn) == 11
+        assert drawn[0] == pygame.Rect(0, 0, 10, 10)
+        assert queue.batches == 2
+        assert surf.get_at((5, 5))[:3] == (0, 0, 255)
+        assert surf.get_at((15, 5))[:3] == (255, 0, 0)
+        assert queue.layer(LAYER_TILES) is tiles
+    
+    # Verify a layer sort key orders draws inside the layer and ties keep submission order
+    def test_sort_keys(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((320, 240))
+        
+        queue.sort_layer(LAYER_ENTITIES, lambda command: command[1][1])
+        commands = queue.layer(LAYER_ENTITIES)
+        commands.append((self.red, (0, 4)))
+        commands.append((self.blue, (0, 0)))
+        commands.append((self.red, (20, 0)))
+        commands.append((self.blue, (20, 0)))
+        queue.flush(surf)
+        
+        assert surf.get_at((5, 5))[:3] == (255, 0, 0)
+        assert surf.get_at((25, 5))[:3] == (0, 0, 255)
+    
+    # Verify area blits go through the queue
+    def test_area(self):
+        queue = RenderQueue()
+        surf = pygame.Surface((320, 240))
+        big = pygame.Surface((400, 400))
+        big.fill((0, 255, 0))
+        big.fill((255, 0, 0), pygame.Rect(0, 0, 50, 50))
+        
+        queue.layer(LAYER_TILES).append((big, (0, 0), (50, 50, 320, 240)))
+        rects = queue.flush(surf, rects=True)
+        
+        assert rects == [pygame.Rect(0, 0, 320, 240)]
+        assert surf.get_at((5, 5))[:3] == (0, 255, 0)
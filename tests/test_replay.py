@@ -0,0 +1,65 @@
+import os
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.replay import InputRecorder, load_replay, play_replay, state_digest, REPLAY_HEADER, REPLAY_RECORD
+from scripts.simulation import script_events
+
+class TestReplay:
+    # Record into a temporary file and shut pygame down afterward
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.path = str(tmp_path / 'session.rec')
+        self.events = script_events([[0, 'press', 'right'], [40, 'release', 'right'], [45, 'press', 'jump'], [50, 'click'], [60, 'press', 'left']])
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify only handled input is written, one small record per event
+    def test_recorder(self):
+        recorder = InputRecorder(self.path, seed=9, level=1)
+        recorder.record(3, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_d), pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(0, 0), buttons=(0, 0, 0))])
+        recorder.record(8, [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1), pygame.event.Event(pygame.QUIT), pygame.event.Event(pygame.KEYUP, key=pygame.K_d)])
+        recorder.close(8, 1234)
+        replay = load_replay(self.path)
+        
+        assert recorder.records == 2
+        assert os.path.getsize(self.path) == REPLAY_HEADER.size + 3 * REPLAY_RECORD.size
+        assert (replay['seed'], replay['level'], replay['frames'], replay['digest']) == (9, 1, 8, 1234)
+        assert replay['events'][3][0].type == pygame.KEYDOWN and replay['events'][3][0].key == pygame.K_d
+        assert replay['events'][8][0].button == 1
+    
+    # Verify a recorded session plays back to the exact same state
+    def test_bit_exact(self):
+        game = Game(headless=True, seed=11, record=self.path)
+        game.simulate(300, self.events)
+        game.stop_recording()
+        recorded = state_digest(game)
+        pygame.quit()
+        
+        replayed, replay, seconds = play_replay(self.path)
+        
+        assert replay['frames'] == replayed.frame == 300
+        assert replay['digest'] == recorded == state_digest(replayed)
+        assert replayed.player.pos == game.player.pos
+    
+    # Verify a log cut off mid record still replays up to its last input
+    def test_unclosed(self):
+        recorder = InputRecorder(self.path, seed=2)
+        recorder.record(12, [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_w)])
+        recorder.file.write(b'\x01\x02')
+        recorder.file.close()
+        replay = load_replay(self.path)
+        
+        assert replay['frames'] == 13
+        assert replay['digest'] is None
+    
+    # Verify other files are rejected
+    def test_not_a_replay(self):
+        f = open(self.path, 'wb')
+        f.write(b'not a replay at all')
+        f.close()
+        
+        with pytest.raises(ValueError):
+            load_replay(self.path)
@@ -0,0 +1,39 @@
+import random
+from scripts.rng import RandomStreams, STREAMS
+
+class TestRandomStreams:
+    # Verify the same seed always gives the same numbers on every stream
+    def test_seeded(self):
+        first = RandomStreams(42)
+        second = RandomStreams(42)
+        
+        for name in STREAMS:
+            assert [getattr(first, name).random() for _ in range(5)] == [getattr(second, name).random() for _ in range(5)]
+        assert RandomStreams(43).enemies.random() != RandomStreams(42).enemies.random()
+    
+    # Verify drawing from one stream leaves the others untouched
+    def test_independent(self):
+        busy = RandomStreams(7)
+        quiet = RandomStreams(7)
+        for _ in range(100):
+            busy.sparks.random()
+        
+        assert busy.enemies.random() == quiet.enemies.random()
+        assert busy.sparks.random() != quiet.sparks.random()
+    
+    # Verify an unseeded game takes its seed from the global random module
+    def test_unseeded(self):
+        random.seed(5)
+        first = RandomStreams()
+        random.seed(5)
+        
+        assert RandomStreams().seed == first.seed
+    
+    # Verify saved state rewinds every stream
+    def test_state(self):
+        streams = RandomStreams(1)
+        state = streams.getstate()
+        rolled = [streams.clouds.random(), streams.shake.random()]
+        streams.setstate(state)
+        
+        assert [streams.clouds.random(), streams.shake.random()] == rolled
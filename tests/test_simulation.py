@@ -0,0 +1,57 @@
+import os
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.simulation import script_events, run_session
+
+class TestSimulation:
+    # Shut pygame down after each headless game
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.script = [[0, 'press', 'right'], [40, 'release', 'right'], [45, 'press', 'jump'], [50, 'click'], [60, 'press', 'left']]
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify scripts turn into the pygame events the game already handles
+    def test_script_events(self):
+        events = script_events(self.script)
+        
+        assert sorted(events) == [0, 40, 45, 50, 60]
+        assert events[0][0].type == pygame.KEYDOWN and events[0][0].key == pygame.K_d
+        assert events[40][0].type == pygame.KEYUP
+        assert events[45][0].key == pygame.K_w
+        assert events[50][0].type == pygame.MOUSEBUTTONDOWN and events[50][0].button == 1
+        
+        with pytest.raises(ValueError):
+            script_events([[0, 'dance']])
+    
+    # Verify a headless game steps without a renderer or sound
+    def test_headless_game(self):
+        game = Game(headless=True)
+        game.simulate(120, script_events(self.script))
+        
+        assert game.renderer is None
+        assert game.frame == 120
+        assert game.sfx.silenced > 0
+        assert not pygame.mixer.get_init()
+    
+    # Verify a headless game leaves the video driver as it found it and cannot be run in a window
+    def test_headless_driver(self, monkeypatch):
+        monkeypatch.delenv('SDL_VIDEODRIVER', raising=False)
+        game = Game(headless=True)
+        
+        assert 'SDL_VIDEODRIVER' not in os.environ
+        with pytest.raises(ValueError):
+            game.run()
+    
+    # Verify sessions with the same seed and script play out identically
+    def test_deterministic(self):
+        first = run_session(200, self.script, seed=5)
+        second = run_session(200, self.script, seed=5)
+        
+        assert first['frames'] == second['frames'] == 200
+        assert first['player'] == second['player']
+        assert first['enemies'] == second['enemies']
+        assert first['game_seconds'] == pytest.approx(200 / 60)
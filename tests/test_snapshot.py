@@ -0,0 +1,91 @@
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.snapshot import SnapshotRing, capture, restore, REWIND_FRAMES
+from scripts.simulation import script_events
+
+class TestSnapshot:
+    # Play into level 0 with enemies, arrows and sparks about
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.game = Game(headless=True, seed=3)
+        self.events = script_events([[0, 'press', 'right'], [30, 'press', 'jump'], [40, 'click'], [80, 'release', 'right']])
+        self.game.simulate(100, self.events)
+
+        yield
+
+        pygame.quit()
+
+    # Verify playing on from a restored snapshot repeats the same frames exactly
+    def test_restore(self):
+        snapshot = capture(self.game)
+        self.game.simulate(120)
+        played = capture(self.game)[1:]
+        self.game.player.pos = [0, 0]
+        self.game.enemies.pop()
+
+        restore(self.game, snapshot)
+        assert capture(self.game)[1:] == snapshot[1:]
+        self.game.simulate(120)
+
+        assert capture(self.game)[1:] == played
+
+    # Verify a snapshot is a copy the running game cannot change
+    def test_copy(self):
+        snapshot = capture(self.game)
+        arrows = len(snapshot[11][0])
+        x = snapshot[10][0][0]
+        self.game.projectiles.spawn((1, 2), 1.5, False)
+        self.game.enemies[0].pos[0] += 5
+
+        assert len(snapshot[11][0]) == arrows
+        assert snapshot[10][0][0] == x
+
+    # Verify restoring in the same level neither reloads it nor rebuilds the enemies still alive
+    def test_cheap_restore(self, monkeypatch):
+        snapshot = capture(self.game)
+        enemies = list(self.game.enemies)
+        loads = []
+        monkeypatch.setattr(self.game, 'load_level', lambda *args: loads.append(args))
+        self.game.simulate(30)
+        for _ in range(3):
+            restore(self.game, snapshot)
+
+        assert loads == []
+        assert len(self.game.enemies) == len(enemies) and all(new is old for new, old in zip(self.game.enemies, enemies))
+
+    # Verify the ring keeps the newest snapshots in its preallocated slots
+    def test_ring(self):
+        ring = SnapshotRing(interval=5, capacity=4)
+        for _ in range(40):
+            self.game.step()
+            ring.update(self.game)
+
+        assert len(ring) == 4 and len(ring.slots) == 4
+        assert [ring.get(age)[0] for age in range(4)] == [140, 135, 130, 125]
+        assert ring.get(4) is None
+
+    # Verify each rewind goes further back and a game can rewind with the R key
+    def test_rewind(self):
+        game = Game(headless=True, seed=3)
+        game.simulate(200)
+        expected = game.snapshots.get(3)
+
+        assert expected[0] == game.frame - 30
+        assert game.snapshots.rewind(game, frames=30)
+        assert capture(game)[1:] == expected[1:]
+        assert game.snapshots.get()[0] == expected[0] - 10
+        game.handle_keydown(pygame.K_r)
+
+        assert game.snapshots.get()[0] == game.frame - REWIND_FRAMES - 10
+        assert not SnapshotRing().rewind(game)
+
+    # Verify rewinding skips the snapshots taken while the player was dying
+    def test_rewind_alive(self):
+        game = self.game
+        for _ in range(100):
+            game.step()
+
+        assert any(game.snapshots.get(age)[3] for age in range(3, len(game.snapshots)))
+        assert game.snapshots.rewind(game, frames=30)
+        assert not game.dead
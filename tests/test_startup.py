@@ -0,0 +1,63 @@
+import time
+import tracemalloc
+import pytest
+from scripts.startup import StartupTrace
+
+class TestStartupTrace:
+    # Stop any allocation tracing a test started
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tracing = tracemalloc.is_tracing()
+        
+        yield
+        
+        if not tracing:
+            tracemalloc.stop()
+    
+    # Verify phases record their wall time in order
+    def test_phases(self):
+        trace = StartupTrace(start=time.perf_counter())
+        with trace.phase('first'):
+            time.sleep(0.01)
+        with trace.phase('second'):
+            pass
+        
+        assert [phase['name'] for phase in trace.phases] == ['first', 'second']
+        assert trace.phases[0]['seconds'] >= 0.01
+        assert trace.phases[1]['at'] >= trace.phases[0]['at'] + trace.phases[0]['seconds']
+        assert trace.phases[0]['allocated'] is None
+    
+    # Verify allocations are attributed to the phase that made them
+    def test_memory(self):
+        trace = StartupTrace(trace_memory=True)
+        with trace.phase('allocate'):
+            data = [bytearray(1024) for _ in range(100)]
+        
+        assert tracemalloc.is_tracing()
+        assert trace.phases[0]['allocated'] >= 100 * 1024
+        assert trace.phases[0]['peak'] >= trace.phases[0]['allocated']
+        del data
+    
+    # Verify a phase that raises is still recorded
+    def test_phase_error(self):
+        trace = StartupTrace()
+        with pytest.raises(ValueError):
+            with trace.phase('broken'):
+                raise ValueError()
+        
+        assert trace.phases[0]['name'] == 'broken'
+    
+    # Verify the report lists each phase and the time to first frame
+    def test_report(self, tmp_path):
+        trace = StartupTrace(trace_memory=True)
+        with trace.phase('assets'):
+            pass
+        trace.mark_first_frame()
+        path = trace.write(str(tmp_path / 'startup.txt'))
+        
+        lines = open(path).read().splitlines()
+        assert lines[0].startswith('phase')
+        assert lines[1].startswith('assets')
+        assert len(lines[1].split()) == 5
+        assert lines[2].startswith('time to first frame')
+        assert trace.first_frame > 0
@@ -0,0 +1,75 @@
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.tilemap import Tilemap
+from scripts.stress import map_size, span_variant, generate_map, generate_scene, apply_scene
+
+class TestStress:
+    # Generate into a temporary folder and shut pygame down afterward
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.map_path = str(tmp_path / 'stress.json')
+        self.scene_path = str(tmp_path / 'scene.json')
+        
+        yield
+        
+        pygame.quit()
+    
+    # Verify span tiles get the variant autotile would give them
+    def test_span_variant(self):
+        assert [span_variant(col, 0, 3, 2) for col in range(3)] == [0, 1, 2]
+        assert [span_variant(col, 1, 3, 2) for col in range(3)] == [6, 5, 4]
+        assert [span_variant(col, 1, 3, 3) for col in range(3)] == [7, 8, 3]
+    
+    # Verify generated maps load into a Tilemap and autotile leaves them alone
+    def test_generate_map(self):
+        stats = generate_map(self.map_path, 120, 40, solid=0.3, decor=0.2, trees=0.1, spawners=0.1, seed=3)
+        tilemap = Tilemap(None)
+        tilemap.load(self.map_path)
+        variants = {loc: tile['variant'] for loc, tile in tilemap.tilemap_dict.items()}
+        tilemap.autotile()
+        
+        assert variants == {loc: tile['variant'] for loc, tile in tilemap.tilemap_dict.items()}
+        assert len(tilemap.extract([('grass', variant) for variant in range(9)] + [('stone', variant) for variant in range(9)], keep=True)) == stats['tiles']
+        assert len(tilemap.extract([('spawners', 0)], keep=True)) == 1
+        assert len(tilemap.extract([('spawners', 1)], keep=True)) == stats['enemies'] > 0
+        assert len(tilemap.extract([('decor', variant) for variant in range(4)], keep=True)) == stats['decor'] > 0
+        assert len(tilemap.offgrid_tiles) == stats['offgrid'] > 0
+        assert 0.15 < stats['tiles'] / (120 * 40) < 0.45
+    
+    # Verify the same seed writes the same map and the densities can be turned off
+    def test_seeded(self):
+        generate_map(self.map_path, 80, 30, seed=1)
+        f = open(self.map_path)
+        first = f.read()
+        f.close()
+        stats = generate_map(self.map_path, 80, 30, decor=0, trees=0, spawners=0, seed=1)
+        generate_map(self.scene_path, 80, 30, seed=1)
+        f = open(self.scene_path)
+        second = f.read()
+        f.close()
+        
+        assert first == second
+        assert stats['decor'] == stats['offgrid'] == stats['enemies'] == 0
+    
+    # Verify map sizes scale with the number of tiles asked for
+    def test_map_size(self):
+        small = map_size(10000)
+        large = map_size(10000000)
+        
+        assert small[0] > small[1]
+        assert 900 < large[0] * large[1] / (small[0] * small[1]) < 1100
+    
+    # Verify a scene fills a game with the enemies, arrows and sparks it lists
+    def test_scene(self):
+        generate_map(self.map_path, 100, 40, spawners=0, seed=2)
+        generate_scene(self.scene_path, self.map_path, enemies=25, arrows=40, sparks=60, seed=2)
+        game = Game(headless=True, seed=2)
+        scene = apply_scene(game, self.scene_path)
+        
+        assert scene['map'] == self.map_path
+        assert game.level_path == self.map_path
+        assert (len(game.enemies), len(game.projectiles), len(game.sparks)) == (25, 40, 60)
+        assert game.player.pos[1] < 40 * 16
+        game.simulate(10)
+        assert game.frame == 10
@@ -0,0 +1,161 @@
+import os
+import socket
+import struct
+import threading
+import time
+import pytest
+import pygame
+from scripts.game import Game
+from scripts.profiler import FrameProfiler
+from scripts.telemetry import TelemetryWriter, read_telemetry, summarize, format_summary, listen, record_struct, TELEMETRY_HEADER
+
+class GameMock:
+    def __init__(self, profiler, level=0):
+        self.profiler = profiler
+        self.frame = 0
+        self.level = level
+        self.enemies = [None] * 3
+        self.particles = [None] * 4
+        self.sparks = []
+        self.projectiles = [None]
+        self.player_projectiles = []
+        self.queue = type('Queue', (), {'submitted': 20, 'batches': 2})()
+        self.camera = type('Camera', (), {'visible': 25, 'culled': 6})()
+
+class TestTelemetry:
+    # Stream into a temporary file and shut pygame down afterward
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        self.path = str(tmp_path / 'session.tlm')
+        self.profiler = FrameProfiler(enabled=True)
+
+        yield
+
+        pygame.quit()
+
+    def frame(self, game, stages):
+        self.profiler.begin()
+        for stage in stages:
+            self.profiler.mark(stage)
+        self.profiler.end()
+        game.frame += 1
+
+    # Verify every frame becomes one fixed size record with its stage times and counts
+    def test_records(self):
+        game = GameMock(self.profiler)
+        writer = TelemetryWriter(self.path)
+        for _ in range(5):
+            self.frame(game, ['input', 'enemies'])
+            writer.record(game)
+        # a stage that first shows up later is not in the header
+        self.frame(game, ['input', 'enemies', 'late'])
+        writer.record(game)
+        writer.close()
+        stages, records = read_telemetry(self.path)
+        records = list(records)
+
+        assert stages == ['input', 'enemies']
+        assert os.path.getsize(self.path) == TELEMETRY_HEADER.size + 2 + len('input') + len('enemies') + 6 * record_struct(2).size
+        assert [record[0] for record in records] == [1, 2, 3, 4, 5, 6]
+        assert records[0][2] >= records[0][3] + records[0][4]
+        assert records[0][5:] == (3, 4, 0, 1, 0, 20, 2, 25, 6)
+
+    # Verify a stage longer than 32 bits of nanoseconds is kept whole
+    def test_long_stage(self):
+        game = GameMock(self.profiler)
+        writer = TelemetryWriter(self.path)
+        self.frame(game, ['load'])
+        self.profiler.latest['load'] = 5 * 10 ** 9
+        self.profiler.latest['frame'] = 6 * 10 ** 9
+        writer.record(game)
+        writer.close()
+        records = list(read_telemetry(self.path)[1])
+
+        assert writer.error is None
+        assert records[0][2:4] == (6 * 10 ** 9, 5 * 10 ** 9)
+
+    # Verify a record that cannot be packed stops the writer instead of killing its thread silently
+    def test_pack_error(self):
+        game = GameMock(self.profiler, level=70000)
+        writer = TelemetryWriter(self.path)
+        self.frame(game, ['input'])
+        writer.record(game)
+        writer.thread.join(5)
+        queued = writer.records
+        self.frame(game, ['input'])
+        writer.record(game)
+        writer.close()
+
+        assert isinstance(writer.error, struct.error)
+        assert writer.records == queued == 1
+
+    # Verify quitting does not hang on a reader that stopped reading
+    def test_stalled_reader(self, tmp_path):
+        socket_path = str(tmp_path / 'stalled.sock')
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(socket_path)
+        server.listen(1)
+        game = GameMock(self.profiler)
+        writer = TelemetryWriter('unix:' + socket_path)
+        connection = server.accept()[0]
+        self.frame(game, ['input'])
+        for _ in range(100000):
+            writer.record(game)
+        start = time.perf_counter()
+        writer.close(timeout=0.5)
+        elapsed = time.perf_counter() - start
+        connection.close()
+        server.close()
+
+        assert elapsed < 5
+        assert not writer.thread.is_alive()
+        assert isinstance(writer.error, OSError)
+
+    # Verify the summary splits percentiles by level and a cut off record is ignored
+    def test_summarize(self):
+        game = GameMock(self.profiler)
+        writer = TelemetryWriter(self.path)
+        for frame in range(20):
+            game.level = 0 if frame < 15 else 2
+            self.frame(game, ['input'])
+            writer.record(game)
+        writer.close()
+        f = open(self.path, 'ab')
+        f.write(b'\x01\x02\x03')
+        f.close()
+        summary = summarize(self.path)
+
+        assert sorted(summary) == ['0', '2']
+        assert (summary['0']['frames'], summary['2']['frames']) == (15, 5)
+        assert summary['0']['times']['frame']['p50_ms'] <= summary['0']['times']['frame']['p99_ms'] <= summary['0']['times']['frame']['max_ms']
+        assert summary['2']['mean_counts'] == {'enemies': 3, 'particles': 4, 'sparks': 0, 'arrows': 1, 'fireballs': 0, 'draws': 20, 'batches': 2, 'visible': 25, 'culled': 6}
+        assert 'level 2, 5 frames' in format_summary(summary)
+
+    # Verify a file that is not telemetry is refused
+    def test_not_telemetry(self):
+        f = open(self.path, 'wb')
+        f.write(b'CCRP' + bytes(20))
+        f.close()
+
+        with pytest.raises(ValueError):
+            read_telemetry(self.path)
+
+    # Verify a game streams over a unix socket to the listener
+    def test_socket(self, tmp_path):
+        socket_path = str(tmp_path / 'game.sock')
+        received = {}
+        ready = threading.Event()
+        thread = threading.Thread(target=lambda: received.update(bytes=listen(socket_path, self.path, ready, timeout=10)))
+        thread.start()
+        assert ready.wait(10)
+        game = Game(headless=True, seed=2, telemetry='unix:' + socket_path)
+        game.simulate(30)
+        game.telemetry.close()
+        thread.join(10)
+
+        assert not thread.is_alive()
+        stages, records = read_telemetry(self.path)
+
+        assert stages[0] == 'input' and 'enemies' in stages
+        assert [record[0] for record in records] == list(range(1, 31))
+        assert received['bytes'] == os.path.getsize(self.path)
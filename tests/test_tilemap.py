@@ -3,7 +3,7 @@ import pygame
 import os
 import json
 import tempfile
-from scripts.tilemap import Tilemap
+from scripts.tilemap import Tilemap, level_template, clear_templates, templates, TEMPLATE_CACHE_SIZE
 
 class TestTilemap:
     # Initialize pygame for testing and clean up afterward
@@ -163,6 +163,19 @@ class TestTilemap:
         result = tilemap.solid_check((100, 100))
         assert result is None
     
+    # Verify solid_check_many agrees with solid_check for a batch of positions
+    def test_solid_check_many(self):
+        tilemap = Tilemap(self.game_mock)
+        
+        tilemap.tilemap_dict['0;0'] = {'type': 'grass', 'variant': 0, 'pos': [0, 0]}
+        tilemap.tilemap_dict['1;0'] = {'type': 'decor', 'variant': 0, 'pos': [1, 0]}
+        
+        positions = [(8, 8), (16 + 8, 8), (100, 100), (-4, 8)]
+        result = tilemap.solid_check_many(positions)
+        
+        assert result == [True, False, False, False]
+        assert result == [bool(tilemap.solid_check(pos)) for pos in positions]
+    
     # Verify physics_rects_around returns correct collision rectangles
     def test_physics_rects_around(self):
         tilemap = Tilemap(self.game_mock)
@@ -234,6 +247,10 @@ class TestTilemap:
                 self.blit_count += 1
                 return self.surface.blit(*args, **kwargs)
                 
+            def blits(self, blit_sequence, doreturn=True):
+                self.blit_count += len(blit_sequence)
+                return self.surface.blits(blit_sequence, doreturn)
+                
             def get_width(self):
                 return self.surface.get_width()
                 
@@ -246,4 +263,72 @@ class TestTilemap:
         tilemap.render(tracker, offset=(0, 0))
         
         # Verify expected number of blits (one for each tile)
-        assert tracker.blit_count > 0  # At least one blit should happen
\ No newline at end of file
+        assert tracker.blit_count == 2
+
+
+class TestLevelTemplate:
+    # Write a small map with a player, two enemies and a tree, starting from an empty cache
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        clear_templates()
+        self.path = str(tmp_path / 'level.json')
+        self.write({
+            '0;0': {'type': 'grass', 'variant': 1, 'pos': [0, 0]},
+            '1;-1': {'type': 'spawners', 'variant': 0, 'pos': [1, -1]},
+            '2;-1': {'type': 'spawners', 'variant': 1, 'pos': [2, -1]},
+            '3;-1': {'type': 'spawners', 'variant': 1, 'pos': [3, -1]},
+        }, [{'type': 'large_decor', 'variant': 2, 'pos': [10, -44]}])
+        
+        yield
+        
+        clear_templates()
+    
+    def write(self, tiles, offgrid):
+        f = open(self.path, 'w')
+        json.dump({'tilemap': tiles, 'tile_size': 16, 'offgrid': offgrid}, f)
+        f.close()
+    
+    # Verify spawners and trees are taken out of the tiles once, at parse time
+    def test_parse(self):
+        template = level_template(self.path)
+        
+        assert template.player_spawn == (16, -16)
+        assert template.enemy_spawns == ((32, -16), (48, -16))
+        assert template.tree_rects == ((14, -40, 23, 13),)
+        assert list(template.tilemap_dict) == ['0;0']
+        assert len(template.offgrid_tiles) == 1
+        assert template.asset_types == {'grass', 'large_decor'}
+    
+    # Verify a template is read only and later loads never read the file again
+    def test_cached(self):
+        template = level_template(self.path)
+        self.write({}, [])
+        
+        assert level_template(self.path) is template
+        with pytest.raises(TypeError):
+            template.tilemap_dict['5;5'] = {'type': 'stone', 'variant': 0, 'pos': [5, 5]}
+        clear_templates()
+        assert level_template(self.path).player_spawn is None
+    
+    # Verify a tilemap shares the template's tiles instead of copying them
+    def test_use(self):
+        template = level_template(self.path)
+        tilemap = Tilemap(None, tile_size=8)
+        tilemap.use(template)
+        
+        assert tilemap.tilemap_dict is template.tilemap_dict
+        assert tilemap.tile_size == 16
+        assert tilemap.solid_check((5, 5))['type'] == 'grass'
+        assert tilemap.asset_types() == {'grass', 'large_decor'}
+    
+    # Verify only the most recently used levels stay cached
+    def test_evict(self, tmp_path):
+        first = level_template(self.path)
+        paths = [str(tmp_path / (str(i) + '.json')) for i in range(TEMPLATE_CACHE_SIZE)]
+        for path in paths:
+            self.path = path
+            self.write({}, [])
+            level_template(path)
+        
+        assert list(templates) == paths
+        assert level_template(str(tmp_path / 'level.json')) is not first
@@ -96,6 +96,25 @@ class TestUtilities:
         anim.frame = 12
         assert anim.img() == images[2]
     
+    # Verify Animation keeps flipped frames built once and shared by copies
+    def test_animation_flipped(self):
+        images = []
+        for i in range(2):
+            surf = pygame.Surface((10, 10))
+            surf.fill((0, 0, 255))
+            surf.fill((255, 0, 0), pygame.Rect(0, 0, 2, 10))
+            images.append(surf)
+        
+        anim = Animation(images, img_dur=5, loop=True)
+        
+        assert len(anim.flipped) == 2
+        assert anim.img(True).get_at((9, 5))[:3] == (255, 0, 0)
+        assert anim.img(False) is images[0]
+        
+        anim.frame = 7
+        assert anim.img(True) is anim.flipped[1]
+        assert anim.copy().flipped is anim.flipped
+    
     # Verify non-looping Animation stops at final frame
     def test_animation_update_noloop(self):
         images = [pygame.Surface((10, 10)) for _ in range(3)]